@@ -50,6 +50,8 @@ def main() -> None:
         dest_repo="examples/model_repository",
         inputs=[{"name": "input", "dims": [4], "dtype": "TYPE_FP32"}],
         outputs=[{"name": "output", "dims": [1], "dtype": "TYPE_FP32"}],
+        max_batch=32,
+        max_queue_delay_us=500,
     )
     print(f"Wrote model to {dest}")
 
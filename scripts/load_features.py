@@ -1,22 +1,40 @@
 #!/usr/bin/env python
-"""Load sample features into the lightweight feature store."""
+"""Load sample features into the configured feature store."""
 
 from __future__ import annotations
 
+import argparse
 from pathlib import Path
 
-from mmsp.features.lightweight_store import LightweightFeatureStore
+from mmsp.features.ingest import DEFAULT_BATCH_ROWS, load_feature_store
 from mmsp.utils.config import load_platform_config
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--source", default="examples/feature_data.parquet")
+    parser.add_argument("--dest", default=None, help="Defaults to feature_store.path")
+    parser.add_argument("--shards", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS)
+    args = parser.parse_args()
+
     cfg = load_platform_config()
-    src = Path("examples/feature_data.parquet")
+    src = Path(args.source)
     if not src.exists():
         raise SystemExit(f"Missing sample features at {src}")
-    store = LightweightFeatureStore(cfg.feature_store.path, cfg.feature_store.entity_id_column)
-    store.load_from_parquet(str(src))
-    print(f"Loaded features from {src} into {cfg.feature_store.path}")
+    stats = load_feature_store(
+        cfg.feature_store,
+        str(src),
+        dest=args.dest,
+        num_shards=args.shards,
+        workers=args.workers,
+        batch_rows=args.batch_rows,
+    )
+    print(
+        f"Loaded {stats.rows} rows from {src} in {stats.seconds:.2f}s "
+        f"({stats.rows_per_s:,.0f} rows/s) into {', '.join(stats.outputs)}"
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""Run several local Feature API replicas, each serving its consistent-hash shards."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import yaml
+
+from mmsp.features.ingest import ingest_parquet
+from mmsp.features.sharding import HashRing
+from mmsp.utils.config import load_platform_config
+
+
+def _interrupt(signum: int, frame: object) -> None:
+    raise KeyboardInterrupt
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--replicas", type=int, default=3)
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--base-port", type=int, default=8101)
+    parser.add_argument("--source", default="examples/feature_data.parquet")
+    parser.add_argument("--shard-dir", default="artifacts/features/store.shards")
+    args = parser.parse_args()
+
+    cfg = load_platform_config()
+    shard_dir = Path(args.shard_dir)
+    ingest_parquet(args.source, str(shard_dir), cfg.feature_store.entity_id_column, num_shards=args.shards)
+
+    urls = [f"http://127.0.0.1:{args.base_port + i}" for i in range(args.replicas)]
+    assignments = HashRing(urls).assignments(args.shards)
+    config_dir = Path(cfg.artifact_root) / "features" / "replicas"
+    config_dir.mkdir(parents=True, exist_ok=True)
+    procs: List[subprocess.Popen] = []
+    signal.signal(signal.SIGTERM, _interrupt)
+    try:
+        for idx, url in enumerate(urls):
+            data = {"platform": cfg.model_dump()}
+            feature_store = data["platform"]["feature_store"]
+            feature_store["mode"] = "sharded"
+            feature_store["path"] = str(shard_dir)
+            feature_store["sharding"].update(num_shards=args.shards, replicas=urls, replica=url)
+            config_path = config_dir / f"replica-{idx}.yaml"
+            config_path.write_text(yaml.safe_dump(data))
+            env = {**os.environ, "PLATFORM_CONFIG": str(config_path)}
+            cmd = [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "mmsp.features.api:app",
+                "--host",
+                "127.0.0.1",
+                "--port",
+                str(args.base_port + idx),
+            ]
+            procs.append(subprocess.Popen(cmd, env=env))
+            print(f"{url} serves shards {assignments[url]}")
+        print(f"Gateway config: feature_store.sharding = {{num_shards: {args.shards}, replicas: {urls}}}")
+        while all(proc.poll() is None for proc in procs):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            proc.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
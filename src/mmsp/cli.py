@@ -5,13 +5,29 @@ from __future__ import annotations
 import subprocess
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 import typer
 
-from mmsp.deploy.canary import DeploymentState, load_state, promote_canary, rollback_canary, save_state, start_canary
+from mmsp.deploy.canary import (
+    DeploymentState,
+    load_state,
+    notify_state_change,
+    promote_canary,
+    rollback_canary,
+    save_state,
+    start_canary,
+)
 from mmsp.deploy.triton_repo import build_triton_repository
+from mmsp.features.ingest import DEFAULT_BATCH_ROWS, load_feature_store
+from mmsp.features.lightweight_store import LightweightFeatureStore
+from mmsp.monitoring.drift import DRIFT_PROFILE_METADATA_KEY, build_baseline_profile
 from mmsp.registry.store import RegistryStore
+from mmsp.serving.feature_schema import (
+    FEATURE_DEFAULTS_METADATA_KEY,
+    FEATURES_METADATA_KEY,
+    parse_feature_defaults,
+)
 from mmsp.utils.config import load_platform_config
 from mmsp.utils.logging import configure_logging, get_logger
 
@@ -19,11 +35,20 @@ configure_logging()
 LOG = get_logger(__name__)
 
 app = typer.Typer(add_completion=False)
+features_app = typer.Typer(add_completion=False, help="Feature store maintenance.")
+app.add_typer(features_app, name="features")
+drift_app = typer.Typer(add_completion=False, help="Drift monitoring baselines.")
+app.add_typer(drift_app, name="drift")
 platform_cfg = load_platform_config()
 registry_path = Path(platform_cfg.artifact_root) / "registry" / "registry.json"
 registry = RegistryStore(registry_path)
 
 
+def notify_gateway() -> None:
+    if platform_cfg.gateway.admin_url:
+        notify_state_change(platform_cfg.gateway.admin_url)
+
+
 def run(cmd: list[str]) -> None:
     LOG.info("Running command", extra={"cmd": " ".join(cmd)})
     subprocess.run(cmd, check=True)
@@ -47,15 +72,38 @@ def register(
     name: str = typer.Option(..., help="Model name"),
     framework: str = typer.Option("onnx", help="Framework"),
     version: Optional[int] = typer.Option(None, help="Version override"),
+    features: Optional[str] = typer.Option(
+        None, help="Comma-separated model input feature names, in model column order"
+    ),
+    feature_defaults: Optional[str] = typer.Option(
+        None, help="Defaults for optional features, e.g. 'f3=0.0,f4=1.0'"
+    ),
 ) -> None:
-    mv = registry.register(name=name, framework=framework, artifact_path=model_path, version=version)
+    metadata: Dict[str, str] = {}
+    if features:
+        metadata[FEATURES_METADATA_KEY] = features
+    if feature_defaults:
+        parse_feature_defaults(feature_defaults)
+        metadata[FEATURE_DEFAULTS_METADATA_KEY] = feature_defaults
+    mv = registry.register(
+        name=name,
+        framework=framework,
+        artifact_path=model_path,
+        version=version,
+        metadata=metadata,
+    )
+    batching = platform_cfg.gateway.batching
+    # Without batching the model keeps an explicit variable batch dimension instead.
+    batch_dims = [] if batching.enabled else [-1]
     build_triton_repository(
         artifact_path=model_path,
         model_name=name,
         version=mv.version,
         dest_repo=platform_cfg.model_repository,
-        inputs=[{"name": "input", "dims": [4], "dtype": "TYPE_FP32"}],
-        outputs=[{"name": "output", "dims": [1], "dtype": "TYPE_FP32"}],
+        inputs=[{"name": "input", "dims": [*batch_dims, 4], "dtype": "TYPE_FP32"}],
+        outputs=[{"name": "output", "dims": [*batch_dims, 1], "dtype": "TYPE_FP32"}],
+        max_batch=batching.max_batch_size if batching.enabled else 0,
+        max_queue_delay_us=batching.max_wait_us if batching.enabled else None,
     )
     typer.echo(f"Registered model {name} version {mv.version}")
 
@@ -69,6 +117,7 @@ def deploy(
 ) -> None:
     state_path = platform_cfg.deployment_state
     state = start_canary(state_path, name, version, canary)
+    notify_gateway()
     typer.echo(f"Started canary for {name} v{version} at {canary}% traffic")
 
 
@@ -80,12 +129,14 @@ def promote(name: str = typer.Option("example_model"), version: int = typer.Opti
     save_state(state, platform_cfg.deployment_state)
     promote_canary(platform_cfg.deployment_state)
     registry.promote(name, version, "prod")
+    notify_gateway()
     typer.echo(f"Promoted {name} v{version} to prod")
 
 
 @app.command()
 def rollback(name: str = typer.Option("example_model")) -> None:
     rollback_canary(platform_cfg.deployment_state)
+    notify_gateway()
     typer.echo(f"Rolled back canary for {name}")
 
 
@@ -114,5 +165,68 @@ def loadgen(
     run(cmd)
 
 
+@features_app.command("load")
+def features_load(
+    source: str = typer.Option("examples/feature_data.parquet", help="Source Parquet file"),
+    dest: Optional[str] = typer.Option(None, help="Output path (defaults to feature_store.path)"),
+    shards: int = typer.Option(1, help="Hash-partition by entity id into this many shards"),
+    workers: Optional[int] = typer.Option(None, help="Worker processes (defaults to CPU count)"),
+    batch_rows: int = typer.Option(DEFAULT_BATCH_ROWS, help="Rows per streamed record batch"),
+) -> None:
+    """Stream a feature table into the configured store format."""
+    stats = load_feature_store(
+        platform_cfg.feature_store,
+        source,
+        dest=dest,
+        num_shards=shards,
+        workers=workers,
+        batch_rows=batch_rows,
+    )
+    typer.echo(
+        f"Loaded {stats.rows} rows in {stats.seconds:.2f}s ({stats.rows_per_s:,.0f} rows/s) "
+        f"into {', '.join(stats.outputs)}"
+    )
+
+
+@features_app.command("compact")
+def features_compact() -> None:
+    """Fold pending delta segments into the lightweight store's base file."""
+    feature_cfg = platform_cfg.feature_store
+    if feature_cfg.mode != "lightweight":
+        raise typer.BadParameter(f"compaction applies to lightweight mode, not {feature_cfg.mode}")
+    store = LightweightFeatureStore(feature_cfg.path, feature_cfg.entity_id_column)
+    folded = store.compact()
+    typer.echo(f"Compacted {folded} delta segments into {feature_cfg.path}")
+
+
+@drift_app.command("build-baseline")
+def drift_build_baseline(
+    name: str = typer.Option("example_model", help="Model name"),
+    version: int = typer.Option(..., help="Model version the baseline belongs to"),
+    source: Optional[str] = typer.Option(
+        None, help="Training-data Parquet file (defaults to drift.baseline_path)"
+    ),
+    dest: Optional[str] = typer.Option(
+        None, help="Profile directory (defaults to <artifact_root>/drift/<name>/v<version>)"
+    ),
+    max_values: Optional[int] = typer.Option(
+        None, help="Sorted values kept per feature (defaults to drift.profile_max_values)"
+    ),
+) -> None:
+    """Precompute a compact drift baseline profile and link it to a registered version."""
+    drift_cfg = platform_cfg.drift
+    out = dest or str(platform_cfg.artifact_path("drift", name, f"v{version}"))
+    path = build_baseline_profile(
+        source or drift_cfg.baseline_path,
+        out,
+        entity_id_column=platform_cfg.feature_store.entity_id_column,
+        psi_bins=drift_cfg.psi_bins,
+        max_values=drift_cfg.profile_max_values if max_values is None else max_values,
+        quantiles=drift_cfg.profile_quantiles,
+    )
+    registry.update_metadata(name, version, {DRIFT_PROFILE_METADATA_KEY: str(path)})
+    typer.echo(f"Built drift baseline profile for {name} v{version} at {path}")
+
+
 if __name__ == "__main__":
     app()
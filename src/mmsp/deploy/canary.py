@@ -2,19 +2,25 @@
 
 from __future__ import annotations
 
+import os
 import random
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 import requests
 import yaml
 
+from mmsp.utils.io import atomic_write_text
 from mmsp.utils.logging import get_logger
 
 LOG = get_logger(__name__)
 
+StateListener = Callable[[Path, "DeploymentState"], None]
+_state_listeners: List[StateListener] = []
+
 
 @dataclass
 class DeploymentState:
@@ -55,9 +61,114 @@ def load_state(path: str | Path) -> DeploymentState:
 
 def save_state(state: DeploymentState, path: str | Path) -> None:
     path = Path(path)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        yaml.safe_dump(state.to_dict(), f)
+    atomic_write_text(path, yaml.safe_dump(state.to_dict()))
+    for listener in list(_state_listeners):
+        try:
+            listener(path, state)
+        except Exception as exc:
+            LOG.error("Deployment state listener failed", extra={"error": str(exc)})
+
+
+def add_state_listener(listener: StateListener) -> None:
+    """Register a callback invoked in-process after every ``save_state``."""
+    _state_listeners.append(listener)
+
+
+def remove_state_listener(listener: StateListener) -> None:
+    if listener in _state_listeners:
+        _state_listeners.remove(listener)
+
+
+def notify_state_change(admin_url: str) -> None:
+    """Ask a gateway to reload deployment state now instead of waiting for its next poll."""
+    try:
+        resp = requests.post(f"{admin_url.rstrip('/')}/admin/deployment/reload", timeout=5)
+        resp.raise_for_status()
+    except Exception as exc:
+        LOG.warning("Failed to notify gateway", extra={"error": str(exc), "url": admin_url})
+
+
+class DeploymentStateWatcher:
+    """Holds the deployment state in memory and swaps it when the state file changes.
+
+    Changes are picked up from ``save_state`` calls in the same process, from an explicit
+    ``refresh`` (e.g. the gateway admin endpoint) or by polling the file's stat signature
+    in a background thread. Each change publishes a new ``DeploymentState`` object with a
+    single reference assignment, so readers never observe a partially updated state.
+    """
+
+    def __init__(self, path: str | Path, poll_interval_s: float = 1.0) -> None:
+        self.path = Path(path)
+        self.poll_interval_s = poll_interval_s
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._subscribers: List[Callable[[DeploymentState], None]] = []
+        self._state = load_state(self.path)
+        self._signature = self._stat_signature()
+        add_state_listener(self._on_saved)
+
+    @property
+    def current(self) -> DeploymentState:
+        return self._state
+
+    def subscribe(self, callback: Callable[[DeploymentState], None]) -> None:
+        self._subscribers.append(callback)
+
+    def _stat_signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _publish(self, state: DeploymentState) -> None:
+        previous = self._state
+        self._state = state
+        if state.to_dict() == previous.to_dict():
+            return
+        LOG.info("Deployment state changed", extra=state.to_dict())
+        for callback in list(self._subscribers):
+            callback(state)
+
+    def _on_saved(self, path: Path, state: DeploymentState) -> None:
+        if path.resolve() != self.path.resolve():
+            return
+        with self._lock:
+            self._signature = self._stat_signature()
+            self._publish(DeploymentState.from_dict(state.to_dict()))
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload the state file if it changed on disk; returns True when it was re-read."""
+        with self._lock:
+            signature = self._stat_signature()
+            if not force and signature == self._signature:
+                return False
+            self._signature = signature
+            self._publish(load_state(self.path))
+            return True
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.poll_interval_s):
+            try:
+                self.refresh()
+            except Exception as exc:
+                LOG.error("Failed to refresh deployment state", extra={"error": str(exc)})
+
+    def start(self) -> None:
+        if self._on_saved not in _state_listeners:
+            add_state_listener(self._on_saved)
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._poll, name="mmsp-state-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval_s + 1)
+            self._thread = None
+        remove_state_listener(self._on_saved)
 
 
 def choose_version(state: DeploymentState) -> int:
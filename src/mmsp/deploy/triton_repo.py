@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import shutil
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from mmsp.utils.logging import get_logger
 
@@ -16,6 +16,7 @@ def generate_config_pbtxt(
     inputs: List[dict],
     outputs: List[dict],
     max_batch: int = 0,
+    max_queue_delay_us: Optional[int] = None,
 ) -> str:
     lines = [f'name: "{model_name}"', 'backend: "onnxruntime"']
     lines.append(f"max_batch_size: {max_batch}")
@@ -33,6 +34,10 @@ def generate_config_pbtxt(
         lines.append(f'  data_type: {out["dtype"]}')
         lines.append(f"  dims: [ {dims} ]")
         lines.append("}")
+    if max_batch > 0 and max_queue_delay_us is not None:
+        lines.append("dynamic_batching {")
+        lines.append(f"  max_queue_delay_microseconds: {max_queue_delay_us}")
+        lines.append("}")
     lines.append('instance_group [ { kind: KIND_CPU } ]')
     return "\n".join(lines) + "\n"
 
@@ -44,6 +49,8 @@ def build_triton_repository(
     dest_repo: str,
     inputs: List[dict],
     outputs: List[dict],
+    max_batch: int = 0,
+    max_queue_delay_us: Optional[int] = None,
 ) -> Path:
     repo_path = Path(dest_repo)
     model_version_dir = repo_path / model_name / str(version)
@@ -52,7 +59,9 @@ def build_triton_repository(
     src_path = Path(artifact_path)
     if src_path.resolve() != dest_model.resolve():
         shutil.copyfile(src_path, dest_model)
-    config_text = generate_config_pbtxt(model_name, inputs, outputs)
+    config_text = generate_config_pbtxt(
+        model_name, inputs, outputs, max_batch=max_batch, max_queue_delay_us=max_queue_delay_us
+    )
     config_path = repo_path / model_name / "config.pbtxt"
     with open(config_path, "w", encoding="utf-8") as f:
         f.write(config_text)
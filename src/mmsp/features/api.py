@@ -2,39 +2,90 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from pydantic import BaseModel
 
-from mmsp.features.feast_adapter import FeastAdapter
-from mmsp.features.lightweight_store import LightweightFeatureStore
+from mmsp.features.base import FeatureMatrix, PollingReloader, snapshot_info
+from mmsp.features.codecs import SUPPORTED_MEDIA_TYPES, encode_batch, negotiate
+from mmsp.features.factory import create_feature_store
 from mmsp.utils.config import FeatureStoreConfig, load_platform_config
 from mmsp.utils.logging import configure_logging, get_logger
 
 configure_logging()
 LOG = get_logger(__name__)
 
-app = FastAPI(title="Feature API", version="0.1.0")
+SNAPSHOT_HEADER = "X-Feature-Snapshot"
+
+
+class FeatureBatchRequest(BaseModel):
+    entity_ids: List[str]
+
+
+def lookup_matrix(store: Any, entity_ids: List[str]) -> FeatureMatrix:
+    if hasattr(store, "get_matrix"):
+        return store.get_matrix(entity_ids)
+    return FeatureMatrix.from_dicts(entity_ids, store.get_features(entity_ids))
+
+
+def create_app(store: Any) -> FastAPI:
+    """Feature API over ``store``; one app per replica when the store is sharded."""
+    app = FastAPI(title="Feature API", version="0.1.0")
+
+    @app.on_event("startup")
+    def startup() -> None:
+        if isinstance(store, PollingReloader):
+            store.start()
+
+    @app.on_event("shutdown")
+    def shutdown() -> None:
+        if isinstance(store, PollingReloader):
+            store.stop()
+
+    @app.get("/healthz")
+    def health() -> Dict[str, Any]:
+        if not hasattr(store, "snapshot"):
+            return {"status": "ok"}
+        return {"status": "ok", "feature_snapshot": snapshot_info(store.snapshot())}
+
+    @app.get("/features")
+    def get_features(
+        entity_id: Optional[str] = None, entity_ids: Optional[List[str]] = Query(None)
+    ) -> Dict[str, Dict]:
+        ids: List[str] = []
+        if entity_id:
+            ids.append(entity_id)
+        if entity_ids:
+            ids.extend(entity_ids)
+        if not ids:
+            raise HTTPException(status_code=400, detail="No entity_id provided")
+        result = store.get_features(ids)
+        if not result:
+            raise HTTPException(status_code=404, detail="No features found")
+        return {"features": result}
+
+    @app.post("/features/batch")
+    def get_features_batch(body: FeatureBatchRequest, request: Request) -> Response:
+        """Column-oriented batch lookup encoded as JSON, Arrow IPC stream or msgpack per ``Accept``."""
+        media_type = negotiate(request.headers.get("accept"))
+        if media_type is None:
+            raise HTTPException(
+                status_code=406, detail=f"Supported media types: {', '.join(SUPPORTED_MEDIA_TYPES)}"
+            )
+        headers: Dict[str, str] = {}
+        if hasattr(store, "snapshot"):
+            snapshot = store.snapshot()
+            headers[SNAPSHOT_HEADER] = snapshot.version
+            batch = snapshot.get_matrix(body.entity_ids)
+        else:
+            batch = lookup_matrix(store, body.entity_ids)
+        return Response(content=encode_batch(batch, media_type), media_type=media_type, headers=headers)
+
+    return app
+
+
 platform_cfg = load_platform_config()
 feature_cfg: FeatureStoreConfig = platform_cfg.feature_store
-
-store = (
-    FeastAdapter(repo_path=".") if feature_cfg.mode == "feast" else LightweightFeatureStore(
-        feature_cfg.path, feature_cfg.entity_id_column
-    )
-)
-
-
-@app.get("/features")
-def get_features(entity_id: Optional[str] = None, entity_ids: Optional[List[str]] = Query(None)) -> Dict[str, Dict]:
-    ids: List[str] = []
-    if entity_id:
-        ids.append(entity_id)
-    if entity_ids:
-        ids.extend(entity_ids)
-    if not ids:
-        raise HTTPException(status_code=400, detail="No entity_id provided")
-    result = store.get_features(ids)
-    if not result:
-        raise HTTPException(status_code=404, detail="No features found")
-    return {"features": result}
+store = create_feature_store(feature_cfg)
+app = create_app(store)
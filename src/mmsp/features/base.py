@@ -0,0 +1,154 @@
+"""Shared types for feature stores."""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Protocol, Sequence
+
+import numpy as np
+
+from mmsp.monitoring.metrics import set_feature_snapshot
+from mmsp.utils.logging import get_logger
+
+LOG = get_logger(__name__)
+
+
+class FeatureMatrix(NamedTuple):
+    """Features for a list of entities as one float32 matrix.
+
+    ``values[i]`` holds the features of ``entity_ids[i]`` in ``columns`` order; rows of
+    entities that were not found are NaN and flagged ``False`` in ``found``.
+    """
+
+    entity_ids: List[str]
+    columns: List[str]
+    values: np.ndarray
+    found: np.ndarray
+
+    @classmethod
+    def from_dicts(
+        cls, entity_ids: Sequence[str | int], features: Mapping[str, Mapping[str, float]]
+    ) -> "FeatureMatrix":
+        """Build a matrix from ``get_features``-style dicts, for stores without ``get_matrix``."""
+        ids = [str(eid) for eid in entity_ids]
+        columns: List[str] = []
+        for row in features.values():
+            columns.extend(name for name in row if name not in columns)
+        positions = {name: pos for pos, name in enumerate(columns)}
+        values = np.full((len(ids), len(columns)), np.nan, dtype=np.float32)
+        found = np.zeros(len(ids), dtype=bool)
+        for idx, eid in enumerate(ids):
+            row = features.get(eid)
+            if row is not None:
+                found[idx] = True
+                for name, value in row.items():
+                    values[idx, positions[name]] = value
+        return cls(entity_ids=ids, columns=columns, values=values, found=found)
+
+    def to_dicts(self) -> Dict[str, Dict[str, float]]:
+        """Found rows as dicts; NaN cells are features the entity does not have and are left out."""
+        result: Dict[str, Dict[str, float]] = {}
+        for row, eid in enumerate(self.entity_ids):
+            if self.found[row]:
+                values = self.values[row].tolist()
+                result[eid] = {
+                    name: value
+                    for name, value in zip(self.columns, values, strict=True)
+                    if value == value
+                }
+        return result
+
+
+class FeatureStore(Protocol):
+    """Lookup interface shared by every feature store mode.
+
+    Batch lookups take the entity ids only; the store knows its own entity key. The
+    ``a``-prefixed variants are the same lookups for callers on an event loop.
+    """
+
+    def get_matrix(self, entity_ids: Iterable[str | int]) -> FeatureMatrix:
+        ...
+
+    def get_features(self, entity_ids: Iterable[str | int]) -> Dict[str, Dict[str, float]]:
+        ...
+
+    async def aget_matrix(self, entity_ids: Iterable[str | int]) -> FeatureMatrix:
+        ...
+
+    async def aget_features(self, entity_ids: Iterable[str | int]) -> Dict[str, Dict[str, float]]:
+        ...
+
+
+class ThreadedAsyncLookups:
+    """Mixin providing the async lookups of :class:`FeatureStore` on a worker thread."""
+
+    async def aget_matrix(self, entity_ids: Iterable[str | int]) -> FeatureMatrix:
+        return await asyncio.to_thread(self.get_matrix, list(entity_ids))  # type: ignore[attr-defined]
+
+    async def aget_features(self, entity_ids: Iterable[str | int]) -> Dict[str, Dict[str, float]]:
+        return await asyncio.to_thread(self.get_features, list(entity_ids))  # type: ignore[attr-defined]
+
+
+class FeatureSnapshot(Protocol):
+    """Immutable, fully loaded view of a store.
+
+    Stores build a new snapshot off the request path and publish it with a single
+    reference assignment. Holding a snapshot pins it: the previous one is freed only when
+    the last reader drops its reference.
+    """
+
+    version: str
+    loaded_at: float
+
+    def __len__(self) -> int:
+        ...
+
+    def get_matrix(self, entity_ids: Iterable[str | int]) -> FeatureMatrix:
+        ...
+
+    def get_features(self, entity_ids: Iterable[str | int]) -> Dict[str, Dict[str, float]]:
+        ...
+
+
+def publish_snapshot_metrics(store: str, snapshot: FeatureSnapshot) -> None:
+    set_feature_snapshot(store, snapshot.version, snapshot.loaded_at, len(snapshot))
+
+
+def snapshot_info(snapshot: FeatureSnapshot) -> Dict[str, Any]:
+    return {"version": snapshot.version, "loaded_at": snapshot.loaded_at, "rows": len(snapshot)}
+
+
+class PollingReloader(abc.ABC):
+    """Mixin running ``reload()`` every ``reload_interval_s`` seconds on a daemon thread."""
+
+    reload_interval_s: Optional[float] = None
+    _stop: Optional[threading.Event] = None
+    _thread: Optional[threading.Thread] = None
+
+    @abc.abstractmethod
+    def reload(self, force: bool = False) -> bool:
+        """Switch to newer data if there is any; returns whether a new snapshot was published."""
+
+    def start(self) -> None:
+        if self._thread is not None or not self.reload_interval_s:
+            return
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="mmsp-feature-reload", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._stop is not None:
+            self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        assert self._stop is not None
+        while not self._stop.wait(self.reload_interval_s):
+            try:
+                self.reload()
+            except Exception:  # noqa: BLE001
+                LOG.exception("Feature store reload failed", extra={"store": type(self).__name__})
@@ -0,0 +1,152 @@
+"""Wire formats for batched Feature API responses."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pyarrow as pa
+
+from mmsp.features.base import FeatureMatrix
+
+JSON_MEDIA_TYPE = "application/json"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+
+_MEDIA_ALIASES = {
+    "application/msgpack": MSGPACK_MEDIA_TYPE,
+    "application/vnd.msgpack": MSGPACK_MEDIA_TYPE,
+}
+SUPPORTED_MEDIA_TYPES = (JSON_MEDIA_TYPE, ARROW_MEDIA_TYPE, MSGPACK_MEDIA_TYPE)
+
+ENTITY_ID_FIELD = "entity_id"
+MISSING_METADATA_KEY = b"missing"
+
+
+def _msgpack() -> Any:
+    try:
+        import msgpack  # type: ignore
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError("msgpack not installed. Install msgpack to enable msgpack responses.") from exc
+    return msgpack
+
+
+def msgpack_available() -> bool:
+    try:
+        _msgpack()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _parse_quality(value: str) -> Optional[float]:
+    try:
+        quality = float(value)
+    except ValueError:
+        return None
+    return quality if 0.0 <= quality <= 1.0 else None
+
+
+def negotiate(accept: Optional[str]) -> Optional[str]:
+    """Pick the response media type from an ``Accept`` header; None if nothing matches.
+
+    Media ranges with a malformed or out-of-range ``q`` parameter are skipped.
+    """
+    if not accept:
+        return JSON_MEDIA_TYPE
+    candidates = []
+    for order, item in enumerate(accept.split(",")):
+        media_type, *params = (part.strip() for part in item.split(";"))
+        quality: Optional[float] = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                quality = _parse_quality(value)
+        if quality is None:
+            continue
+        candidates.append((-quality, order, _MEDIA_ALIASES.get(media_type.lower(), media_type.lower())))
+    for neg_quality, _, media_type in sorted(candidates):
+        if neg_quality == 0:
+            break
+        if media_type in ("*/*", "application/*"):
+            return JSON_MEDIA_TYPE
+        if media_type == MSGPACK_MEDIA_TYPE and not msgpack_available():
+            continue
+        if media_type in SUPPORTED_MEDIA_TYPES:
+            return media_type
+    return None
+
+
+def _found_only(batch: FeatureMatrix) -> tuple[List[str], List[str], np.ndarray]:
+    found = np.asarray(batch.found, dtype=bool)
+    ids = [eid for eid, hit in zip(batch.entity_ids, found.tolist(), strict=True) if hit]
+    missing = [eid for eid, hit in zip(batch.entity_ids, found.tolist(), strict=True) if not hit]
+    return ids, missing, np.ascontiguousarray(batch.values[found], dtype=np.float32)
+
+
+def encode_batch(batch: FeatureMatrix, media_type: str) -> bytes:
+    """Serialize the found rows of ``batch`` column by column; unknown ids go in ``missing``."""
+    ids, missing, values = _found_only(batch)
+    if media_type == ARROW_MEDIA_TYPE:
+        arrays = [pa.array(ids, type=pa.string())]
+        arrays.extend(pa.array(values[:, pos]) for pos in range(values.shape[1]))
+        schema = pa.schema(
+            [pa.field(ENTITY_ID_FIELD, pa.string())]
+            + [pa.field(name, pa.float32()) for name in batch.columns],
+            metadata={MISSING_METADATA_KEY: json.dumps(missing)},
+        )
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, schema) as writer:
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+        return sink.getvalue().to_pybytes()
+    if media_type == MSGPACK_MEDIA_TYPE:
+        columns = np.asfortranarray(values.astype("<f4", copy=False))
+        payload = {
+            "entity_ids": ids,
+            "missing": missing,
+            "columns": list(batch.columns),
+            "data": [columns[:, pos].tobytes() for pos in range(columns.shape[1])],
+        }
+        return _msgpack().packb(payload, use_bin_type=True)
+    if media_type == JSON_MEDIA_TYPE:
+        data = [
+            [None if np.isnan(v) else v for v in values[:, pos].tolist()] for pos in range(values.shape[1])
+        ]
+        payload = {"entity_ids": ids, "missing": missing, "columns": list(batch.columns), "data": data}
+        return json.dumps(payload).encode("utf-8")
+    raise ValueError(f"Unsupported media type {media_type}")
+
+
+def _matrix(ids: List[str], columns: List[str], values: np.ndarray) -> FeatureMatrix:
+    return FeatureMatrix(
+        entity_ids=ids, columns=columns, values=values, found=np.ones(len(ids), dtype=bool)
+    )
+
+
+def decode_batch(body: bytes, media_type: str) -> tuple[FeatureMatrix, List[str]]:
+    """Decode an :func:`encode_batch` payload into ``(found rows, missing ids)``."""
+    media_type = _MEDIA_ALIASES.get(media_type, media_type)
+    if media_type == ARROW_MEDIA_TYPE:
+        table = pa.ipc.open_stream(pa.py_buffer(body)).read_all()
+        missing = json.loads((table.schema.metadata or {}).get(MISSING_METADATA_KEY, b"[]"))
+        columns = [name for name in table.column_names if name != ENTITY_ID_FIELD]
+        values = np.empty((table.num_rows, len(columns)), dtype=np.float32)
+        for pos, name in enumerate(columns):
+            values[:, pos] = table.column(name).to_numpy()
+        ids = table.column(ENTITY_ID_FIELD).to_pylist()
+        return _matrix(ids, columns, values), missing
+    if media_type == MSGPACK_MEDIA_TYPE:
+        payload: Dict[str, Any] = _msgpack().unpackb(body, raw=False)
+        ids = payload["entity_ids"]
+        values = np.empty((len(ids), len(payload["columns"])), dtype=np.float32)
+        for pos, raw in enumerate(payload["data"]):
+            values[:, pos] = np.frombuffer(raw, dtype="<f4")
+        return _matrix(ids, payload["columns"], values), payload["missing"]
+    if media_type == JSON_MEDIA_TYPE:
+        payload = json.loads(body)
+        ids = payload["entity_ids"]
+        data = np.array(payload["data"], dtype=np.float32).reshape(len(payload["columns"]), len(ids))
+        values = np.ascontiguousarray(data.T)
+        return _matrix(ids, payload["columns"], values), payload["missing"]
+    raise ValueError(f"Unsupported media type {media_type}")
@@ -0,0 +1,222 @@
+"""Disk-backed feature store in an embedded SQLite database."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from mmsp.features.base import FeatureMatrix, ThreadedAsyncLookups
+from mmsp.features.ingest import DEFAULT_BATCH_ROWS
+from mmsp.utils.logging import get_logger
+
+LOG = get_logger(__name__)
+
+# Ids bound per ``IN (...)`` query; stays below SQLite's host parameter limit.
+LOOKUP_CHUNK = 500
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS features "
+    "(entity_id TEXT PRIMARY KEY, vec BLOB NOT NULL) WITHOUT ROWID",
+)
+
+
+def _pack(values: np.ndarray) -> List[bytes]:
+    rows = np.ascontiguousarray(values, dtype="<f4")
+    return [row.tobytes() for row in rows]
+
+
+class EmbeddedFeatureStore(ThreadedAsyncLookups):
+    """Feature table kept in a local SQLite file in WAL mode, keyed by entity id.
+
+    Each entity's features are one fixed-layout blob of little-endian float32 values in
+    the column order recorded in the ``meta`` table, so only the requested rows are read
+    from disk and the table can be far larger than memory. Lookups are batched multi-gets
+    in a single read transaction; WAL lets them run concurrently with bulk loads and
+    upserts from other threads or processes, which commit atomically.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        entity_id_column: str = "entity_id",
+        mmap_size_mb: int = 256,
+        cache_size_mb: int = 64,
+    ) -> None:
+        self.path = Path(path)
+        self.entity_id_column = entity_id_column
+        self.mmap_size_mb = mmap_size_mb
+        self.cache_size_mb = cache_size_mb
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._conn_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        conn = self._connection()
+        with conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode; transactions are opened explicitly with BEGIN.
+            conn = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA mmap_size={self.mmap_size_mb * 1024 * 1024}")
+            conn.execute(f"PRAGMA cache_size=-{self.cache_size_mb * 1024}")
+            self._local.conn = conn
+            with self._conn_lock:
+                self._connections.append(conn)
+        return conn
+
+    @staticmethod
+    def _read_columns(conn: sqlite3.Connection) -> List[str]:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'columns'").fetchone()
+        return json.loads(row[0]) if row else []
+
+    @property
+    def columns(self) -> List[str]:
+        return self._read_columns(self._connection())
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT count(*) FROM features").fetchone()[0]
+
+    @staticmethod
+    def _read_rows(conn: sqlite3.Connection, ids: Sequence[str]) -> Dict[str, bytes]:
+        rows: Dict[str, bytes] = {}
+        unique = list(dict.fromkeys(ids))
+        for start in range(0, len(unique), LOOKUP_CHUNK):
+            chunk = unique[start : start + LOOKUP_CHUNK]
+            marks = ",".join("?" * len(chunk))
+            query = f"SELECT entity_id, vec FROM features WHERE entity_id IN ({marks})"
+            rows.update(conn.execute(query, chunk))
+        return rows
+
+    def get_matrix(self, entity_ids: Iterable[str | int]) -> FeatureMatrix:
+        ids = [str(eid) for eid in entity_ids]
+        conn = self._connection()
+        conn.execute("BEGIN")
+        try:
+            columns = self._read_columns(conn)
+            rows = self._read_rows(conn, ids)
+        finally:
+            conn.execute("COMMIT")
+        found = np.fromiter((eid in rows for eid in ids), dtype=bool, count=len(ids))
+        values = np.full((len(ids), len(columns)), np.nan, dtype=np.float32)
+        if rows and columns:
+            blob = b"".join(rows[eid] for eid, hit in zip(ids, found.tolist(), strict=True) if hit)
+            values[found] = np.frombuffer(blob, dtype="<f4").reshape(-1, len(columns))
+        return FeatureMatrix(entity_ids=ids, columns=columns, values=values, found=found)
+
+    def get_features(self, entity_ids: Iterable[str | int]) -> Dict[str, Dict[str, float]]:
+        return self.get_matrix(entity_ids).to_dicts()
+
+    def _write(
+        self, columns: Sequence[str], batches: Iterable[Tuple[List[str], np.ndarray]], replace: bool
+    ) -> int:
+        conn = self._connection()
+        rows = 0
+        with self._write_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if replace:
+                    conn.execute("DELETE FROM features")
+                elif self._read_columns(conn) not in ([], list(columns)):
+                    raise ValueError("Feature layout changed by a concurrent load")
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('columns', ?)",
+                    (json.dumps(list(columns)),),
+                )
+                for ids, values in batches:
+                    if not replace:
+                        self._carry_forward(conn, ids, values)
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO features (entity_id, vec) VALUES (?, ?)",
+                        zip(ids, _pack(values), strict=True),
+                    )
+                    rows += len(ids)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        return rows
+
+    def _carry_forward(self, conn: sqlite3.Connection, ids: List[str], values: np.ndarray) -> None:
+        """Fill the NaN cells of upserted rows with the entity's stored values, in place."""
+        stored = self._read_rows(conn, ids)
+        for row, eid in enumerate(ids):
+            blob = stored.get(eid)
+            if blob is not None:
+                missing = np.isnan(values[row])
+                values[row, missing] = np.frombuffer(blob, dtype="<f4")[missing]
+
+    def load_from_parquet(self, parquet_path: str, batch_rows: int = DEFAULT_BATCH_ROWS) -> int:
+        """Replace the whole table with ``parquet_path``, streamed one record batch at a time.
+
+        Readers keep seeing the previous table until the load commits.
+        """
+        parquet = pq.ParquetFile(parquet_path)
+        names = parquet.schema_arrow.names
+        if self.entity_id_column not in names:
+            raise ValueError(f"entity_id_column {self.entity_id_column} missing from {parquet_path}")
+        columns = [
+            c for c in names if c != self.entity_id_column and not c.startswith("__index_level_")
+        ]
+
+        def batches() -> Iterable[Tuple[List[str], np.ndarray]]:
+            wanted = [self.entity_id_column, *columns]
+            for batch in parquet.iter_batches(batch_size=batch_rows, columns=wanted):
+                values = np.empty((batch.num_rows, len(columns)), dtype=np.float32)
+                for pos, name in enumerate(columns):
+                    cast = pc.cast(batch.column(name), pa.float32())
+                    values[:, pos] = cast.to_numpy(zero_copy_only=False)
+                ids = pc.cast(batch.column(self.entity_id_column), pa.string()).to_pylist()
+                yield ids, values
+
+        rows = self._write(columns, batches(), replace=True)
+        LOG.info("Loaded features", extra={"rows": rows, "dest": str(self.path)})
+        return rows
+
+    def upsert(self, records: List[Dict[str, object]]) -> None:
+        """Insert or update the rows of ``records``; omitted features keep their stored value.
+
+        Features a new entity's record omits are stored as NaN, i.e. missing. The row
+        layout is fixed by the last bulk load; records with other features are rejected.
+        An empty store takes its layout from the first upsert.
+        """
+        columns = self.columns
+        if not columns:
+            for record in records:
+                columns.extend(k for k in record if k != self.entity_id_column and k not in columns)
+        ids: List[str] = []
+        values = np.full((len(records), len(columns)), np.nan, dtype=np.float32)
+        positions = {name: pos for pos, name in enumerate(columns)}
+        for row, record in enumerate(records):
+            if self.entity_id_column not in record:
+                raise ValueError(f"entity_id_column {self.entity_id_column} missing")
+            ids.append(str(record[self.entity_id_column]))
+            for name, value in record.items():
+                if name == self.entity_id_column:
+                    continue
+                if name not in positions:
+                    raise ValueError(f"Feature {name} is not in the store layout {columns}")
+                values[row, positions[name]] = value
+        self._write(columns, [(ids, values)], replace=False)
+        LOG.info("Upserted features", extra={"rows": len(ids), "dest": str(self.path)})
+
+    def close(self) -> None:
+        with self._conn_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
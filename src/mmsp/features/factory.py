@@ -0,0 +1,68 @@
+"""Construct the feature store selected by ``feature_store.mode``."""
+
+from __future__ import annotations
+
+import os
+from typing import Union
+
+from mmsp.features.embedded_store import EmbeddedFeatureStore
+from mmsp.features.feast_adapter import FeastAdapter
+from mmsp.features.lightweight_store import LightweightFeatureStore
+from mmsp.features.mmap_store import MmapFeatureStore
+from mmsp.features.sharding import ShardedFeatureStore
+from mmsp.utils.config import FeatureStoreConfig
+
+# Every member implements mmsp.features.base.FeatureStore.
+FeatureStoreType = Union[
+    LightweightFeatureStore, MmapFeatureStore, ShardedFeatureStore, EmbeddedFeatureStore, FeastAdapter
+]
+
+# Lets replicas that share one config (e.g. StatefulSet pods) state which ring member they are.
+REPLICA_ENV = "MMSP_FEATURE_REPLICA"
+
+
+def create_feature_store(cfg: FeatureStoreConfig) -> FeatureStoreType:
+    if cfg.mode == "feast":
+        feast = cfg.feast
+        return FeastAdapter(
+            repo_path=feast.repo_path,
+            features=feast.features,
+            feature_service=feast.feature_service,
+            entity_key=feast.entity_key,
+            entity_id_type=feast.entity_id_type,
+            batch_size=feast.batch_size,
+            max_concurrency=feast.max_concurrency,
+        )
+    if cfg.mode == "embedded":
+        return EmbeddedFeatureStore(
+            cfg.path,
+            cfg.entity_id_column,
+            mmap_size_mb=cfg.embedded.mmap_size_mb,
+            cache_size_mb=cfg.embedded.cache_size_mb,
+        )
+    if cfg.mode == "mmap":
+        return MmapFeatureStore(
+            cfg.path, cfg.entity_id_column, reload_interval_s=cfg.reload_interval_s
+        )
+    if cfg.mode == "sharded":
+        sharding = cfg.sharding
+        replica = os.environ.get(REPLICA_ENV) or sharding.replica
+        if not replica or sharding.num_shards <= 0:
+            raise ValueError("sharded mode needs feature_store.sharding.num_shards and a replica name")
+        return ShardedFeatureStore(
+            cfg.path,
+            replicas=sharding.replicas,
+            replica=replica,
+            num_shards=sharding.num_shards,
+            entity_id_column=cfg.entity_id_column,
+            vnodes=sharding.vnodes,
+            reload_interval_s=cfg.reload_interval_s,
+        )
+    if cfg.mode != "lightweight":
+        raise ValueError(f"Unsupported feature_store mode {cfg.mode}")
+    return LightweightFeatureStore(
+        cfg.path,
+        cfg.entity_id_column,
+        reload_interval_s=cfg.reload_interval_s,
+        compact_after_segments=cfg.compact_after_segments,
+    )
@@ -2,30 +2,139 @@
 
 from __future__ import annotations
 
-from typing import Dict, Iterable
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
+import numpy as np
+
+from mmsp.features.base import FeatureMatrix
 from mmsp.utils.logging import get_logger
 
 LOG = get_logger(__name__)
 
 
 class FeastAdapter:
-    def __init__(self, repo_path: str) -> None:
+    """Online lookups against a Feast feature store.
+
+    Id lists are split into ``get_online_features`` calls of at most ``batch_size`` entity
+    rows that run concurrently on up to ``max_concurrency`` threads. Each call's columnar
+    ``to_dict()`` result is copied straight into the float32 matrix of a
+    :class:`FeatureMatrix`; an entity is reported as not found when Feast returns no
+    value for any of its features. ``store`` may be any object with Feast's
+    ``get_online_features``/``get_feature_service`` interface, e.g. a fake in tests.
+    """
+
+    def __init__(
+        self,
+        repo_path: str = ".",
+        features: Sequence[str] = (),
+        feature_service: Optional[str] = None,
+        entity_key: str = "entity_id",
+        entity_id_type: str = "int64",
+        batch_size: int = 500,
+        max_concurrency: int = 8,
+        store: Any = None,
+    ) -> None:
+        if not features and not feature_service:
+            raise ValueError("Feast mode needs feature_store.feast.features or feature_service")
+        if entity_id_type not in ("int64", "string"):
+            raise ValueError(f"Unsupported Feast entity_id_type {entity_id_type}")
+        if store is None:
+            try:
+                from feast import FeatureStore  # type: ignore
+            except ImportError as exc:  # pragma: no cover - optional dependency
+                raise RuntimeError(
+                    "Feast not installed. Install feast to enable feast mode."
+                ) from exc
+            store = FeatureStore(repo_path=repo_path)
+        self.store = store
+        self.entity_key = entity_key
+        self.entity_id_type = entity_id_type
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.features: Any = (
+            store.get_feature_service(feature_service) if feature_service else list(features)
+        )
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="feast")
+
+    def _entity_value(self, entity_id: str) -> Any:
+        return int(entity_id) if self.entity_id_type == "int64" else entity_id
+
+    def _valid_id(self, entity_id: str) -> bool:
         try:
-            from feast import FeatureStore  # type: ignore
-        except ImportError as exc:  # pragma: no cover - optional dependency
-            raise RuntimeError(
-                "Feast not installed. Install feast to enable feast mode."
-            ) from exc
-        self.store = FeatureStore(repo_path=repo_path)
-
-    def get_features(self, entity_name: str, entity_ids: Iterable[str | int]) -> Dict[str, Dict[str, float]]:
-        features = self.store.get_online_features(
-            features=[f"{entity_name}:*"],
-            entity_rows=[{"entity_id": eid} for eid in entity_ids],
+            self._entity_value(entity_id)
+        except ValueError:
+            return False
+        return True
+
+    def _chunks(self, ids: List[str]) -> List[List[str]]:
+        # Ids that cannot be an entity key (e.g. "abc" for int64 keys) are never sent.
+        valid = [eid for eid in ids if self._valid_id(eid)]
+        return [valid[i : i + self.batch_size] for i in range(0, len(valid), self.batch_size)]
+
+    @staticmethod
+    def _expand(ids: List[str], batch: FeatureMatrix) -> FeatureMatrix:
+        """Lay ``batch`` out over ``ids``; ids that were not looked up are not found."""
+        if batch.entity_ids == ids:
+            return batch
+        rows = {eid: row for row, eid in enumerate(batch.entity_ids)}
+        values = np.full((len(ids), len(batch.columns)), np.nan, dtype=np.float32)
+        found = np.zeros(len(ids), dtype=bool)
+        for idx, eid in enumerate(ids):
+            row = rows.get(eid)
+            if row is not None:
+                values[idx] = batch.values[row]
+                found[idx] = batch.found[row]
+        columns = list(batch.columns)
+        return FeatureMatrix(entity_ids=ids, columns=columns, values=values, found=found)
+
+    def _fetch(self, entity_ids: List[str]) -> FeatureMatrix:
+        response = self.store.get_online_features(
+            features=self.features,
+            entity_rows=[{self.entity_key: self._entity_value(eid)} for eid in entity_ids],
         ).to_dict()
-        result: Dict[str, Dict[str, float]] = {}
-        for idx, eid in enumerate(entity_ids):
-            feature_map = {k: v[idx] for k, v in features.items()}
-            result[str(eid)] = {k: float(v) for k, v in feature_map.items()}
-        return result
+        columns = [name for name in response if name != self.entity_key]
+        values = np.empty((len(entity_ids), len(columns)), dtype=np.float32)
+        for pos, name in enumerate(columns):
+            # Feast reports missing values as None, which becomes NaN in a float array.
+            values[:, pos] = np.array(response[name], dtype=np.float64)
+        found = ~np.isnan(values).all(axis=1) if columns else np.zeros(len(entity_ids), dtype=bool)
+        return FeatureMatrix(entity_ids=entity_ids, columns=columns, values=values, found=found)
+
+    def _merge(self, parts: List[FeatureMatrix]) -> FeatureMatrix:
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            return FeatureMatrix.from_dicts([], {})
+        return FeatureMatrix(
+            entity_ids=[eid for part in parts for eid in part.entity_ids],
+            columns=list(parts[0].columns),
+            values=np.concatenate([part.values for part in parts]),
+            found=np.concatenate([part.found for part in parts]),
+        )
+
+    def get_matrix(self, entity_ids: Iterable[str | int]) -> FeatureMatrix:
+        ids = [str(eid) for eid in entity_ids]
+        chunks = self._chunks(ids)
+        if len(chunks) <= 1:
+            return self._expand(ids, self._merge([self._fetch(chunk) for chunk in chunks]))
+        return self._expand(ids, self._merge(list(self._executor.map(self._fetch, chunks))))
+
+    def get_features(self, entity_ids: Iterable[str | int]) -> Dict[str, Dict[str, float]]:
+        return self.get_matrix(entity_ids).to_dicts()
+
+    async def aget_matrix(self, entity_ids: Iterable[str | int]) -> FeatureMatrix:
+        loop = asyncio.get_running_loop()
+        ids = [str(eid) for eid in entity_ids]
+        chunks = self._chunks(ids)
+        parts = await asyncio.gather(
+            *(loop.run_in_executor(self._executor, self._fetch, chunk) for chunk in chunks)
+        )
+        return self._expand(ids, self._merge(list(parts)))
+
+    async def aget_features(self, entity_ids: Iterable[str | int]) -> Dict[str, Dict[str, float]]:
+        return (await self.aget_matrix(entity_ids)).to_dicts()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
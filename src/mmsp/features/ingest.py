@@ -0,0 +1,245 @@
+"""Streaming, row-group-parallel bulk ingestion of feature tables."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from mmsp.features.partitioning import shard_for_ids, shard_name
+from mmsp.utils.config import FeatureStoreConfig
+from mmsp.utils.io import publish_versioned_dir
+from mmsp.utils.logging import get_logger
+
+LOG = get_logger(__name__)
+
+MANIFEST_FILE = "_manifest.json"
+DEFAULT_BATCH_ROWS = 65_536
+
+
+@dataclass
+class IngestStats:
+    rows: int
+    seconds: float
+    outputs: List[str] = field(default_factory=list)
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float("inf")
+
+
+def _split_row_groups(num_row_groups: int, tasks: int) -> List[List[int]]:
+    """Contiguous runs of row groups, so each shard keeps the source's row order."""
+    tasks = max(1, min(tasks, num_row_groups))
+    bounds = np.linspace(0, num_row_groups, tasks + 1).astype(int)
+    return [list(range(lo, hi)) for lo, hi in zip(bounds[:-1], bounds[1:], strict=True) if hi > lo]
+
+
+def _partition_row_groups(
+    source: str,
+    row_groups: Sequence[int],
+    staging: str,
+    task_id: int,
+    entity_id_column: str,
+    num_shards: int,
+    batch_rows: int,
+) -> Dict[int, int]:
+    """Stream ``row_groups`` of ``source`` into one part file per shard; returns rows per shard."""
+    parquet = pq.ParquetFile(source)
+    writers: Dict[int, pq.ParquetWriter] = {}
+    counts: Dict[int, int] = {}
+    try:
+        for batch in parquet.iter_batches(batch_size=batch_rows, row_groups=list(row_groups)):
+            if num_shards > 1:
+                ids = pc.cast(batch.column(entity_id_column), pa.string()).to_pylist()
+                shards = shard_for_ids(ids, num_shards)
+                pieces: List[Tuple[int, pa.RecordBatch]] = [
+                    (int(shard), batch.filter(pa.array(shards == shard))) for shard in np.unique(shards)
+                ]
+            else:
+                pieces = [(0, batch)]
+            for shard, piece in pieces:
+                writer = writers.get(shard)
+                if writer is None:
+                    part_dir = Path(staging) / shard_name(shard)
+                    part_dir.mkdir(parents=True, exist_ok=True)
+                    writer = pq.ParquetWriter(part_dir / f"part-{task_id:05d}.parquet", piece.schema)
+                    writers[shard] = writer
+                writer.write_batch(piece)
+                counts[shard] = counts.get(shard, 0) + piece.num_rows
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return counts
+
+
+def _merge_parts(part_dir: str, output: str, schema_bytes: bytes, batch_rows: int) -> int:
+    """Concatenate a shard's part files, in task order, into one Parquet file."""
+    schema = pa.ipc.read_schema(pa.py_buffer(schema_bytes))
+    rows = 0
+    with pq.ParquetWriter(output, schema) as writer:
+        parts = sorted(Path(part_dir).glob("part-*.parquet")) if Path(part_dir).exists() else []
+        for part in parts:
+            for batch in pq.ParquetFile(part).iter_batches(batch_size=batch_rows):
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    return rows
+
+
+class _InlineExecutor(Executor):
+    """Runs submitted work in the calling process (``workers=1``)."""
+
+    def map(self, fn, *iterables, timeout=None, chunksize=1) -> Iterator:  # type: ignore[override]
+        return map(fn, *iterables)
+
+
+def ingest_parquet(
+    source: str,
+    dest: str,
+    entity_id_column: str = "entity_id",
+    num_shards: int = 1,
+    workers: Optional[int] = None,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+) -> IngestStats:
+    """Copy ``source`` into ``dest``, optionally hash-partitioned by entity id.
+
+    The source is streamed record batch by record batch, so memory stays bounded by
+    ``batch_rows`` per worker regardless of table size. Contiguous row-group ranges are
+    partitioned in parallel in a process pool into per-shard part files, which are then
+    merged per shard in parallel. With ``num_shards == 1`` the result is the single file
+    ``dest``, replaced with an atomic rename. Otherwise each shard set of
+    ``shard-XXXXX.parquet`` files plus a ``_manifest.json`` is published as a new version
+    of the directory ``dest`` behind its ``CURRENT`` pointer (:func:`publish_versioned_dir`).
+    """
+    start = time.perf_counter()
+    source_file = pq.ParquetFile(source)
+    schema = source_file.schema_arrow
+    if entity_id_column not in schema.names:
+        raise ValueError(f"entity_id_column {entity_id_column} missing from {source}")
+    workers = workers or os.cpu_count() or 1
+    dest_path = Path(dest)
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    staging = dest_path.with_name(f".{dest_path.name}.ingest-{os.getpid()}")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    tasks = _split_row_groups(source_file.num_row_groups, workers * 2)
+    shards = list(range(max(num_shards, 1)))
+    merged = staging / "merged"
+    merged.mkdir()
+    outputs = [merged / f"{shard_name(shard)}.parquet" for shard in shards]
+    schema_bytes = schema.serialize().to_pybytes()
+
+    executor: Executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else _InlineExecutor()
+    try:
+        with executor:
+            list(
+                executor.map(
+                    _partition_row_groups,
+                    [source] * len(tasks),
+                    tasks,
+                    [str(staging / "parts")] * len(tasks),
+                    range(len(tasks)),
+                    [entity_id_column] * len(tasks),
+                    [num_shards] * len(tasks),
+                    [batch_rows] * len(tasks),
+                )
+            )
+            rows = sum(
+                executor.map(
+                    _merge_parts,
+                    [str(staging / "parts" / shard_name(shard)) for shard in shards],
+                    [str(path) for path in outputs],
+                    [schema_bytes] * len(shards),
+                    [batch_rows] * len(shards),
+                )
+            )
+        if num_shards <= 1:
+            os.replace(outputs[0], dest_path)
+            published = [str(dest_path)]
+        else:
+            manifest = {
+                "num_shards": num_shards,
+                "entity_id_column": entity_id_column,
+                "rows": rows,
+                "source": str(source),
+                "shards": [path.name for path in outputs],
+            }
+            (merged / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+            if dest_path.is_file():
+                dest_path.unlink()
+            version = publish_versioned_dir(merged, dest_path)
+            published = [str(version / path.name) for path in outputs]
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    stats = IngestStats(rows=rows, seconds=time.perf_counter() - start, outputs=published)
+    LOG.info(
+        "Ingested features",
+        extra={
+            "source": str(source),
+            "dest": str(dest_path),
+            "rows": stats.rows,
+            "shards": num_shards,
+            "workers": workers,
+            "seconds": round(stats.seconds, 3),
+            "rows_per_s": round(stats.rows_per_s, 1),
+        },
+    )
+    return stats
+
+
+def load_feature_store(
+    cfg: FeatureStoreConfig,
+    source: str,
+    dest: Optional[str] = None,
+    num_shards: int = 1,
+    workers: Optional[int] = None,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+) -> IngestStats:
+    """Bulk-load ``source`` in the format of the configured ``feature_store.mode``.
+
+    ``lightweight`` replaces the base Parquet file (or writes a shard directory when
+    ``num_shards > 1``) and drops pending deltas; ``mmap`` publishes a new snapshot;
+    ``embedded`` replaces the SQLite table in one transaction.
+    """
+    if cfg.mode == "mmap":
+        if num_shards > 1:
+            raise ValueError("Sharded ingestion is only supported for the lightweight format")
+        from mmsp.features.mmap_store import write_snapshot
+
+        start = time.perf_counter()
+        snapshot = write_snapshot(dest or cfg.path, source, cfg.entity_id_column, batch_rows=batch_rows)
+        rows = json.loads((snapshot / "meta.json").read_text())["rows"]
+        return IngestStats(rows=rows, seconds=time.perf_counter() - start, outputs=[str(snapshot)])
+    if cfg.mode == "embedded":
+        if num_shards > 1:
+            raise ValueError("Sharded ingestion is only supported for the lightweight format")
+        from mmsp.features.embedded_store import EmbeddedFeatureStore
+
+        start = time.perf_counter()
+        store = EmbeddedFeatureStore(dest or cfg.path, cfg.entity_id_column)
+        try:
+            rows = store.load_from_parquet(source, batch_rows=batch_rows)
+        finally:
+            store.close()
+        return IngestStats(rows=rows, seconds=time.perf_counter() - start, outputs=[str(store.path)])
+    if cfg.mode != "lightweight":
+        raise ValueError(f"Bulk loading is not supported for feature_store mode {cfg.mode}")
+    from mmsp.features.lightweight_store import discard_deltas
+
+    if dest is None:
+        dest = cfg.path if num_shards <= 1 else str(Path(cfg.path).with_suffix(".shards"))
+    stats = ingest_parquet(source, dest, cfg.entity_id_column, num_shards, workers, batch_rows)
+    if num_shards <= 1:
+        discard_deltas(Path(dest))
+    return stats
@@ -2,43 +2,328 @@
 
 from __future__ import annotations
 
+import os
+import threading
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
+from mmsp.features.base import (
+    FeatureMatrix,
+    PollingReloader,
+    ThreadedAsyncLookups,
+    publish_snapshot_metrics,
+)
+from mmsp.features.ingest import ingest_parquet
 from mmsp.utils.logging import get_logger
 
 LOG = get_logger(__name__)
 
+DELTA_PREFIX = "delta-"
 
-class LightweightFeatureStore:
-    def __init__(self, path: str, entity_id_column: str = "entity_id") -> None:
+
+def delta_dir_for(path: Path) -> Path:
+    return path.with_name(f"{path.name}.deltas")
+
+
+def discard_deltas(path: Path) -> int:
+    """Remove pending delta segments of the store at ``path``, e.g. after a full reload."""
+    segments = sorted(delta_dir_for(path).glob(f"{DELTA_PREFIX}*.parquet"))
+    for segment in segments:
+        segment.unlink(missing_ok=True)
+    return len(segments)
+
+
+@dataclass(frozen=True)
+class _FeatureTable:
+    """Immutable float32 matrix with an entity -> row index; later rows win for an id."""
+
+    columns: List[str]
+    values: np.ndarray
+    index: Dict[str, int]
+
+
+_EMPTY_TABLE = _FeatureTable(columns=[], values=np.empty((0, 0), dtype=np.float32), index={})
+
+
+def _from_arrow(table: pa.Table, entity_id_column: str, source: object) -> _FeatureTable:
+    if entity_id_column not in table.column_names:
+        raise ValueError(f"entity_id_column {entity_id_column} missing from {source}")
+    columns = [
+        name
+        for name in table.column_names
+        if name != entity_id_column and not name.startswith("__index_level_")
+    ]
+    values = np.empty((table.num_rows, len(columns)), dtype=np.float32)
+    for pos, name in enumerate(columns):
+        values[:, pos] = pc.cast(table.column(name), pa.float32()).to_numpy(zero_copy_only=False)
+    ids = table.column(entity_id_column).to_pylist()
+    # Keys are strings so "1" finds an int64 entity 1.
+    index = {str(eid): row for row, eid in enumerate(ids)}
+    return _FeatureTable(columns=columns, values=values, index=index)
+
+
+def _append(delta: _FeatureTable, columns: List[str], update: _FeatureTable) -> _FeatureTable:
+    """Append ``update`` to ``delta`` in ``columns`` layout; absent columns become NaN."""
+    values = np.full((delta.values.shape[0], len(columns)), np.nan, dtype=np.float32)
+    values[:, : delta.values.shape[1]] = delta.values
+    added = np.full((update.values.shape[0], len(columns)), np.nan, dtype=np.float32)
+    positions = {name: pos for pos, name in enumerate(columns)}
+    added[:, [positions[name] for name in update.columns]] = update.values
+    offset = values.shape[0]
+    index = dict(delta.index)
+    index.update((eid, offset + row) for eid, row in update.index.items())
+    return _FeatureTable(columns=list(columns), values=np.concatenate([values, added]), index=index)
+
+
+@dataclass(frozen=True)
+class LightweightSnapshot:
+    """Base table plus the merged delta segments; delta rows shadow base rows."""
+
+    columns: List[str]
+    base: _FeatureTable
+    delta: _FeatureTable
+    version: str
+    loaded_at: float = field(default_factory=time.time)
+
+    def __len__(self) -> int:
+        return len(self.base.index) + sum(1 for eid in self.delta.index if eid not in self.base.index)
+
+    def get_matrix(self, entity_ids: Iterable[str | int]) -> FeatureMatrix:
+        """Gather the requested rows into a ``[k, F]`` float32 matrix (NaN rows when missing)."""
+        ids = [str(eid) for eid in entity_ids]
+        count = len(ids)
+        delta_rows = np.fromiter((self.delta.index.get(eid, -1) for eid in ids), dtype=np.int64, count=count)
+        base_rows = np.fromiter((self.base.index.get(eid, -1) for eid in ids), dtype=np.int64, count=count)
+        in_delta = delta_rows >= 0
+        in_base = ~in_delta & (base_rows >= 0)
+        values = np.full((count, len(self.columns)), np.nan, dtype=np.float32)
+        values[in_delta, : self.delta.values.shape[1]] = self.delta.values[delta_rows[in_delta]]
+        values[in_base, : len(self.base.columns)] = self.base.values[base_rows[in_base]]
+        return FeatureMatrix(
+            entity_ids=ids, columns=list(self.columns), values=values, found=in_delta | in_base
+        )
+
+    def get_features(self, entity_ids: Iterable[str | int]) -> Dict[str, Dict[str, float]]:
+        return self.get_matrix(entity_ids).to_dicts()
+
+
+def _snapshot_version(signature: Tuple[object, ...]) -> str:
+    base, segments = signature
+    return f"{base[1]}-{len(segments)}"  # type: ignore[index, arg-type]
+
+
+class LightweightFeatureStore(PollingReloader, ThreadedAsyncLookups):
+    """Parquet-backed store served from memory.
+
+    The base file is read once into a contiguous float32 matrix with a dict index from
+    entity id to row, so lookups cost O(k) in the number of requested ids.
+
+    :meth:`upsert` appends the records as a new delta segment next to the base file
+    (``<path>.deltas/delta-*.parquet``) and folds them into an in-memory delta table, so
+    its cost scales with the update rather than the table. Reads take an entity's row from
+    the newest segment that contains it, else from the base (last write wins per entity,
+    whole row). :meth:`compact` rewrites the base with the deltas applied and removes the
+    folded segments; it runs in the background once ``compact_after_segments`` segments
+    accumulate.
+
+    Every load or upsert publishes a new immutable :class:`LightweightSnapshot` with one
+    reference assignment, so lookups never wait on a reload or see a half-built table.
+    With ``reload_interval_s`` set, :meth:`start` polls the base file and the segment
+    directory and builds the next snapshot on its own thread when either changes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        entity_id_column: str = "entity_id",
+        reload_interval_s: Optional[float] = None,
+        compact_after_segments: int = 16,
+        metrics_label: Optional[str] = "lightweight",
+    ) -> None:
         self.path = Path(path)
+        self.delta_dir = delta_dir_for(self.path)
         self.entity_id_column = entity_id_column
+        self.reload_interval_s = reload_interval_s
+        self.compact_after_segments = compact_after_segments
+        self.metrics_label = metrics_label
         self.path.parent.mkdir(parents=True, exist_ok=True)
         if not self.path.exists():
             empty = pd.DataFrame(columns=[self.entity_id_column])
             empty.to_parquet(self.path)
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+        self._signature: Optional[Tuple[object, ...]] = None
+        self._snapshot = LightweightSnapshot(
+            columns=[], base=_EMPTY_TABLE, delta=_EMPTY_TABLE, version="empty"
+        )
+        self.reload(force=True)
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._snapshot.columns)
+
+    def __len__(self) -> int:
+        return len(self._snapshot)
+
+    def snapshot(self) -> LightweightSnapshot:
+        """The active snapshot; keep the reference to read consistently across calls."""
+        return self._snapshot
+
+    def _publish(self, snapshot: LightweightSnapshot) -> None:
+        self._snapshot = snapshot
+        if self.metrics_label:
+            publish_snapshot_metrics(self.metrics_label, snapshot)
+
+    def _segments(self) -> List[Path]:
+        if not self.delta_dir.exists():
+            return []
+        return sorted(self.delta_dir.glob(f"{DELTA_PREFIX}*.parquet"))
+
+    def _base_signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _stat_signature(self) -> Optional[Tuple[object, ...]]:
+        base = self._base_signature()
+        if base is None:
+            return None
+        return (base, tuple(seg.name for seg in self._segments()))
+
+    def reload(self, force: bool = False) -> bool:
+        """Re-read base and deltas if either changed since the last load; True when swapped."""
+        with self._lock:
+            signature = self._stat_signature()
+            if signature is None or (not force and signature == self._signature):
+                return False
+            base = _from_arrow(pq.read_table(self.path), self.entity_id_column, self.path)
+            columns = list(base.columns)
+            delta = _EMPTY_TABLE
+            for name in signature[1]:
+                segment = self.delta_dir / name
+                update = _from_arrow(pq.read_table(segment), self.entity_id_column, segment)
+                columns.extend(c for c in update.columns if c not in columns)
+                delta = _append(delta, columns, update)
+            self._publish(
+                LightweightSnapshot(
+                    columns=columns, base=base, delta=delta, version=_snapshot_version(signature)
+                )
+            )
+            self._signature = signature
+        LOG.info(
+            "Loaded feature table",
+            extra={
+                "path": str(self.path),
+                "rows": len(base.index),
+                "delta_segments": len(signature[1]),
+                "columns": len(columns),
+            },
+        )
+        return True
+
+    def _write_base(self, df: pd.DataFrame) -> None:
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, self.path)
 
     def load_from_parquet(self, parquet_path: str) -> None:
-        df = pd.read_parquet(parquet_path)
-        df.to_parquet(self.path)
-        LOG.info("Loaded features", extra={"rows": len(df), "dest": str(self.path)})
+        """Replace the whole store, including any pending deltas, with ``parquet_path``."""
+        with self._compact_lock:
+            stats = ingest_parquet(parquet_path, str(self.path), self.entity_id_column, workers=1)
+            discard_deltas(self.path)
+        self.reload(force=True)
+        LOG.info("Loaded features", extra={"rows": stats.rows, "dest": str(self.path)})
+
+    def get_matrix(self, entity_ids: Iterable[str | int]) -> FeatureMatrix:
+        return self._snapshot.get_matrix(entity_ids)
 
     def get_features(self, entity_ids: Iterable[str | int]) -> Dict[str, Dict[str, float]]:
-        df = pd.read_parquet(self.path)
-        subset = df[df[self.entity_id_column].isin(entity_ids)]
-        result: Dict[str, Dict[str, float]] = {}
-        for _, row in subset.iterrows():
-            entity = str(row[self.entity_id_column])
-            features = row.drop(labels=[self.entity_id_column]).to_dict()
-            result[entity] = {k: float(v) for k, v in features.items()}
-        return result
+        return self._snapshot.get_features(entity_ids)
+
+    def _carry_forward(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Fill features the records omit (or set to NaN) from the entities' current rows."""
+        current = self._snapshot.get_matrix(df[self.entity_id_column].tolist())
+        for pos, name in enumerate(current.columns):
+            previous = pd.Series(current.values[:, pos], index=df.index)
+            df[name] = df[name].where(df[name].notna(), previous) if name in df else previous
+        return df
 
     def upsert(self, records: List[Dict[str, object]]) -> None:
+        """Append ``records`` as a delta segment; each record replaces its entity's row.
+
+        Features a record omits keep the entity's current value, so the segment holds
+        whole rows. Features a new entity's record omits are NaN, i.e. missing.
+        """
         df = pd.DataFrame(records)
         if self.entity_id_column not in df.columns:
             raise ValueError(f"entity_id_column {self.entity_id_column} missing")
-        df.to_parquet(self.path)
-        LOG.info("Upserted features", extra={"rows": len(df)})
+        df[self.entity_id_column] = df[self.entity_id_column].astype(str)
+        self.delta_dir.mkdir(parents=True, exist_ok=True)
+        name = f"{DELTA_PREFIX}{time.time_ns():020d}-{os.getpid()}.parquet"
+        tmp = self.delta_dir / f".{name}.tmp"
+        with self._lock:
+            # Under the lock so concurrent upserts of one entity do not drop each other's values.
+            df = self._carry_forward(df)
+            df.to_parquet(tmp, index=False)
+            os.replace(tmp, self.delta_dir / name)
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            update = _from_arrow(table, self.entity_id_column, name)
+            current = self._snapshot
+            columns = current.columns + [c for c in update.columns if c not in current.columns]
+            if self._signature is not None:
+                # Segments written by other processes still differ and trigger a full reload.
+                self._signature = (self._signature[0], self._signature[1] + (name,))
+            pending = len(self._signature[1]) if self._signature is not None else 0
+            self._publish(
+                LightweightSnapshot(
+                    columns=columns,
+                    base=current.base,
+                    delta=_append(current.delta, columns, update),
+                    version=_snapshot_version(self._signature) if self._signature else name,
+                )
+            )
+        LOG.info("Upserted features", extra={"rows": len(df), "segment": name})
+        if pending >= self.compact_after_segments:
+            self.compact_in_background()
+
+    def compact(self) -> int:
+        """Fold all current delta segments into the base file; returns segments folded."""
+        with self._compact_lock:
+            segments = self._segments()
+            if not segments:
+                return 0
+            frames = [pd.read_parquet(self.path)] + [pd.read_parquet(seg) for seg in segments]
+            for frame in frames:
+                frame[self.entity_id_column] = frame[self.entity_id_column].astype(str)
+            merged = pd.concat(frames, ignore_index=True).drop_duplicates(
+                subset=[self.entity_id_column], keep="last"
+            )
+            self._write_base(merged)
+            for segment in segments:
+                segment.unlink(missing_ok=True)
+        self.reload(force=True)
+        LOG.info("Compacted feature deltas", extra={"segments": len(segments), "rows": len(merged)})
+        return len(segments)
+
+    def compact_in_background(self) -> None:
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        self._compactor = threading.Thread(target=self._compact_safely, name="mmsp-feature-compact", daemon=True)
+        self._compactor.start()
+
+    def _compact_safely(self) -> None:
+        try:
+            self.compact()
+        except Exception:  # noqa: BLE001
+            LOG.exception("Feature delta compaction failed", extra={"path": str(self.path)})
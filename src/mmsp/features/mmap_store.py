@@ -0,0 +1,235 @@
+"""Memory-mapped feature store snapshots shared by every process on a host."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from mmsp.features.base import (
+    FeatureMatrix,
+    PollingReloader,
+    ThreadedAsyncLookups,
+    publish_snapshot_metrics,
+)
+from mmsp.utils.logging import get_logger
+
+LOG = get_logger(__name__)
+
+CURRENT_FILE = "CURRENT"
+SNAPSHOTS_DIR = "snapshots"
+VALUES_FILE = "values.npy"
+IDS_FILE = "ids.npy"
+META_FILE = "meta.json"
+
+# Rows copied per step when permuting values into sorted order; bounds writer memory.
+COPY_CHUNK_ROWS = 65_536
+
+
+def _sorted_order(ids: np.ndarray) -> np.ndarray:
+    """Row order that sorts ``ids``; for duplicate ids only the last occurrence is kept."""
+    order = np.argsort(ids, kind="stable")
+    sorted_ids = ids[order]
+    keep = np.ones(len(order), dtype=bool)
+    keep[:-1] = sorted_ids[:-1] != sorted_ids[1:]
+    return order[keep]
+
+
+def write_snapshot(
+    root: str,
+    source: str,
+    entity_id_column: str = "entity_id",
+    batch_rows: int = COPY_CHUNK_ROWS,
+    keep: int = 2,
+) -> Path:
+    """Convert a Parquet file into a new snapshot under ``root`` and publish it.
+
+    Feature values are streamed record batch by record batch into an on-disk float32
+    matrix, then permuted into entity-id order; only the ids are held in memory. The
+    snapshot becomes visible to readers when ``CURRENT`` is atomically replaced.
+    """
+    root_path = Path(root)
+    snapshots = root_path / SNAPSHOTS_DIR
+    snapshots.mkdir(parents=True, exist_ok=True)
+    name = f"v{time.time_ns()}"
+    staging = snapshots / f".{name}.tmp"
+    staging.mkdir()
+
+    parquet = pq.ParquetFile(source)
+    column_names = parquet.schema_arrow.names
+    if entity_id_column not in column_names:
+        raise ValueError(f"entity_id_column {entity_id_column} missing from {source}")
+    columns = [c for c in column_names if c != entity_id_column and not c.startswith("__index_level_")]
+    num_rows = parquet.metadata.num_rows
+
+    unsorted_path = staging / "values.unsorted.npy"
+    unsorted = np.lib.format.open_memmap(
+        unsorted_path, mode="w+", dtype=np.float32, shape=(num_rows, len(columns))
+    )
+    id_chunks: List[np.ndarray] = []
+    offset = 0
+    for batch in parquet.iter_batches(batch_size=batch_rows, columns=[entity_id_column, *columns]):
+        rows = batch.num_rows
+        for pos, col in enumerate(columns):
+            values = pc.cast(batch.column(col), pa.float32())
+            unsorted[offset : offset + rows, pos] = values.to_numpy(zero_copy_only=False)
+        ids = pc.cast(batch.column(entity_id_column), pa.string())
+        id_chunks.append(np.asarray(ids.to_pylist(), dtype=str))
+        offset += rows
+    all_ids = np.concatenate(id_chunks) if id_chunks else np.empty(0, dtype="<U1")
+    order = _sorted_order(all_ids)
+
+    values_out = np.lib.format.open_memmap(
+        staging / VALUES_FILE, mode="w+", dtype=np.float32, shape=(len(order), len(columns))
+    )
+    for start in range(0, len(order), batch_rows):
+        chunk = order[start : start + batch_rows]
+        values_out[start : start + len(chunk)] = unsorted[chunk]
+    values_out.flush()
+    del values_out, unsorted
+    unsorted_path.unlink()
+    np.save(staging / IDS_FILE, all_ids[order])
+    meta = {
+        "columns": columns,
+        "entity_id_column": entity_id_column,
+        "rows": int(len(order)),
+        "source": str(source),
+        "created_at": time.time(),
+    }
+    (staging / META_FILE).write_text(json.dumps(meta, indent=2))
+    final = snapshots / name
+    os.replace(staging, final)
+    publish_snapshot(root_path, name)
+    _prune_snapshots(snapshots, keep=keep, current=name)
+    LOG.info("Published feature snapshot", extra={"root": str(root_path), "snapshot": name, "rows": meta["rows"]})
+    return final
+
+
+def publish_snapshot(root: Path, name: str) -> None:
+    """Point ``CURRENT`` at snapshot ``name`` with an atomic rename."""
+    tmp = root / f".{CURRENT_FILE}.tmp"
+    tmp.write_text(name)
+    os.replace(tmp, root / CURRENT_FILE)
+
+
+def _prune_snapshots(snapshots: Path, keep: int, current: str) -> None:
+    # Readers that still map an older snapshot keep their pages after the unlink.
+    names = sorted(p.name for p in snapshots.iterdir() if p.is_dir() and not p.name.startswith("."))
+    for name in names[: max(len(names) - keep, 0)]:
+        if name != current:
+            shutil.rmtree(snapshots / name, ignore_errors=True)
+
+
+@dataclass(frozen=True)
+class MmapSnapshot:
+    """One mapped snapshot; its pages are shared with every process mapping the same files."""
+
+    version: str
+    columns: List[str]
+    ids: np.ndarray
+    values: np.ndarray
+    loaded_at: float = field(default_factory=time.time)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _locate(self, ids: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        if not ids or len(self.ids) == 0:
+            return np.zeros(len(ids), dtype=np.int64), np.zeros(len(ids), dtype=bool)
+        query = np.asarray(ids, dtype=str)
+        pos = np.minimum(np.searchsorted(self.ids, query), len(self.ids) - 1)
+        return pos, self.ids[pos] == query
+
+    def get_matrix(self, entity_ids: Iterable[str | int]) -> FeatureMatrix:
+        ids = [str(eid) for eid in entity_ids]
+        pos, found = self._locate(ids)
+        values = np.full((len(ids), len(self.columns)), np.nan, dtype=np.float32)
+        values[found] = self.values[pos[found]]
+        return FeatureMatrix(entity_ids=ids, columns=list(self.columns), values=values, found=found)
+
+    def get_features(self, entity_ids: Iterable[str | int]) -> Dict[str, Dict[str, float]]:
+        return self.get_matrix(entity_ids).to_dicts()
+
+
+def _open_snapshot(root: Path, name: str) -> MmapSnapshot:
+    path = root / SNAPSHOTS_DIR / name
+    meta = json.loads((path / META_FILE).read_text())
+    return MmapSnapshot(
+        version=name,
+        columns=list(meta["columns"]),
+        ids=np.load(path / IDS_FILE, mmap_mode="r"),
+        values=np.load(path / VALUES_FILE, mmap_mode="r"),
+    )
+
+
+_EMPTY = MmapSnapshot(
+    version="empty", columns=[], ids=np.empty(0, dtype="<U1"), values=np.empty((0, 0), dtype=np.float32)
+)
+
+
+class MmapFeatureStore(PollingReloader, ThreadedAsyncLookups):
+    """Read-only store over a snapshot directory written by :func:`write_snapshot`.
+
+    ``values.npy`` (float32 ``[N, F]``) and ``ids.npy`` (sorted entity ids) are mapped
+    with ``mmap_mode="r"``, so every worker process on the host shares the same page
+    cache instead of holding its own copy. Lookups binary-search the id index. With
+    ``reload_interval_s`` set, :meth:`start` polls ``CURRENT`` and switches to newly
+    published snapshots without a restart.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        entity_id_column: str = "entity_id",
+        reload_interval_s: Optional[float] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.entity_id_column = entity_id_column
+        self.reload_interval_s = reload_interval_s
+        self._lock = threading.Lock()
+        self._snapshot = _EMPTY
+        self.reload(force=True)
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._snapshot.columns)
+
+    def __len__(self) -> int:
+        return len(self._snapshot)
+
+    def snapshot(self) -> MmapSnapshot:
+        """The active snapshot; keep the reference to read consistently across calls."""
+        return self._snapshot
+
+    def _current_name(self) -> Optional[str]:
+        try:
+            return (self.path / CURRENT_FILE).read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def reload(self, force: bool = False) -> bool:
+        with self._lock:
+            name = self._current_name()
+            if name is None or (not force and name == self._snapshot.version):
+                return False
+            snapshot = _open_snapshot(self.path, name)
+            self._snapshot = snapshot
+        publish_snapshot_metrics("mmap", snapshot)
+        LOG.info("Mapped feature snapshot", extra={"root": str(self.path), "snapshot": name})
+        return True
+
+    def get_matrix(self, entity_ids: Iterable[str | int]) -> FeatureMatrix:
+        return self._snapshot.get_matrix(entity_ids)
+
+    def get_features(self, entity_ids: Iterable[str | int]) -> Dict[str, Dict[str, float]]:
+        return self._snapshot.get_features(entity_ids)
@@ -0,0 +1,32 @@
+"""Stable hash partitioning of entity ids into shards."""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+# Fixed 16-byte key so shard assignment is identical across processes, hosts and releases.
+HASH_KEY = "mmsp-entity-hash"
+
+
+def hash_entity_ids(entity_ids: Sequence[object]) -> np.ndarray:
+    """64-bit hashes of the string form of each entity id."""
+    ids = np.asarray([str(eid) for eid in entity_ids], dtype=object)
+    return pd.util.hash_array(ids, hash_key=HASH_KEY, categorize=False)
+
+
+def shard_for_ids(entity_ids: Sequence[object], num_shards: int) -> np.ndarray:
+    """Shard index in ``[0, num_shards)`` for every id."""
+    if num_shards <= 1:
+        return np.zeros(len(entity_ids), dtype=np.int64)
+    return (hash_entity_ids(entity_ids) % np.uint64(num_shards)).astype(np.int64)
+
+
+def shard_for_id(entity_id: object, num_shards: int) -> int:
+    return int(shard_for_ids([entity_id], num_shards)[0])
+
+
+def shard_name(shard: int) -> str:
+    return f"shard-{shard:05d}"
@@ -0,0 +1,194 @@
+"""Consistent-hash placement of feature shards on Feature API replicas."""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from mmsp.features.base import (
+    FeatureMatrix,
+    FeatureSnapshot,
+    PollingReloader,
+    ThreadedAsyncLookups,
+    publish_snapshot_metrics,
+)
+from mmsp.features.ingest import MANIFEST_FILE
+from mmsp.features.lightweight_store import LightweightFeatureStore
+from mmsp.features.partitioning import shard_for_ids, shard_name
+from mmsp.utils.io import resolve_versioned_dir
+from mmsp.utils.logging import get_logger
+
+LOG = get_logger(__name__)
+
+
+def _ring_hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent-hash ring of replica names with ``vnodes`` points per replica.
+
+    Entity ids map to a fixed number of shards with :func:`shard_for_ids`; shards map to
+    replicas through the ring. Adding or removing one of N replicas therefore moves about
+    1/N of the shards (and keys), all to or from the changed replica.
+    """
+
+    def __init__(self, nodes: Sequence[str], vnodes: int = 128) -> None:
+        if not nodes:
+            raise ValueError("HashRing needs at least one node")
+        self.nodes = list(dict.fromkeys(nodes))
+        self.vnodes = vnodes
+        points = sorted((_ring_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(vnodes))
+        self._hashes = [h for h, _ in points]
+        self._owners = [node for _, node in points]
+
+    def owner(self, key: str) -> str:
+        idx = bisect.bisect(self._hashes, _ring_hash(key)) % len(self._hashes)
+        return self._owners[idx]
+
+    def shard_owner(self, shard: int) -> str:
+        return self.owner(shard_name(shard))
+
+    def assignments(self, num_shards: int) -> Dict[str, List[int]]:
+        """Shards owned by each replica."""
+        owned: Dict[str, List[int]] = {node: [] for node in self.nodes}
+        for shard in range(num_shards):
+            owned[self.shard_owner(shard)].append(shard)
+        return owned
+
+
+@dataclass(frozen=True)
+class ShardedSnapshot:
+    """The snapshots of every owned shard, pinned together."""
+
+    num_shards: int
+    shards: Mapping[int, FeatureSnapshot]
+    loaded_at: float = field(default_factory=time.time)
+
+    @property
+    def version(self) -> str:
+        versions = ",".join(f"{shard}:{snap.version}" for shard, snap in sorted(self.shards.items()))
+        return hashlib.blake2b(versions.encode("utf-8"), digest_size=6).hexdigest()
+
+    def __len__(self) -> int:
+        return sum(len(snap) for snap in self.shards.values())
+
+    def get_matrix(self, entity_ids: Iterable[str | int]) -> FeatureMatrix:
+        ids = [str(eid) for eid in entity_ids]
+        shards = shard_for_ids(ids, self.num_shards)
+        parts = []
+        columns: List[str] = []
+        for shard in np.unique(shards).tolist():
+            snap = self.shards.get(shard)
+            if snap is None:
+                continue
+            rows = np.flatnonzero(shards == shard)
+            part = snap.get_matrix([ids[row] for row in rows])
+            columns.extend(name for name in part.columns if name not in columns)
+            parts.append((rows, part))
+        positions = {name: pos for pos, name in enumerate(columns)}
+        values = np.full((len(ids), len(columns)), np.nan, dtype=np.float32)
+        found = np.zeros(len(ids), dtype=bool)
+        for rows, part in parts:
+            cols = [positions[name] for name in part.columns]
+            values[np.ix_(rows, cols)] = part.values
+            found[rows] = part.found
+        return FeatureMatrix(entity_ids=ids, columns=columns, values=values, found=found)
+
+    def get_features(self, entity_ids: Iterable[str | int]) -> Dict[str, Dict[str, float]]:
+        return self.get_matrix(entity_ids).to_dicts()
+
+
+class ShardedFeatureStore(PollingReloader, ThreadedAsyncLookups):
+    """Serves only the shards of an ingest output directory that ``replica`` owns.
+
+    ``path`` is a directory written by ``ingest_parquet(..., num_shards=N)``. Each owned
+    ``shard-XXXXX.parquet`` of the version its ``CURRENT`` points at is held by its own
+    :class:`LightweightFeatureStore`; ids that hash to shards owned by other replicas are
+    reported as not found. Lookups go through a :class:`ShardedSnapshot` that is rebuilt
+    only after every shard has reloaded. When a new shard set is published, :meth:`reload`
+    opens all of its shards before switching to it.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        replicas: Sequence[str],
+        replica: str,
+        num_shards: int,
+        entity_id_column: str = "entity_id",
+        vnodes: int = 128,
+        reload_interval_s: Optional[float] = None,
+    ) -> None:
+        if replica not in replicas:
+            raise ValueError(f"Replica {replica} is not in the sharding replica list")
+        self.path = Path(path)
+        self.num_shards = num_shards
+        self.replica = replica
+        self.entity_id_column = entity_id_column
+        self.reload_interval_s = reload_interval_s
+        self.shards = HashRing(replicas, vnodes=vnodes).assignments(num_shards)[replica]
+        self.version_dir = resolve_versioned_dir(self.path)
+        self.stores = self._open(self.version_dir)
+        self._publish()
+        LOG.info(
+            "Loaded feature shards",
+            extra={"replica": replica, "shards": self.shards, "rows": len(self)},
+        )
+
+    def __len__(self) -> int:
+        return len(self._snapshot)
+
+    def snapshot(self) -> ShardedSnapshot:
+        """The active snapshots of all owned shards; keep the reference to read consistently."""
+        return self._snapshot
+
+    def _open(self, version_dir: Path) -> Dict[int, LightweightFeatureStore]:
+        manifest_path = version_dir / MANIFEST_FILE
+        if manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text())
+            if manifest["num_shards"] != self.num_shards:
+                raise ValueError(
+                    f"{version_dir} holds {manifest['num_shards']} shards, "
+                    f"config expects {self.num_shards}"
+                )
+        return {
+            shard: LightweightFeatureStore(
+                str(version_dir / f"{shard_name(shard)}.parquet"),
+                self.entity_id_column,
+                metrics_label=None,
+            )
+            for shard in self.shards
+        }
+
+    def _publish(self) -> None:
+        self._snapshot = ShardedSnapshot(
+            self.num_shards, {shard: store.snapshot() for shard, store in self.stores.items()}
+        )
+        publish_snapshot_metrics("sharded", self._snapshot)
+
+    def reload(self, force: bool = False) -> bool:
+        version_dir = resolve_versioned_dir(self.path)
+        if version_dir != self.version_dir:
+            self.stores = self._open(version_dir)
+            self.version_dir = version_dir
+            self._publish()
+            LOG.info("Switched feature shard set", extra={"path": str(version_dir)})
+            return True
+        changed = any([store.reload(force=force) for store in self.stores.values()])
+        if changed:
+            self._publish()
+        return changed
+
+    def get_matrix(self, entity_ids: Iterable[str | int]) -> FeatureMatrix:
+        return self._snapshot.get_matrix(entity_ids)
+
+    def get_features(self, entity_ids: Iterable[str | int]) -> Dict[str, Dict[str, float]]:
+        return self._snapshot.get_features(entity_ids)
@@ -2,52 +2,515 @@
 
 from __future__ import annotations
 
-from collections import defaultdict, deque
-from typing import Deque, Dict, List
+import json
+import math
+import os
+import queue
+import random
+import shutil
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
-from scipy import stats
+import pyarrow.parquet as pq
 
-from mmsp.monitoring.metrics import FEATURE_DRIFT
+from mmsp.monitoring.metrics import (
+    DRIFT_QUEUE_DEPTH,
+    DRIFT_RECORDS_DROPPED,
+    DRIFT_SCORING_SECONDS,
+    FEATURE_DRIFT,
+)
+from mmsp.utils.io import publish_versioned_dir, resolve_versioned_dir
 from mmsp.utils.logging import get_logger
 
 LOG = get_logger(__name__)
 
 
+def ks_sorted(baseline: np.ndarray, observed: np.ndarray) -> float:
+    """Two-sample KS statistic of two sorted float arrays.
+
+    Between consecutive observed values the observed ECDF is flat and the baseline ECDF
+    is monotone, so the largest gap is reached at an observed value or just below it.
+    Evaluating both ECDFs there with ``searchsorted`` costs O(m log n) for ``m`` observed
+    and ``n`` baseline values, and equals ``scipy.stats.ks_2samp(...).statistic``.
+    """
+    n, m = len(baseline), len(observed)
+    if n == 0 or m == 0:
+        return 0.0
+    observed_at = np.searchsorted(observed, observed, side="right") / m
+    observed_below = np.searchsorted(observed, observed, side="left") / m
+    baseline_at = np.searchsorted(baseline, observed, side="right") / n
+    baseline_below = np.searchsorted(baseline, observed, side="left") / n
+    return float(
+        max(np.abs(baseline_at - observed_at).max(), np.abs(baseline_below - observed_below).max())
+    )
+
+
 def ks_statistic(baseline: List[float], observed: List[float]) -> float:
     if not baseline or not observed:
         return 0.0
-    baseline_arr = np.array(baseline, dtype=float)
-    observed_arr = np.array(observed, dtype=float)
-    return float(stats.ks_2samp(baseline_arr, observed_arr).statistic)
+    baseline_arr = np.sort(np.asarray(baseline, dtype=float))
+    observed_arr = np.sort(np.asarray(observed, dtype=float))
+    return ks_sorted(baseline_arr, observed_arr)
 
 
-def psi(expected: List[float], actual: List[float], bins: int = 10) -> float:
-    if not expected or not actual:
+def ks_weighted(baseline: np.ndarray, items: np.ndarray, weights: np.ndarray) -> float:
+    """KS statistic of a sorted baseline against a weighted sample (e.g. a sketch).
+
+    ``items`` must be sorted. With unit weights this equals :func:`ks_sorted`.
+    """
+    total = weights.sum()
+    if len(baseline) == 0 or total == 0:
         return 0.0
-    expected_arr = np.array(expected, dtype=float)
-    actual_arr = np.array(actual, dtype=float)
-    quantiles = np.linspace(0, 100, bins + 1)
-    breakpoints = np.unique(np.percentile(expected_arr, quantiles))
+    points, inverse = np.unique(items, return_inverse=True)
+    point_weights = np.bincount(inverse, weights=weights)
+    cumulative = np.cumsum(point_weights)
+    observed_at = cumulative / total
+    observed_below = (cumulative - point_weights) / total
+    n = len(baseline)
+    baseline_at = np.searchsorted(baseline, points, side="right") / n
+    baseline_below = np.searchsorted(baseline, points, side="left") / n
+    return float(
+        max(np.abs(baseline_at - observed_at).max(), np.abs(baseline_below - observed_below).max())
+    )
+
+
+def psi_bin_edges(expected: np.ndarray, bins: int = 10) -> np.ndarray:
+    """Baseline percentile edges for PSI; a constant baseline gets one narrow bin."""
+    breakpoints = np.unique(np.percentile(expected, np.linspace(0, 100, bins + 1)))
     if breakpoints.size < 2:
         epsilon = 1e-3
         center = breakpoints[0]
         breakpoints = np.array([center - epsilon, center + epsilon])
+    return breakpoints
+
+
+def psi_from_proportions(expected: np.ndarray, actual: np.ndarray) -> float:
+    expected = np.maximum(expected, 1e-6)
+    actual = np.maximum(actual, 1e-6)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def psi(expected: List[float], actual: List[float], bins: int = 10) -> float:
+    if not expected or not actual:
+        return 0.0
+    expected_arr = np.array(expected, dtype=float)
+    actual_arr = np.array(actual, dtype=float)
+    breakpoints = psi_bin_edges(expected_arr, bins)
     expected_counts, _ = np.histogram(expected_arr, bins=breakpoints)
     actual_counts, _ = np.histogram(actual_arr, bins=breakpoints)
     expected_perc = expected_counts / max(expected_counts.sum(), 1)
     actual_perc = actual_counts / max(actual_counts.sum(), 1)
-    psi_values = []
-    for e, a in zip(expected_perc, actual_perc):
-        e = max(e, 1e-6)
-        a = max(a, 1e-6)
-        psi_values.append((a - e) * np.log(a / e))
-    return float(np.sum(psi_values))
+    return psi_from_proportions(expected_perc, actual_perc)
+
+
+class PSITracker:
+    """PSI of a sliding window against fixed baseline bins, updated one value at a time.
+
+    ``edges`` and ``expected`` proportions come from the baseline once; the window is
+    kept as integer counts per bin (``np.histogram`` semantics: the last bin is closed and
+    out-of-range values are not counted). :meth:`add` and :meth:`remove` touch one bin
+    and :meth:`score` costs O(bins), independent of baseline and window size.
+    """
+
+    def __init__(self, edges: np.ndarray, expected: np.ndarray) -> None:
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.expected = np.asarray(expected, dtype=np.float64)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+
+    def _bin(self, value: float) -> int:
+        if value == self.edges[-1]:
+            return len(self.counts) - 1
+        idx = int(np.searchsorted(self.edges, value, side="right")) - 1
+        return idx if 0 <= idx < len(self.counts) else -1
+
+    def add(self, value: float) -> None:
+        idx = self._bin(value)
+        if idx >= 0:
+            self.counts[idx] += 1
+
+    def remove(self, value: float) -> None:
+        idx = self._bin(value)
+        if idx >= 0:
+            self.counts[idx] -= 1
+
+    def merge(self, other: "PSITracker") -> None:
+        self.counts += other.counts
+
+    def score(self) -> float:
+        total = self.counts.sum()
+        if total == 0 or not self.expected.any():
+            return 0.0
+        return psi_from_proportions(self.expected, self.counts / total)
+
+
+class RingWindow:
+    """Fixed-capacity ring buffer of the most recent values."""
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("Window capacity must be positive")
+        self.capacity = capacity
+        self._ring = np.empty(capacity, dtype=np.float64)
+        self._size = 0
+        self._next = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, value: float) -> Optional[float]:
+        """Add ``value``; returns the evicted value when the window was full."""
+        evicted = float(self._ring[self._next]) if self._size == self.capacity else None
+        self._ring[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        return evicted
+
+
+class SortedWindow(RingWindow):
+    """Ring buffer of the last ``capacity`` values that also keeps them in sorted order.
+
+    Each append evicts the oldest value once full; both the eviction and the insertion
+    locate their slot with a binary search and shift part of a preallocated array, so an
+    update costs O(capacity) element moves and never re-sorts.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        super().__init__(capacity)
+        self._sorted = np.empty(capacity, dtype=np.float64)
+
+    def append(self, value: float) -> Optional[float]:
+        size = self._size
+        evicted = super().append(value)
+        if evicted is not None:
+            idx = int(np.searchsorted(self._sorted[:size], evicted))
+            self._sorted[idx : size - 1] = self._sorted[idx + 1 : size]
+            size -= 1
+        idx = int(np.searchsorted(self._sorted[:size], value))
+        self._sorted[idx + 1 : size + 1] = self._sorted[idx:size]
+        self._sorted[idx] = value
+        return evicted
+
+    def sorted_values(self) -> np.ndarray:
+        """Sorted view of the window; only valid until the next append."""
+        return self._sorted[: self._size]
+
+
+class KLLSketch:
+    """KLL streaming quantile sketch with bounded memory.
+
+    Level ``h`` holds items of weight ``2**h``; when a level fills up it is sorted and
+    every other item (random offset) is promoted to the next level. Memory stays about
+    ``3k`` items regardless of stream length, with rank error around ``1.7 / k``.
+    Sketches of sub-windows merge by concatenating levels and compacting.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None) -> None:
+        self.k = k
+        self.levels: List[List[float]] = [[]]
+        self.size = 0
+        self._rng = random.Random(seed)
+        self._max_size = self._capacity_total()
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return int(math.ceil(self.k * (2.0 / 3.0) ** depth)) + 1
+
+    def _capacity_total(self) -> int:
+        return sum(self._capacity(level) for level in range(len(self.levels)))
+
+    def add(self, value: float) -> None:
+        self.levels[0].append(value)
+        self.size += 1
+        if self.size >= self._max_size:
+            self._compress()
+
+    def _compress(self) -> None:
+        for level in range(len(self.levels)):
+            if len(self.levels[level]) < self._capacity(level):
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append([])
+                self._max_size = self._capacity_total()
+            items = sorted(self.levels[level])
+            keep = [items.pop()] if len(items) % 2 else []
+            self.levels[level + 1].extend(items[self._rng.randint(0, 1) :: 2])
+            self.levels[level] = keep
+            self.size = sum(len(items) for items in self.levels)
+            if self.size < self._max_size:
+                break
+
+    def merge(self, other: "KLLSketch") -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        self._max_size = self._capacity_total()
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.size = sum(len(items) for items in self.levels)
+        while self.size >= self._max_size:
+            self._compress()
+
+    def count(self) -> int:
+        return sum(len(items) << level for level, items in enumerate(self.levels))
+
+    def weighted_items(self) -> Tuple[np.ndarray, np.ndarray]:
+        """All retained items in sorted order with their weights."""
+        items = np.concatenate([np.asarray(items, dtype=np.float64) for items in self.levels])
+        weights = np.concatenate(
+            [
+                np.full(len(level_items), 1 << level, dtype=np.float64)
+                for level, level_items in enumerate(self.levels)
+            ]
+        )
+        order = np.argsort(items, kind="stable")
+        return items[order], weights[order]
+
+    def quantile(self, q: float) -> float:
+        items, weights = self.weighted_items()
+        if not len(items):
+            return float("nan")
+        cumulative = np.cumsum(weights)
+        idx = int(np.searchsorted(cumulative, q * cumulative[-1], side="left"))
+        return float(items[min(idx, len(items) - 1)])
+
+
+WindowSummary = Union[KLLSketch, PSITracker]
+
+
+class TimeBucketedWindow:
+    """Time window built from per-bucket summaries that are merged when scored.
+
+    Values go into the summary of their ``bucket_s`` time bucket. A ``sliding`` window
+    covers the buckets that overlap the last ``window_s`` seconds; a ``tumbling`` window
+    covers the buckets of the current ``window_s`` period only. Memory is bounded by
+    ``window_s / bucket_s + 1`` summaries however many values arrive.
+    """
+
+    def __init__(
+        self,
+        window_s: float,
+        bucket_s: float,
+        factory: Callable[[], WindowSummary],
+        mode: str = "sliding",
+    ) -> None:
+        if mode not in ("sliding", "tumbling"):
+            raise ValueError(f"Unsupported window mode {mode}")
+        if bucket_s <= 0 or window_s < bucket_s:
+            raise ValueError("Drift windows need 0 < bucket_seconds <= window_seconds")
+        self.window_s = window_s
+        self.bucket_s = bucket_s
+        self.factory = factory
+        self.mode = mode
+        self.buckets: Deque[Tuple[float, WindowSummary]] = deque()
+
+    def _expire(self, now: float) -> None:
+        if self.mode == "sliding":
+            start = now - self.window_s
+            while self.buckets and self.buckets[0][0] + self.bucket_s <= start:
+                self.buckets.popleft()
+        else:
+            start = math.floor(now / self.window_s) * self.window_s
+            while self.buckets and self.buckets[0][0] < start:
+                self.buckets.popleft()
+
+    def add(self, value: float, now: float) -> None:
+        start = math.floor(now / self.bucket_s) * self.bucket_s
+        if not self.buckets or self.buckets[-1][0] < start:
+            self.buckets.append((start, self.factory()))
+            self._expire(now)
+        self.buckets[-1][1].add(value)
+
+    def merged(self, now: float) -> Optional[WindowSummary]:
+        self._expire(now)
+        if not self.buckets:
+            return None
+        summary = self.factory()
+        for _, bucket in self.buckets:
+            summary.merge(bucket)  # type: ignore[arg-type]
+        return summary
+
+
+@dataclass(frozen=True)
+class BaselineColumn:
+    """A baseline feature prepared once: sorted float64 values plus its PSI bins."""
+
+    values: np.ndarray
+    numeric: bool
+    psi_edges: np.ndarray
+    psi_expected: np.ndarray
+
+
+def _baseline_column(series: pd.Series, psi_bins: int) -> BaselineColumn:
+    values = np.sort(pd.to_numeric(series, errors="coerce").dropna().to_numpy(dtype=np.float64))
+    if values.size:
+        edges = psi_bin_edges(values, psi_bins)
+        counts, _ = np.histogram(values, bins=edges)
+        expected = counts / max(counts.sum(), 1)
+    else:
+        edges, expected = np.array([0.0, 0.0]), np.zeros(1)
+    return BaselineColumn(
+        values=values,
+        numeric=pd.api.types.is_numeric_dtype(series),
+        psi_edges=edges,
+        psi_expected=expected,
+    )
+
+
+def prepare_baseline(
+    baseline: pd.DataFrame, entity_id_column: str = "entity_id", psi_bins: int = 10
+) -> Dict[str, BaselineColumn]:
+    return {
+        name: _baseline_column(baseline[name], psi_bins)
+        for name in baseline.columns
+        if name != entity_id_column
+    }
+
+
+PROFILE_FILE = "profile.json"
+PROFILE_FORMAT = 1
+DRIFT_PROFILE_METADATA_KEY = "drift_profile"
+
+
+def downsample_sorted(values: np.ndarray, max_values: int) -> np.ndarray:
+    """At most ``max_values`` evenly spaced order statistics of sorted ``values``.
+
+    Keeps the minimum and maximum, and the ECDF of the result stays within about
+    ``1 / max_values`` of the full ECDF, which bounds the error it adds to a KS score.
+    """
+    if max_values <= 0 or len(values) <= max_values:
+        return values
+    picks = np.round(np.linspace(0, len(values) - 1, max_values)).astype(np.int64)
+    return values[picks]
+
+
+def build_baseline_profile(
+    source: str,
+    out_dir: str,
+    entity_id_column: str = "entity_id",
+    psi_bins: int = 10,
+    max_values: int = 10_000,
+    quantiles: int = 101,
+) -> Path:
+    """Precompute a compact drift baseline profile from a Parquet file.
+
+    Columns are read one at a time. Each gets a ``.npy`` file of sorted, downsampled
+    float64 values. ``profile.json`` records its dtype, the numeric flag, PSI edges and
+    expected proportions (computed from every value), and a ``quantiles``-point grid.
+    The profile is written to a staging directory and published as a new version of
+    ``out_dir`` with :func:`publish_versioned_dir`; readers resolve its ``CURRENT``.
+    """
+    parquet = pq.ParquetFile(source)
+    names = [
+        name
+        for name in parquet.schema_arrow.names
+        if name != entity_id_column and not name.startswith("__index_level_")
+    ]
+    out = Path(out_dir)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    staging = out.with_name(f".{out.name}.tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir()
+    grid = np.linspace(0.0, 1.0, quantiles)
+    columns: List[Dict[str, object]] = []
+    for pos, name in enumerate(names):
+        arrow_field = parquet.schema_arrow.field(name)
+        series = parquet.read(columns=[name]).column(0).to_pandas()
+        column = _baseline_column(series, psi_bins)
+        values_file = f"values_{pos}.npy"
+        np.save(staging / values_file, downsample_sorted(column.values, max_values))
+        columns.append(
+            {
+                "name": name,
+                "dtype": str(arrow_field.type),
+                "numeric": bool(column.numeric),
+                "count": int(column.values.size),
+                "values_file": values_file,
+                "quantiles": (
+                    np.quantile(column.values, grid).tolist() if column.values.size else []
+                ),
+                "psi_edges": column.psi_edges.tolist(),
+                "psi_expected": column.psi_expected.tolist(),
+            }
+        )
+    profile = {
+        "format": PROFILE_FORMAT,
+        "source": str(source),
+        "rows": int(parquet.metadata.num_rows),
+        "psi_bins": psi_bins,
+        "max_values": max_values,
+        "quantile_grid": grid.tolist(),
+        "columns": columns,
+        "created_at": time.time(),
+    }
+    (staging / PROFILE_FILE).write_text(json.dumps(profile, indent=2))
+    published = publish_versioned_dir(staging, out)
+    LOG.info("Built drift baseline profile", extra={"source": str(source), "dest": str(published)})
+    return out
+
+
+def is_baseline_profile(path: str | Path) -> bool:
+    return (resolve_versioned_dir(path) / PROFILE_FILE).is_file()
+
+
+def baseline_version(path: str | Path) -> str:
+    """Identifies what ``path`` holds now: the resolved profile version and its mtime."""
+    resolved = resolve_versioned_dir(path)
+    profile = resolved / PROFILE_FILE
+    target = profile if profile.is_file() else resolved
+    return f"{resolved}@{os.stat(target).st_mtime_ns}"
+
+
+def load_baseline_profile(path: str | Path) -> Dict[str, BaselineColumn]:
+    """Open a profile written by :func:`build_baseline_profile`.
+
+    Value arrays are mapped with ``mmap_mode="r"``, so every gateway worker on a host
+    shares their pages instead of holding its own copy.
+    """
+    root = resolve_versioned_dir(path)
+    profile = json.loads((root / PROFILE_FILE).read_text())
+    if profile.get("format") != PROFILE_FORMAT:
+        raise ValueError(f"Unsupported drift profile format {profile.get('format')} in {root}")
+    return {
+        column["name"]: BaselineColumn(
+            values=np.load(root / column["values_file"], mmap_mode="r"),
+            numeric=column["numeric"],
+            psi_edges=np.asarray(column["psi_edges"], dtype=np.float64),
+            psi_expected=np.asarray(column["psi_expected"], dtype=np.float64),
+        )
+        for column in profile["columns"]
+    }
+
+
+def load_baseline(
+    path: str | Path, entity_id_column: str = "entity_id", psi_bins: int = 10
+) -> Dict[str, BaselineColumn]:
+    """Baseline columns from a profile directory, or prepared from a raw Parquet file."""
+    if is_baseline_profile(path):
+        return load_baseline_profile(path)
+    return prepare_baseline(pd.read_parquet(path), entity_id_column, psi_bins)
 
 
 class DriftMonitor:
-    """Maintains drift stats vs. baseline."""
+    """Maintains drift stats vs. baseline.
+
+    ``baseline_path`` is either a profile directory from :func:`build_baseline_profile`,
+    which is memory-mapped as is, or a raw Parquet file whose columns are sorted and
+    binned once at construction. Recent values of a KS-scored feature live in a
+    :class:`SortedWindow`, so a score costs O(window log baseline); a PSI-scored feature
+    keeps a :class:`PSITracker` whose bin counts follow the window, so a score costs
+    O(bins).
+
+    With ``window_seconds`` set, the count-based windows are replaced by
+    :class:`TimeBucketedWindow` s of ``bucket_seconds`` buckets: KS features keep a
+    :class:`KLLSketch` per bucket and PSI features keep bin counts per bucket, so memory
+    per feature is bounded however many values arrive in the window.
+    """
 
     def __init__(
         self,
@@ -57,34 +520,229 @@ class DriftMonitor:
         numeric_method: str = "ks",
         categorical_method: str = "psi",
         entity_id_column: str = "entity_id",
+        psi_bins: int = 10,
+        window_seconds: Optional[float] = None,
+        bucket_seconds: float = 60.0,
+        window_mode: str = "sliding",
+        sketch_k: int = 200,
+        clock: Callable[[], float] = time.time,
     ) -> None:
-        self.baseline = pd.read_parquet(baseline_path)
-        if entity_id_column in self.baseline.columns:
-            self.baseline = self.baseline.drop(columns=[entity_id_column])
+        self.baseline_version = baseline_version(baseline_path)
+        self.baseline = load_baseline(baseline_path, entity_id_column, psi_bins)
+        self.baseline_path = str(baseline_path)
+        self.entity_id_column = entity_id_column
+        self.psi_bins = psi_bins
         self.window_size = window_size
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.window_mode = window_mode
+        self.sketch_k = sketch_k
+        self.clock = clock
         self.threshold = threshold
         self.numeric_method = numeric_method
         self.categorical_method = categorical_method
-        self.recent: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window_size))
+        self.recent: Dict[str, SortedWindow] = {}
+        self.psi_windows: Dict[str, Tuple[RingWindow, PSITracker]] = {}
+        self.time_windows: Dict[str, TimeBucketedWindow] = {}
+        self._lock = threading.Lock()
 
-    def record(self, features: Dict[str, float]) -> Dict[str, float]:
-        scores: Dict[str, float] = {}
-        for key, value in features.items():
-            if key not in self.baseline.columns:
-                continue
-            self.recent[key].append(float(value))
-            baseline_series = self.baseline[key].dropna().tolist()
-            recent_list = list(self.recent[key])
-            if pd.api.types.is_numeric_dtype(self.baseline[key]):
-                score = ks_statistic(baseline_series, recent_list) if self.numeric_method == "ks" else psi(
-                    baseline_series, recent_list
-                )
+    def set_baseline(self, baseline_path: str) -> bool:
+        """Switch to another baseline and clear the windows; False if it is already in use.
+
+        A baseline rebuilt at the same path counts as a new one: the check compares
+        :func:`baseline_version`, which changes with every published profile or file write.
+        """
+        version = baseline_version(baseline_path)
+        if version == self.baseline_version:
+            return False
+        baseline = load_baseline(baseline_path, self.entity_id_column, self.psi_bins)
+        with self._lock:
+            self.baseline = baseline
+            self.baseline_path = str(baseline_path)
+            self.baseline_version = version
+            self.recent.clear()
+            self.psi_windows.clear()
+            self.time_windows.clear()
+        LOG.info("Switched drift baseline", extra={"baseline": str(baseline_path)})
+        return True
+
+    def _method(self, column: BaselineColumn) -> str:
+        return self.numeric_method if column.numeric else self.categorical_method
+
+    def _time_window(self, key: str, column: BaselineColumn) -> TimeBucketedWindow:
+        window = self.time_windows.get(key)
+        if window is None:
+            if self._method(column) == "ks":
+                factory: Callable[[], WindowSummary] = partial(KLLSketch, self.sketch_k)
             else:
-                score = psi(baseline_series, recent_list) if self.categorical_method == "psi" else ks_statistic(
-                    baseline_series, recent_list
-                )
-            scores[key] = score
+                factory = partial(PSITracker, column.psi_edges, column.psi_expected)
+            window = TimeBucketedWindow(
+                self.window_seconds or 0.0, self.bucket_seconds, factory, self.window_mode
+            )
+            self.time_windows[key] = window
+        return window
+
+    def _observe_one(self, key: str, column: BaselineColumn, value: float, now: float) -> None:
+        if self.window_seconds:
+            self._time_window(key, column).add(value, now)
+            return
+        if self._method(column) == "ks":
+            window = self.recent.get(key)
+            if window is None:
+                window = self.recent[key] = SortedWindow(self.window_size)
+            window.append(value)
+            return
+        state = self.psi_windows.get(key)
+        if state is None:
+            tracker = PSITracker(column.psi_edges, column.psi_expected)
+            state = self.psi_windows[key] = (RingWindow(self.window_size), tracker)
+        ring, tracker = state
+        evicted = ring.append(value)
+        if evicted is not None:
+            tracker.remove(evicted)
+        tracker.add(value)
+
+    def _score_one(self, key: str, now: float) -> float:
+        time_window = self.time_windows.get(key)
+        if time_window is not None:
+            summary = time_window.merged(now)
+            if summary is None:
+                return 0.0
+            if isinstance(summary, KLLSketch):
+                return ks_weighted(self.baseline[key].values, *summary.weighted_items())
+            return summary.score()
+        window = self.recent.get(key)
+        if window is not None:
+            return ks_sorted(self.baseline[key].values, window.sorted_values())
+        return self.psi_windows[key][1].score()
+
+    def observe(self, features: Dict[str, float], now: Optional[float] = None) -> List[str]:
+        """Add one feature row to the windows without scoring; returns the features updated.
+
+        ``now`` is the row's arrival time for time-based windows (default: the clock).
+        """
+        now = self.clock() if now is None else now
+        updated: List[str] = []
+        with self._lock:
+            for key, value in features.items():
+                column = self.baseline.get(key)
+                if column is None or value is None or np.isnan(value):
+                    continue
+                self._observe_one(key, column, float(value), now)
+                updated.append(key)
+        return updated
+
+    def score(
+        self, keys: Optional[Iterable[str]] = None, now: Optional[float] = None
+    ) -> Dict[str, float]:
+        """Score ``keys`` (default: every observed feature) and publish ``feature_drift_score``."""
+        now = self.clock() if now is None else now
+        scores: Dict[str, float] = {}
+        with self._lock:
+            if keys is None:
+                keys = [*self.recent, *self.psi_windows, *self.time_windows]
+            for key in keys:
+                scores[key] = self._score_one(key, now)
+        for key, score in scores.items():
             FEATURE_DRIFT.labels(feature=key).set(score)
             if score > self.threshold:
                 LOG.warning("Drift detected", extra={"feature": key, "score": score})
         return scores
+
+    def record(self, features: Dict[str, float]) -> Dict[str, float]:
+        """Observe one row and score the features it touched, synchronously."""
+        return self.score(self.observe(features))
+
+
+class BackgroundDriftScorer:
+    """Keeps drift scoring off the request path.
+
+    :meth:`record` only enqueues the feature row on a bounded queue and never blocks;
+    rows arriving while the queue is full are dropped and counted in
+    ``drift_records_dropped_total``. A daemon thread drains the queue into the
+    :class:`DriftMonitor` windows and rescores every ``score_every`` rows or
+    ``score_interval_s`` seconds, whichever comes first. With time windows configured it
+    also rescores every ``score_interval_s`` while no rows arrive, so buckets that age
+    out of the window stop counting toward the published scores.
+    """
+
+    def __init__(
+        self,
+        monitor: DriftMonitor,
+        queue_size: int = 10_000,
+        score_every: int = 100,
+        score_interval_s: float = 5.0,
+    ) -> None:
+        self.monitor = monitor
+        self.score_every = score_every
+        self.score_interval_s = score_interval_s
+        self._queue: "queue.Queue[Tuple[float, Dict[str, float]]]" = queue.Queue(maxsize=queue_size)
+        self._stop: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self.dropped = 0
+
+    def record(self, features: Dict[str, float]) -> None:
+        try:
+            self._queue.put_nowait((time.time(), features))
+        except queue.Full:
+            self.dropped += 1
+            DRIFT_RECORDS_DROPPED.inc()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="mmsp-drift-scorer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._stop is not None:
+            self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.drain()
+
+    def drain(self) -> int:
+        """Observe every queued row and score once; returns the rows processed."""
+        rows = 0
+        while True:
+            try:
+                arrived, row = self._queue.get_nowait()
+                self.monitor.observe(row, now=arrived)
+            except queue.Empty:
+                break
+            rows += 1
+        if rows:
+            self._score()
+        return rows
+
+    def _score(self) -> None:
+        start = time.perf_counter()
+        self.monitor.score()
+        DRIFT_SCORING_SECONDS.observe(time.perf_counter() - start)
+        DRIFT_QUEUE_DEPTH.set(self._queue.qsize())
+
+    def _run(self) -> None:
+        assert self._stop is not None
+        pending = 0
+        last_score = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                item: Optional[Tuple[float, Dict[str, float]]] = self._queue.get(
+                    timeout=min(self.score_interval_s, 0.5)
+                )
+            except queue.Empty:
+                item = None
+            try:
+                if item is not None:
+                    self.monitor.observe(item[1], now=item[0])
+                    pending += 1
+                due = time.monotonic() - last_score >= self.score_interval_s
+                expiring = due and self.monitor.window_seconds is not None
+                if (pending and (pending >= self.score_every or due)) or expiring:
+                    self._score()
+                    pending = 0
+                    last_score = time.monotonic()
+            except Exception:  # noqa: BLE001
+                LOG.exception("Drift scoring failed")
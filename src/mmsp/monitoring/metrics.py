@@ -25,6 +25,86 @@ LATENCY_HISTOGRAM = Histogram(
     buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0),
     registry=registry,
 )
+BATCH_SIZE_HISTOGRAM = Histogram(
+    "gateway_batch_size",
+    "Rows per batched inference call",
+    ["model", "version"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+    registry=registry,
+)
+BATCH_QUEUE_WAIT_HISTOGRAM = Histogram(
+    "gateway_batch_queue_wait_seconds",
+    "Time a request waits in the batching queue before dispatch",
+    ["model", "version"],
+    buckets=(0.0001, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.05),
+    registry=registry,
+)
+PREDICTION_CACHE_HITS = Counter(
+    "gateway_prediction_cache_hits_total",
+    "Predictions served from the result cache",
+    ["model", "version"],
+    registry=registry,
+)
+PREDICTION_CACHE_MISSES = Counter(
+    "gateway_prediction_cache_misses_total",
+    "Prediction cache lookups that required inference",
+    ["model", "version"],
+    registry=registry,
+)
+PREDICTION_CACHE_EVICTIONS = Counter(
+    "gateway_prediction_cache_evictions_total",
+    "Entries removed from the prediction cache",
+    ["reason"],
+    registry=registry,
+)
+ADMISSION_INFLIGHT = Gauge(
+    "gateway_admission_inflight",
+    "Inference calls holding an admission slot (version=all is the model-wide limit)",
+    ["model", "version"],
+    registry=registry,
+)
+ADMISSION_QUEUED = Gauge(
+    "gateway_admission_queued",
+    "Requests waiting for an admission slot",
+    ["model", "version"],
+    registry=registry,
+)
+ADMISSION_SHED = Counter(
+    "gateway_admission_shed_total",
+    "Requests rejected by admission control",
+    ["model", "version", "reason"],
+    registry=registry,
+)
+FEATURE_CACHE_LOOKUPS = Counter(
+    "gateway_feature_cache_lookups_total",
+    "Entity lookups by the gateway feature cache, by result (hit, miss, coalesced)",
+    ["result"],
+    registry=registry,
+)
+FEATURE_CACHE_STALENESS = Histogram(
+    "gateway_feature_cache_staleness_seconds",
+    "Age of cached features when served",
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+    registry=registry,
+)
+FEATURE_SNAPSHOT_INFO = Gauge(
+    "feature_snapshot_info",
+    "Active feature store snapshot (value is always 1)",
+    ["store", "version"],
+    registry=registry,
+)
+FEATURE_SNAPSHOT_LOADED = Gauge(
+    "feature_snapshot_loaded_timestamp_seconds",
+    "Unix time the active feature snapshot was loaded",
+    ["store"],
+    registry=registry,
+)
+FEATURE_SNAPSHOT_ROWS = Gauge(
+    "feature_snapshot_rows",
+    "Entities in the active feature snapshot",
+    ["store"],
+    registry=registry,
+)
 CURRENT_MODEL_GAUGE = Gauge(
     "gateway_current_model_version",
     "Current deployed model version",
@@ -37,6 +117,25 @@ FEATURE_DRIFT = Gauge(
     ["feature"],
     registry=registry,
 )
+DRIFT_RECORDS_DROPPED = Counter(
+    "drift_records_dropped_total",
+    "Feature rows not scored for drift because the scorer queue was full",
+    registry=registry,
+)
+DRIFT_QUEUE_DEPTH = Gauge(
+    "drift_queue_depth",
+    "Feature rows waiting for the background drift scorer",
+    registry=registry,
+)
+DRIFT_SCORING_SECONDS = Histogram(
+    "drift_scoring_seconds",
+    "Time the background drift scorer spends per scoring pass",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0),
+    registry=registry,
+)
+
+# Last published snapshot version per store, so its stale info series can be removed.
+_active_snapshot_versions: dict[str, str] = {}
 
 
 def observe_request(model: str, version: str, phase: str, latency: float, success: bool) -> None:
@@ -46,6 +145,49 @@ def observe_request(model: str, version: str, phase: str, latency: float, succes
         REQUEST_ERROR_COUNTER.labels(model=model, version=version, phase=phase).inc()
 
 
+def observe_batch(model: str, version: str, size: int, queue_waits: list[float]) -> None:
+    BATCH_SIZE_HISTOGRAM.labels(model=model, version=version).observe(size)
+    wait_histogram = BATCH_QUEUE_WAIT_HISTOGRAM.labels(model=model, version=version)
+    for wait in queue_waits:
+        wait_histogram.observe(wait)
+
+
+def observe_prediction_cache(model: str, version: str, event: str, reason: str = "") -> None:
+    if event == "hit":
+        PREDICTION_CACHE_HITS.labels(model=model, version=version).inc()
+    elif event == "miss":
+        PREDICTION_CACHE_MISSES.labels(model=model, version=version).inc()
+    else:
+        PREDICTION_CACHE_EVICTIONS.labels(reason=reason).inc()
+
+
+def set_admission_gauges(model: str, version: str, inflight: int, queued: int) -> None:
+    ADMISSION_INFLIGHT.labels(model=model, version=version).set(inflight)
+    ADMISSION_QUEUED.labels(model=model, version=version).set(queued)
+
+
+def observe_admission_shed(model: str, version: str, reason: str) -> None:
+    ADMISSION_SHED.labels(model=model, version=version, reason=reason).inc()
+
+
+def observe_feature_cache(hits: int, misses: int, coalesced: int, ages: list[float]) -> None:
+    for result, count in (("hit", hits), ("miss", misses), ("coalesced", coalesced)):
+        if count:
+            FEATURE_CACHE_LOOKUPS.labels(result=result).inc(count)
+    for age in ages:
+        FEATURE_CACHE_STALENESS.observe(age)
+
+
+def set_feature_snapshot(store: str, version: str, loaded_at: float, rows: int) -> None:
+    previous = _active_snapshot_versions.get(store)
+    if previous is not None and previous != version:
+        FEATURE_SNAPSHOT_INFO.remove(store, previous)
+    _active_snapshot_versions[store] = version
+    FEATURE_SNAPSHOT_INFO.labels(store=store, version=version).set(1)
+    FEATURE_SNAPSHOT_LOADED.labels(store=store).set(loaded_at)
+    FEATURE_SNAPSHOT_ROWS.labels(store=store).set(rows)
+
+
 def set_version_gauges(prod_version: int, canary_version: int | None) -> None:
     CURRENT_MODEL_GAUGE.labels(phase="prod").set(prod_version)
     CURRENT_MODEL_GAUGE.labels(phase="canary").set(canary_version or 0)
@@ -80,6 +80,22 @@ class RegistryStore:
             models.extend(versions)
         return models
 
+    def update_metadata(self, name: str, version: int, metadata: Dict[str, str]) -> ModelVersion:
+        """Merge ``metadata`` into a registered version's metadata, e.g. to link artifacts."""
+        with self._lock:
+            state = self._read_state()
+            versions = state.models.get(name)
+            if not versions:
+                raise ValueError(f"Model {name} not found")
+            for pos, mv in enumerate(versions):
+                if mv.version == version:
+                    updated = mv.model_copy(update={"metadata": {**mv.metadata, **metadata}})
+                    versions[pos] = updated
+                    self._write_state(state)
+                    LOG.info("Updated model metadata", extra={"model": name, "version": version})
+                    return updated
+            raise ValueError(f"Version {version} not found for model {name}")
+
     def promote(self, name: str, version: int, stage: str) -> None:
         stage = stage.lower()
         with self._lock:
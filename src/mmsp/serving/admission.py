@@ -0,0 +1,179 @@
+"""Admission control, deadlines and load shedding for inference calls."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Deque, Dict, Optional, Tuple, TypeVar
+
+from mmsp.monitoring.metrics import observe_admission_shed, set_admission_gauges
+from mmsp.utils.logging import get_logger
+
+LOG = get_logger(__name__)
+
+MODEL_WIDE = "all"
+
+T = TypeVar("T")
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed; ``status_code`` is the HTTP status to return."""
+
+    def __init__(self, status_code: int, reason: str) -> None:
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+
+
+class _Limiter:
+    """Concurrency limit with a bounded FIFO wait queue, bound to one event loop."""
+
+    def __init__(self, model: str, version: str, limit: int, max_queue: int) -> None:
+        self.model = model
+        self.version = version
+        self.limit = limit
+        self.max_queue = max_queue
+        self.inflight = 0
+        self.waiters: Deque["asyncio.Future[None]"] = deque()
+
+    def _report(self) -> None:
+        set_admission_gauges(self.model, self.version, self.inflight, len(self.waiters))
+
+    async def acquire(self, deadline: Optional[float]) -> None:
+        if self.inflight < self.limit and not self.waiters:
+            self.inflight += 1
+            self._report()
+            return
+        if len(self.waiters) >= self.max_queue:
+            raise AdmissionRejected(429, "queue_full")
+        waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        self._report()
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just as the deadline fired or the caller went away; hand it back.
+                self.release()
+            else:
+                waiter.cancel()
+            if isinstance(exc, asyncio.TimeoutError):
+                raise AdmissionRejected(503, "deadline_expired") from None
+            raise
+        finally:
+            if waiter in self.waiters:
+                self.waiters.remove(waiter)
+            self._report()
+
+    def release(self) -> None:
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                # The slot passes straight to the next live waiter; inflight is unchanged.
+                waiter.set_result(None)
+                self._report()
+                return
+        self.inflight -= 1
+        self._report()
+
+
+class AdmissionController:
+    """Per-model and per-(model, version) concurrency limits with deadline-aware shedding.
+
+    A request first takes a model-wide slot, then a version slot. When a limit is reached
+    it waits in a bounded queue; a full queue is rejected with 429. If the request carries
+    a deadline it is rejected with 503 up front when the remaining budget is below the
+    recent service time, and dropped with 503 if the deadline passes while it is queued.
+    """
+
+    def __init__(
+        self,
+        max_concurrency_per_model: int = 256,
+        max_concurrency_per_version: int = 64,
+        max_queue: int = 256,
+        latency_ewma_alpha: float = 0.2,
+    ) -> None:
+        self.max_concurrency_per_model = max_concurrency_per_model
+        self.max_concurrency_per_version = max_concurrency_per_version
+        self.max_queue = max_queue
+        self.latency_ewma_alpha = latency_ewma_alpha
+        self._limiters: Dict[Tuple[str, str], _Limiter] = {}
+        self._latency: Dict[Tuple[str, str], float] = {}
+
+    def _limiter(self, model: str, version: str, limit: int) -> _Limiter:
+        key = (model, version)
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = _Limiter(model, version, limit, self.max_queue)
+            self._limiters[key] = limiter
+        return limiter
+
+    def expected_latency(self, model: str, version: int) -> Optional[float]:
+        return self._latency.get((model, str(version)))
+
+    def _observe_latency(self, model: str, version: int, latency: float) -> None:
+        key = (model, str(version))
+        previous = self._latency.get(key)
+        alpha = self.latency_ewma_alpha
+        self._latency[key] = latency if previous is None else alpha * latency + (1 - alpha) * previous
+
+    @asynccontextmanager
+    async def admit(
+        self, model: str, version: int, deadline: Optional[float] = None
+    ) -> AsyncIterator[None]:
+        """Hold a model and version slot for the duration of the ``async with`` block.
+
+        ``deadline`` is an absolute ``time.monotonic()`` timestamp. ``AdmissionRejected``
+        raised inside the block, e.g. by :func:`within_deadline`, is counted as shed too.
+        """
+        version_label = str(version)
+        try:
+            if deadline is not None:
+                expected = self.expected_latency(model, version) or 0.0
+                if deadline - time.monotonic() <= expected:
+                    raise AdmissionRejected(503, "deadline")
+            model_limiter = self._limiter(model, MODEL_WIDE, self.max_concurrency_per_model)
+            version_limiter = self._limiter(model, version_label, self.max_concurrency_per_version)
+            await model_limiter.acquire(deadline)
+            try:
+                await version_limiter.acquire(deadline)
+            except BaseException:
+                model_limiter.release()
+                raise
+        except AdmissionRejected as exc:
+            observe_admission_shed(model, version_label, exc.reason)
+            raise
+        start = time.perf_counter()
+        try:
+            yield
+        except AdmissionRejected as exc:
+            # The deadline ran out after admission, e.g. while waiting on the backend.
+            observe_admission_shed(model, version_label, exc.reason)
+            raise
+        finally:
+            version_limiter.release()
+            model_limiter.release()
+            self._observe_latency(model, version, time.perf_counter() - start)
+
+
+def remaining_timeout(deadline: Optional[float]) -> Optional[float]:
+    """Seconds left until ``deadline``; raises ``AdmissionRejected`` once it has passed."""
+    if deadline is None:
+        return None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise AdmissionRejected(503, "deadline_expired")
+    return remaining
+
+
+async def within_deadline(awaitable: Awaitable[T], timeout: Optional[float]) -> T:
+    """Await with a ``remaining_timeout`` budget; running out is shed as ``deadline_expired``."""
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError:
+        if timeout is None:
+            raise
+        raise AdmissionRejected(503, "deadline_expired") from None
@@ -0,0 +1,102 @@
+"""Per-model selection of the inference backend."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from mmsp.serving.client import AsyncInferenceClient, create_triton_client
+from mmsp.utils.config import PlatformConfig
+from mmsp.utils.logging import get_logger
+
+LOG = get_logger(__name__)
+
+BACKEND_TRITON = "triton"
+BACKEND_ONNXRUNTIME = "onnxruntime"
+
+
+class BackendRouter:
+    """Dispatches inference to the backend configured for each model.
+
+    Backends are built on first use, so a deployment that never routes to Triton (or to
+    ONNX Runtime) does not need it reachable or installed.
+    """
+
+    def __init__(
+        self,
+        factories: Dict[str, Callable[[], AsyncInferenceClient]],
+        default_backend: str = BACKEND_TRITON,
+        model_backends: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.factories = factories
+        self.default_backend = default_backend
+        self.model_backends = model_backends or {}
+        for name in {default_backend, *self.model_backends.values()}:
+            if name not in factories:
+                raise ValueError(f"Unknown inference backend {name}")
+        self._backends: Dict[str, AsyncInferenceClient] = {}
+
+    def backend_name(self, model_name: str) -> str:
+        return self.model_backends.get(model_name, self.default_backend)
+
+    def get(self, model_name: str) -> AsyncInferenceClient:
+        name = self.backend_name(model_name)
+        backend = self._backends.get(name)
+        if backend is None:
+            backend = self.factories[name]()
+            self._backends[name] = backend
+            LOG.info("Initialized inference backend", extra={"backend": name})
+        return backend
+
+    async def predict(self, model_name: str, model_version: int, array: np.ndarray) -> List[float]:
+        return await self.get(model_name).predict(model_name, model_version, array)
+
+    async def predict_batch(
+        self,
+        model_name: str,
+        model_version: int,
+        matrix: np.ndarray,
+        timeout: Optional[float] = None,
+    ) -> np.ndarray:
+        return await self.get(model_name).predict_batch(model_name, model_version, matrix, timeout=timeout)
+
+    def supports_streaming(self, model_name: str) -> bool:
+        return hasattr(self.get(model_name), "stream_predict")
+
+    async def stream_predict(
+        self,
+        model_name: str,
+        model_version: int,
+        matrices: Sequence[np.ndarray],
+        timeout: Optional[float] = None,
+    ) -> List[np.ndarray]:
+        """Send ``matrices`` over one stream; only for backends where :meth:`supports_streaming`."""
+        backend: Any = self.get(model_name)
+        return await backend.stream_predict(model_name, model_version, matrices, timeout=timeout)
+
+    async def aclose(self) -> None:
+        for backend in self._backends.values():
+            await backend.aclose()
+        self._backends.clear()
+
+
+def create_backend_router(cfg: PlatformConfig) -> BackendRouter:
+    def onnxruntime_backend() -> AsyncInferenceClient:
+        from mmsp.serving.onnx_backend import OnnxRuntimeBackend
+
+        return OnnxRuntimeBackend(
+            cfg.model_repository,
+            intra_op_num_threads=cfg.onnxruntime.intra_op_num_threads,
+            inter_op_num_threads=cfg.onnxruntime.inter_op_num_threads,
+            max_concurrency=cfg.onnxruntime.max_concurrency,
+        )
+
+    return BackendRouter(
+        factories={
+            BACKEND_TRITON: lambda: create_triton_client(cfg.triton),
+            BACKEND_ONNXRUNTIME: onnxruntime_backend,
+        },
+        default_backend=cfg.gateway.default_backend,
+        model_backends=cfg.gateway.model_backends,
+    )
@@ -0,0 +1,101 @@
+"""Dynamic micro-batching of concurrent inference requests."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from mmsp.monitoring.metrics import observe_batch
+from mmsp.utils.logging import get_logger
+
+LOG = get_logger(__name__)
+
+InferFn = Callable[[str, int, np.ndarray], Awaitable[np.ndarray]]
+
+
+@dataclass
+class _Pending:
+    row: np.ndarray
+    future: "asyncio.Future[np.ndarray]"
+    enqueued_at: float
+
+
+@dataclass
+class _BatchQueue:
+    items: List[_Pending] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class MicroBatcher:
+    """Collects concurrent single-row requests per (model, version) into one ``[N, F]`` call.
+
+    A queue is flushed as soon as it holds ``max_batch_size`` rows or when the oldest row
+    has waited ``max_wait_us`` microseconds, whichever comes first. Output row ``i`` of the
+    batched call is handed back to the caller that submitted input row ``i``.
+    """
+
+    def __init__(self, infer: InferFn, max_batch_size: int = 32, max_wait_us: int = 500) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        self.infer = infer
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_us / 1_000_000
+        self._queues: Dict[Tuple[str, int], _BatchQueue] = {}
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    async def submit(self, model_name: str, version: int, row: np.ndarray) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        key = (model_name, version)
+        queue = self._queues.setdefault(key, _BatchQueue())
+        pending = _Pending(row=row, future=loop.create_future(), enqueued_at=time.perf_counter())
+        queue.items.append(pending)
+        if len(queue.items) >= self.max_batch_size:
+            self._flush(key)
+        elif queue.timer is None:
+            queue.timer = loop.call_later(self.max_wait_s, self._flush, key)
+        return await pending.future
+
+    def _flush(self, key: Tuple[str, int]) -> None:
+        queue = self._queues[key]
+        if queue.timer is not None:
+            queue.timer.cancel()
+            queue.timer = None
+        batch = queue.items[: self.max_batch_size]
+        queue.items = queue.items[self.max_batch_size :]
+        if queue.items:
+            loop = asyncio.get_running_loop()
+            queue.timer = loop.call_later(self.max_wait_s, self._flush, key)
+        if batch:
+            task = asyncio.ensure_future(self._dispatch(key, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, key: Tuple[str, int], batch: List[_Pending]) -> None:
+        model_name, version = key
+        # Callers that timed out or were cancelled while queued are not sent to the backend.
+        batch = [p for p in batch if not p.future.done()]
+        if not batch:
+            return
+        now = time.perf_counter()
+        observe_batch(model_name, str(version), len(batch), [now - p.enqueued_at for p in batch])
+        try:
+            matrix = np.stack([p.row for p in batch]).astype(np.float32, copy=False)
+            outputs = await self.infer(model_name, version, matrix)
+            if len(outputs) != len(batch):
+                raise RuntimeError(f"Expected {len(batch)} output rows, got {len(outputs)}")
+        except Exception as exc:
+            LOG.error(
+                "Batched inference failed",
+                extra={"model": model_name, "version": version, "size": len(batch), "error": str(exc)},
+            )
+            for p in batch:
+                if not p.future.done():
+                    p.future.set_exception(exc)
+            return
+        for idx, p in enumerate(batch):
+            if not p.future.done():
+                p.future.set_result(outputs[idx])
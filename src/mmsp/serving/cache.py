@@ -0,0 +1,104 @@
+"""Bounded LRU + TTL cache of prediction results."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+from mmsp.monitoring.metrics import observe_prediction_cache
+from mmsp.utils.logging import get_logger
+
+LOG = get_logger(__name__)
+
+CacheKey = Tuple[str, int, bytes]
+
+# Rough per-entry bookkeeping cost (key tuple, digest, OrderedDict node, timestamp).
+ENTRY_OVERHEAD_BYTES = 256
+
+
+def feature_digest(row: np.ndarray) -> bytes:
+    """Hash of the ordered float32 feature vector."""
+    data = np.ascontiguousarray(row, dtype=np.float32)
+    return hashlib.blake2b(data.tobytes(), digest_size=16).digest()
+
+
+class PredictionCache:
+    """Maps (model_name, version, feature digest) to the model output row.
+
+    Entries expire ``ttl_s`` seconds after insertion; the least recently used entries are
+    evicted once either ``max_entries`` or the estimated ``max_bytes`` budget is exceeded.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_s: float = 300.0,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self._entries: "OrderedDict[CacheKey, Tuple[float, np.ndarray]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _entry_size(key: CacheKey, output: np.ndarray) -> int:
+        return ENTRY_OVERHEAD_BYTES + len(key[0]) + output.nbytes
+
+    def _drop(self, key: CacheKey, reason: str) -> None:
+        _, output = self._entries.pop(key)
+        self._bytes -= self._entry_size(key, output)
+        observe_prediction_cache(key[0], str(key[1]), "eviction", reason=reason)
+
+    def get(self, model_name: str, version: int, row: np.ndarray) -> Optional[np.ndarray]:
+        key = (model_name, version, feature_digest(row))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_s:
+                self._drop(key, "ttl")
+                entry = None
+            if entry is None:
+                observe_prediction_cache(model_name, str(version), "miss")
+                return None
+            self._entries.move_to_end(key)
+        observe_prediction_cache(model_name, str(version), "hit")
+        return entry[1]
+
+    def put(self, model_name: str, version: int, row: np.ndarray, output: np.ndarray) -> None:
+        key = (model_name, version, feature_digest(row))
+        output = np.array(output, copy=True)
+        size = self._entry_size(key, output)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key, "replaced")
+            self._entries[key] = (time.monotonic(), output)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._drop(oldest, "capacity")
+
+    def retain_versions(self, model_name: str, versions: Iterable[Optional[int]]) -> None:
+        """Drop cached results for ``model_name`` whose version is no longer deployed."""
+        keep = {v for v in versions if v is not None}
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == model_name and key[1] not in keep]
+            for key in stale:
+                self._drop(key, "invalidated")
+        if stale:
+            LOG.info("Invalidated cached predictions", extra={"model": model_name, "entries": len(stale)})
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                self._drop(key, "invalidated")
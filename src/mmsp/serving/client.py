@@ -2,39 +2,235 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import json
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Protocol, Tuple
 
+import httpx
 import numpy as np
 import requests
 
+from mmsp.utils.config import TritonConfig
 from mmsp.utils.logging import get_logger
 
 LOG = get_logger(__name__)
 
+# KServe v2 binary tensor extension: the JSON header length is sent in this header and the
+# raw tensor bytes follow the JSON header in the body, in the order the tensors are listed.
+INFERENCE_HEADER_LENGTH = "Inference-Header-Content-Length"
+
+V2_DTYPES: Dict[str, str] = {
+    "BOOL": "|b1",
+    "INT8": "|i1",
+    "INT16": "<i2",
+    "INT32": "<i4",
+    "INT64": "<i8",
+    "UINT8": "|u1",
+    "UINT16": "<u2",
+    "UINT32": "<u4",
+    "UINT64": "<u8",
+    "FP16": "<f2",
+    "FP32": "<f4",
+    "FP64": "<f8",
+}
+
+
+class AsyncInferenceClient(Protocol):
+    """Interface shared by the async Triton transports."""
+
+    async def predict(self, model_name: str, model_version: int, array: np.ndarray) -> List[float]:
+        ...
+
+    async def predict_batch(
+        self,
+        model_name: str,
+        model_version: int,
+        matrix: np.ndarray,
+        timeout: Optional[float] = None,
+    ) -> np.ndarray:
+        ...
+
+    async def aclose(self) -> None:
+        ...
+
+
+def _infer_endpoint(url: str, model_name: str, model_version: int) -> str:
+    return f"{url}/v2/models/{model_name}/versions/{model_version}/infer"
+
+
+def _build_payload(matrix: np.ndarray) -> Dict[str, Any]:
+    return {
+        "inputs": [
+            {
+                "name": "input",
+                "shape": list(matrix.shape),
+                "datatype": "FP32",
+                "data": matrix.astype(float).reshape(-1).tolist(),
+            }
+        ],
+        "outputs": [{"name": "output"}],
+    }
+
+
+def _build_binary_payload(matrix: np.ndarray) -> Tuple[bytes, memoryview]:
+    """Return the JSON header and a zero-copy view of the raw little-endian FP32 tensor."""
+    tensor = np.ascontiguousarray(matrix, dtype="<f4")
+    header = {
+        "inputs": [
+            {
+                "name": "input",
+                "shape": list(tensor.shape),
+                "datatype": "FP32",
+                "parameters": {"binary_data_size": tensor.nbytes},
+            }
+        ],
+        "outputs": [{"name": "output", "parameters": {"binary_data": True}}],
+    }
+    return json.dumps(header).encode("utf-8"), memoryview(tensor).cast("B")
+
+
+def _binary_headers(header: bytes, body_size: int) -> Dict[str, str]:
+    return {
+        "Content-Type": "application/octet-stream",
+        "Content-Length": str(body_size),
+        INFERENCE_HEADER_LENGTH: str(len(header)),
+    }
+
+
+def _parse_outputs(data: Dict[str, Any], rows: int) -> np.ndarray:
+    outputs = data.get("outputs", [])
+    if not outputs:
+        raise RuntimeError("No outputs from Triton response")
+    output = outputs[0]
+    values = np.asarray(output["data"], dtype=np.float32)
+    shape = output.get("shape") or [rows, -1]
+    return values.reshape(shape)
+
+
+def _decode_response(body: bytes, headers: Mapping[str, str], rows: int) -> np.ndarray:
+    """Decode a v2 infer response, reading binary outputs in place when the server sent them."""
+    header_length = headers.get(INFERENCE_HEADER_LENGTH)
+    if header_length is None:
+        return _parse_outputs(json.loads(body), rows)
+    offset = int(header_length)
+    data = json.loads(body[:offset])
+    outputs = data.get("outputs", [])
+    if not outputs:
+        raise RuntimeError("No outputs from Triton response")
+    output = outputs[0]
+    size = output.get("parameters", {}).get("binary_data_size")
+    if size is None:
+        return _parse_outputs(data, rows)
+    dtype = np.dtype(V2_DTYPES[output["datatype"]])
+    values = np.frombuffer(body, dtype=dtype, count=size // dtype.itemsize, offset=offset)
+    return values.reshape(output.get("shape") or [rows, -1])
+
+
+def _as_batch(matrix: np.ndarray) -> np.ndarray:
+    return np.expand_dims(matrix, axis=0) if matrix.ndim == 1 else matrix
+
 
 class TritonHTTPClient:
-    def __init__(self, url: str) -> None:
+    def __init__(self, url: str, timeout_s: float = 5.0, binary_data: bool = True) -> None:
         self.url = url.rstrip("/")
+        self.timeout_s = timeout_s
+        self.binary_data = binary_data
+        self.session = requests.Session()
 
     def predict(self, model_name: str, model_version: int, array: np.ndarray) -> List[float]:
-        if array.ndim == 1:
-            array = np.expand_dims(array, axis=0)
-        payload: Dict[str, Any] = {
-            "inputs": [
-                {
-                    "name": "input",
-                    "shape": list(array.shape),
-                    "datatype": "FP32",
-                    "data": array.astype(float).reshape(-1).tolist(),
-                }
-            ],
-            "outputs": [{"name": "output"}],
-        }
-        endpoint = f"{self.url}/v2/models/{model_name}/versions/{model_version}/infer"
-        resp = requests.post(endpoint, json=payload, timeout=5)
+        return self.predict_batch(model_name, model_version, array).reshape(-1).tolist()
+
+    def predict_batch(self, model_name: str, model_version: int, matrix: np.ndarray) -> np.ndarray:
+        """Run one inference call over an ``[N, F]`` matrix and return ``[N, ...]`` outputs."""
+        matrix = _as_batch(matrix)
+        endpoint = _infer_endpoint(self.url, model_name, model_version)
+        if self.binary_data:
+            header, tensor = _build_binary_payload(matrix)
+            resp = self.session.post(
+                endpoint,
+                data=header + tensor,
+                headers=_binary_headers(header, len(header) + tensor.nbytes),
+                timeout=self.timeout_s,
+            )
+        else:
+            resp = self.session.post(endpoint, json=_build_payload(matrix), timeout=self.timeout_s)
         resp.raise_for_status()
-        data = resp.json()
-        outputs = data.get("outputs", [])
-        if not outputs:
-            raise RuntimeError("No outputs from Triton response")
-        return outputs[0]["data"]
+        return _decode_response(resp.content, resp.headers, matrix.shape[0])
+
+
+class AsyncTritonHTTPClient:
+    """Asyncio Triton client with a keep-alive connection pool shared by all requests."""
+
+    def __init__(
+        self,
+        url: str,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        timeout_s: float = 5.0,
+        binary_data: bool = True,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.url = url.rstrip("/")
+        self.timeout_s = timeout_s
+        self.binary_data = binary_data
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            timeout=timeout_s,
+            transport=transport,
+        )
+
+    async def predict(self, model_name: str, model_version: int, array: np.ndarray) -> List[float]:
+        outputs = await self.predict_batch(model_name, model_version, array)
+        return outputs.reshape(-1).tolist()
+
+    async def predict_batch(
+        self,
+        model_name: str,
+        model_version: int,
+        matrix: np.ndarray,
+        timeout: Optional[float] = None,
+    ) -> np.ndarray:
+        """Async variant of :meth:`TritonHTTPClient.predict_batch` with an optional per-call timeout."""
+        matrix = _as_batch(matrix)
+        endpoint = _infer_endpoint(self.url, model_name, model_version)
+        call_timeout = timeout if timeout is not None else self.timeout_s
+        if self.binary_data:
+            header, tensor = _build_binary_payload(matrix)
+
+            async def body() -> AsyncIterator[bytes]:
+                # Streams the tensor buffer as-is instead of concatenating it with the header.
+                yield header
+                yield tensor  # type: ignore[misc]
+
+            resp = await self.client.post(
+                endpoint,
+                content=body(),
+                headers=_binary_headers(header, len(header) + tensor.nbytes),
+                timeout=call_timeout,
+            )
+        else:
+            resp = await self.client.post(endpoint, json=_build_payload(matrix), timeout=call_timeout)
+        resp.raise_for_status()
+        return _decode_response(resp.content, resp.headers, matrix.shape[0])
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+def create_triton_client(cfg: TritonConfig) -> AsyncInferenceClient:
+    """Build the async Triton client selected by ``triton.protocol`` (``http`` or ``grpc``)."""
+    if cfg.protocol == "grpc":
+        from mmsp.serving.grpc_client import TritonGRPCClient
+
+        return TritonGRPCClient(cfg.grpc_url, timeout_s=cfg.timeout_s)
+    if cfg.protocol != "http":
+        raise ValueError(f"Unsupported triton protocol {cfg.protocol}")
+    return AsyncTritonHTTPClient(
+        cfg.url,
+        max_connections=cfg.max_connections,
+        max_keepalive_connections=cfg.max_keepalive_connections,
+        timeout_s=cfg.timeout_s,
+        binary_data=cfg.binary_data,
+    )
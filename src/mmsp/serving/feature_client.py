@@ -0,0 +1,221 @@
+"""Feature lookups from the gateway: local or remote sources behind a coalescing cache."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Protocol, Sequence, Tuple
+
+import httpx
+
+from mmsp.features.base import FeatureMatrix, FeatureStore
+from mmsp.features.codecs import ARROW_MEDIA_TYPE, decode_batch
+from mmsp.features.partitioning import shard_for_ids
+from mmsp.features.sharding import HashRing
+from mmsp.monitoring.metrics import observe_feature_cache
+from mmsp.utils.logging import get_logger
+
+LOG = get_logger(__name__)
+
+FeatureMap = Dict[str, Dict[str, float]]
+
+
+class FeatureSource(Protocol):
+    async def get_features(self, entity_ids: Iterable[str | int]) -> FeatureMap:
+        ...
+
+    async def aclose(self) -> None:
+        ...
+
+
+class LocalFeatureSource:
+    """Adapts an in-process :class:`FeatureStore` to the gateway's async lookups."""
+
+    def __init__(self, store: FeatureStore) -> None:
+        self.store = store
+
+    async def get_features(self, entity_ids: Iterable[str | int]) -> FeatureMap:
+        return await self.store.aget_features(list(entity_ids))
+
+    async def aclose(self) -> None:
+        close = getattr(self.store, "close", None)
+        if close is not None:
+            close()
+
+
+class RemoteFeatureClient:
+    """Calls the Feature API over a pooled keep-alive HTTP client.
+
+    Multi-entity lookups are split into ``POST /features/batch`` requests of at most
+    ``batch_size`` ids that run concurrently; responses are Arrow IPC streams decoded
+    straight into float32 matrices.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        batch_size: int = 256,
+        max_connections: int = 50,
+        timeout_s: float = 2.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.url = url.rstrip("/")
+        self.batch_size = batch_size
+        self.client = httpx.AsyncClient(
+            base_url=self.url,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=timeout_s,
+            transport=transport,
+        )
+
+    async def _fetch(self, entity_ids: List[str]) -> FeatureMatrix:
+        resp = await self.client.post(
+            "/features/batch",
+            json={"entity_ids": entity_ids},
+            headers={"Accept": ARROW_MEDIA_TYPE},
+        )
+        resp.raise_for_status()
+        batch, _ = decode_batch(resp.content, resp.headers.get("content-type", ARROW_MEDIA_TYPE))
+        return batch
+
+    async def get_matrix(self, entity_ids: Iterable[str | int]) -> List[FeatureMatrix]:
+        """Found rows, one ``FeatureMatrix`` per request chunk."""
+        ids = [str(eid) for eid in entity_ids]
+        chunks = [ids[i : i + self.batch_size] for i in range(0, len(ids), self.batch_size)]
+        return list(await asyncio.gather(*(self._fetch(chunk) for chunk in chunks)))
+
+    async def get_features(self, entity_ids: Iterable[str | int]) -> FeatureMap:
+        result: FeatureMap = {}
+        for batch in await self.get_matrix(entity_ids):
+            result.update(batch.to_dicts())
+        return result
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+class ShardedFeatureClient:
+    """Scatters multi-entity lookups to the replicas owning each id's shard and gathers them.
+
+    Placement matches the replicas' own ``HashRing``, so every id goes to exactly one
+    replica; per-replica requests run concurrently over that replica's pooled client.
+    """
+
+    def __init__(self, ring: HashRing, num_shards: int, clients: Mapping[str, RemoteFeatureClient]) -> None:
+        self.ring = ring
+        self.num_shards = num_shards
+        self.clients = dict(clients)
+        self._owners = [ring.shard_owner(shard) for shard in range(num_shards)]
+
+    @classmethod
+    def from_urls(
+        cls, replicas: Sequence[str], num_shards: int, vnodes: int = 128, batch_size: int = 256
+    ) -> "ShardedFeatureClient":
+        clients = {url: RemoteFeatureClient(url, batch_size=batch_size) for url in replicas}
+        return cls(HashRing(replicas, vnodes=vnodes), num_shards, clients)
+
+    async def get_features(self, entity_ids: Iterable[str | int]) -> FeatureMap:
+        ids = [str(eid) for eid in entity_ids]
+        groups: Dict[str, List[str]] = {}
+        for eid, shard in zip(ids, shard_for_ids(ids, self.num_shards).tolist(), strict=True):
+            groups.setdefault(self._owners[shard], []).append(eid)
+        parts = await asyncio.gather(
+            *(self.clients[node].get_features(group) for node, group in groups.items())
+        )
+        result: FeatureMap = {}
+        for part in parts:
+            result.update(part)
+        return result
+
+    async def aclose(self) -> None:
+        await asyncio.gather(*(client.aclose() for client in self.clients.values()))
+
+
+def _retrieve(future: "asyncio.Future[Any]") -> None:
+    # Marks a failed fetch as observed when no concurrent caller was waiting on it.
+    if not future.cancelled():
+        future.exception()
+
+
+class CachingFeatureClient:
+    """Bounded LRU + TTL cache with single-flight coalescing in front of a feature source.
+
+    Concurrent misses for the same entity share one in-flight fetch; all misses of a call
+    are fetched together in one multi-entity request. Entities the source does not know
+    are not cached. The cache is bound to the gateway's event loop and is not thread-safe.
+    """
+
+    def __init__(self, source: FeatureSource, max_entries: int = 100_000, ttl_s: float = 30.0) -> None:
+        self.source = source
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, float]]]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Future[Optional[Dict[str, float]]]"] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def invalidate(self, entity_ids: Optional[Iterable[str | int]] = None) -> None:
+        if entity_ids is None:
+            self._entries.clear()
+            return
+        for eid in entity_ids:
+            self._entries.pop(str(eid), None)
+
+    def _put(self, entity_id: str, features: Dict[str, float]) -> None:
+        self._entries[entity_id] = (time.monotonic(), features)
+        self._entries.move_to_end(entity_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_features(self, entity_ids: Iterable[str | int]) -> FeatureMap:
+        now = time.monotonic()
+        result: FeatureMap = {}
+        waiting: Dict[str, "asyncio.Future[Optional[Dict[str, float]]]"] = {}
+        misses: List[str] = []
+        ages: List[float] = []
+        for eid in dict.fromkeys(str(eid) for eid in entity_ids):
+            entry = self._entries.get(eid)
+            if entry is not None and now - entry[0] <= self.ttl_s:
+                self._entries.move_to_end(eid)
+                ages.append(now - entry[0])
+                result[eid] = entry[1]
+            elif eid in self._inflight:
+                waiting[eid] = self._inflight[eid]
+            else:
+                misses.append(eid)
+        observe_feature_cache(hits=len(ages), misses=len(misses), coalesced=len(waiting), ages=ages)
+
+        if misses:
+            loop = asyncio.get_running_loop()
+            owned = {eid: loop.create_future() for eid in misses}
+            for future in owned.values():
+                future.add_done_callback(_retrieve)
+            self._inflight.update(owned)
+            try:
+                fetched = await self.source.get_features(misses)
+            except BaseException as exc:
+                error = exc if isinstance(exc, Exception) else RuntimeError("Feature fetch cancelled")
+                for future in owned.values():
+                    if not future.done():
+                        future.set_exception(error)
+                raise
+            finally:
+                for eid in misses:
+                    self._inflight.pop(eid, None)
+            for eid, future in owned.items():
+                features = fetched.get(eid)
+                if features is not None:
+                    self._put(eid, features)
+                    result[eid] = features
+                future.set_result(features)
+
+        for eid, future in waiting.items():
+            features = await asyncio.shield(future)
+            if features is not None:
+                result[eid] = features
+        return result
+
+    async def aclose(self) -> None:
+        await self.source.aclose()
@@ -0,0 +1,206 @@
+"""Compiled model input schemas for assembling feature vectors."""
+
+from __future__ import annotations
+
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from mmsp.registry.store import RegistryStore
+from mmsp.utils.logging import get_logger
+
+LOG = get_logger(__name__)
+
+FEATURES_METADATA_KEY = "features"
+FEATURE_DEFAULTS_METADATA_KEY = "feature_defaults"
+
+
+class MissingFeaturesError(ValueError):
+    def __init__(self, missing: Sequence[str]) -> None:
+        super().__init__(f"Missing features: {', '.join(missing)}")
+        self.missing = list(missing)
+
+
+class InvalidFeatureError(ValueError):
+    def __init__(self, name: str, value: object) -> None:
+        super().__init__(f"Invalid value for feature {name}: {value!r}")
+        self.name = name
+
+
+def parse_feature_defaults(text: str) -> Dict[str, float]:
+    """Parse ``"f1=0.0,f2=1.5"`` into a name -> default mapping."""
+    defaults: Dict[str, float] = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        name, _, value = item.partition("=")
+        defaults[name.strip()] = float(value)
+    return defaults
+
+
+@dataclass(frozen=True, eq=False)
+class FeatureSchema:
+    """Fixed column layout of a model input: names in model order plus per-column defaults.
+
+    Columns without a default (NaN in ``defaults``) are required. A NaN or ``None``
+    feature value counts as missing: the column's default applies, or the row is
+    rejected when the column is required. Non-numeric values raise
+    :class:`InvalidFeatureError`. Rows are written into caller-provided float32 buffers, so
+    assembling a vector does no sorting and at most one allocation per request or batch.
+    """
+
+    names: Tuple[str, ...]
+    defaults: Tuple[float, ...]
+    positions: Dict[str, int] = field(init=False, repr=False)
+    required: Tuple[str, ...] = field(init=False, repr=False)
+    _default_row: np.ndarray = field(init=False, repr=False)
+    _required_positions: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "positions", {name: pos for pos, name in enumerate(self.names)})
+        pairs = zip(self.names, self.defaults, strict=True)
+        object.__setattr__(
+            self, "required", tuple(name for name, default in pairs if math.isnan(default))
+        )
+        object.__setattr__(self, "_default_row", np.asarray(self.defaults, dtype=np.float32))
+        required = np.asarray([self.positions[name] for name in self.required], dtype=np.int64)
+        object.__setattr__(self, "_required_positions", required)
+
+    @classmethod
+    def compile(
+        cls, names: Sequence[str], defaults: Optional[Mapping[str, float]] = None
+    ) -> "FeatureSchema":
+        defaults = defaults or {}
+        return cls(
+            names=tuple(names),
+            defaults=tuple(float(defaults.get(name, math.nan)) for name in names),
+        )
+
+    @classmethod
+    def from_metadata(cls, metadata: Mapping[str, str]) -> Optional["FeatureSchema"]:
+        names = [n.strip() for n in metadata.get(FEATURES_METADATA_KEY, "").split(",") if n.strip()]
+        if not names:
+            return None
+        defaults = parse_feature_defaults(metadata.get(FEATURE_DEFAULTS_METADATA_KEY, ""))
+        return cls.compile(names, defaults)
+
+    @property
+    def width(self) -> int:
+        return len(self.names)
+
+    def fill(self, features: Mapping[str, float], out: np.ndarray) -> None:
+        """Write ``features`` into the 1-D buffer ``out`` in schema order."""
+        out[:] = self._default_row
+        positions = self.positions
+        for name, value in features.items():
+            pos = positions.get(name)
+            if pos is None or value is None:
+                continue
+            try:
+                if not math.isnan(value):
+                    out[pos] = value
+            except (TypeError, ValueError) as exc:
+                raise InvalidFeatureError(name, value) from exc
+        # Required columns default to NaN, so any NaN left there is a missing feature.
+        if self.required and np.isnan(out[self._required_positions]).any():
+            raise MissingFeaturesError(self._missing(out))
+
+    def _missing(self, row: np.ndarray) -> List[str]:
+        return [name for name in self.required if math.isnan(row[self.positions[name]])]
+
+    def vector(self, features: Mapping[str, float]) -> np.ndarray:
+        out = np.empty(self.width, dtype=np.float32)
+        self.fill(features, out)
+        return out
+
+    def matrix(
+        self, rows: Sequence[Mapping[str, float]], out: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, List[Optional[str]]]:
+        """Assemble ``rows`` into one ``[N, width]`` buffer; returns per-row error messages."""
+        if out is None:
+            out = np.empty((len(rows), self.width), dtype=np.float32)
+        errors: List[Optional[str]] = [None] * len(rows)
+        for idx, features in enumerate(rows):
+            try:
+                self.fill(features, out[idx])
+            except (MissingFeaturesError, InvalidFeatureError) as exc:
+                errors[idx] = str(exc)
+        return out, errors
+
+    def project(
+        self, matrix: np.ndarray, columns: Sequence[str], out: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, List[Optional[str]]]:
+        """Reorder a ``[N, len(columns)]`` store matrix into schema order, applying defaults.
+
+        Rows are written into ``out`` when given, e.g. a slice of a request's batch buffer.
+        NaN cells count as missing. Returns per-row error messages like :meth:`matrix`.
+        """
+        if out is None:
+            out = np.empty((matrix.shape[0], self.width), dtype=np.float32)
+        out[:] = self._default_row
+        source = {name: idx for idx, name in enumerate(columns)}
+        src_idx = [source[name] for name in self.names if name in source]
+        dst_idx = [pos for pos, name in enumerate(self.names) if name in source]
+        projected = matrix[:, src_idx]
+        present = ~np.isnan(projected)
+        out[:, dst_idx] = np.where(present, projected, self._default_row[dst_idx])
+        errors: List[Optional[str]] = [None] * len(out)
+        if self.required:
+            for row in np.flatnonzero(np.isnan(out[:, self._required_positions]).any(axis=1)):
+                errors[row] = str(MissingFeaturesError(self._missing(out[row])))
+        return out, errors
+
+
+class FeatureSchemaRegistry:
+    """Compiles and caches one ``FeatureSchema`` per (model, version).
+
+    The schema comes from the ``features``/``feature_defaults`` metadata recorded at
+    registration. Versions registered without it fall back to the sorted feature names
+    of each request's sample, matching the gateway's historical behaviour. That fallback
+    is never cached, since one request's keys say nothing about the model's inputs.
+    """
+
+    def __init__(self, registry: Optional[RegistryStore] = None) -> None:
+        self.registry = registry
+        self._schemas: Dict[Tuple[str, int], FeatureSchema] = {}
+        self._unregistered: Set[Tuple[str, int]] = set()
+        self._lock = threading.Lock()
+
+    def register(self, model_name: str, version: int, schema: FeatureSchema) -> None:
+        self._schemas[(model_name, version)] = schema
+        self._unregistered.discard((model_name, version))
+
+    def get(
+        self, model_name: str, version: int, sample: Optional[Mapping[str, float]] = None
+    ) -> FeatureSchema:
+        key = (model_name, version)
+        schema = self._schemas.get(key)
+        if schema is not None:
+            return schema
+        if key not in self._unregistered:
+            with self._lock:
+                schema = self._schemas.get(key)
+                if schema is None:
+                    schema = self._from_registry(model_name, version)
+                    if schema is not None:
+                        self._schemas[key] = schema
+                    else:
+                        self._unregistered.add(key)
+                        LOG.warning(
+                            "No feature schema registered; using sorted feature names",
+                            extra={"model": model_name, "version": version},
+                        )
+            if schema is not None:
+                return schema
+        if not sample:
+            raise ValueError(f"No feature schema registered for {model_name} v{version}")
+        return FeatureSchema.compile(sorted(sample.keys()))
+
+    def _from_registry(self, model_name: str, version: int) -> Optional[FeatureSchema]:
+        if self.registry is None:
+            return None
+        for mv in self.registry.list_models(name=model_name):
+            if mv.version == version:
+                return FeatureSchema.from_metadata(mv.metadata)
+        return None
@@ -2,25 +2,58 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import time
-from typing import Dict
+from typing import Any, AsyncContextManager, Dict, List, Optional, Tuple
 
 import numpy as np
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import PlainTextResponse
 
-from mmsp.deploy.canary import DeploymentState, choose_version, load_state, save_state
+from mmsp.deploy.canary import DeploymentState, DeploymentStateWatcher, choose_version
 from mmsp.deploy.rollback import handle_alert
-from mmsp.features.feast_adapter import FeastAdapter
-from mmsp.features.lightweight_store import LightweightFeatureStore
-from mmsp.monitoring.drift import DriftMonitor
+from mmsp.features.base import FeatureMatrix, FeatureSnapshot, PollingReloader, snapshot_info
+from mmsp.features.factory import FeatureStoreType, create_feature_store
+from mmsp.monitoring.drift import (
+    DRIFT_PROFILE_METADATA_KEY,
+    BackgroundDriftScorer,
+    DriftMonitor,
+)
 from mmsp.monitoring.metrics import (
     observe_request,
     render_metrics,
     set_version_gauges,
 )
-from mmsp.serving.client import TritonHTTPClient
-from mmsp.serving.schemas import PredictRequest, PredictResponse
+from mmsp.registry.store import RegistryStore
+from mmsp.serving.admission import (
+    AdmissionController,
+    AdmissionRejected,
+    remaining_timeout,
+    within_deadline,
+)
+from mmsp.serving.backends import create_backend_router
+from mmsp.serving.batching import MicroBatcher
+from mmsp.serving.cache import PredictionCache
+from mmsp.serving.feature_client import (
+    CachingFeatureClient,
+    FeatureSource,
+    LocalFeatureSource,
+    RemoteFeatureClient,
+    ShardedFeatureClient,
+)
+from mmsp.serving.feature_schema import (
+    FeatureSchemaRegistry,
+    InvalidFeatureError,
+    MissingFeaturesError,
+)
+from mmsp.serving.schemas import (
+    BatchPredictRequest,
+    BatchPredictResponse,
+    BatchPredictResult,
+    PredictRequest,
+    PredictResponse,
+)
 from mmsp.utils.config import FeatureStoreConfig, PlatformConfig, load_platform_config
 from mmsp.utils.logging import configure_logging, get_logger
 
@@ -29,69 +62,329 @@ LOG = get_logger(__name__)
 
 app = FastAPI(title="MMSP Gateway", version="0.1.0")
 platform_cfg: PlatformConfig = load_platform_config()
-state: DeploymentState = load_state(platform_cfg.deployment_state)
-set_version_gauges(state.prod_version, state.canary_version)
+state_watcher = DeploymentStateWatcher(
+    platform_cfg.deployment_state, poll_interval_s=platform_cfg.gateway.state_poll_interval_s
+)
+state_watcher.subscribe(lambda new: set_version_gauges(new.prod_version, new.canary_version))
+set_version_gauges(state_watcher.current.prod_version, state_watcher.current.canary_version)
 
 feature_cfg: FeatureStoreConfig = platform_cfg.feature_store
+model_registry = RegistryStore(platform_cfg.artifact_path("registry", "registry.json"))
+feature_schemas = FeatureSchemaRegistry(model_registry)
+
+# The gateway opens the store itself only when it is not reading from Feature API replicas.
+sharding_cfg = feature_cfg.sharding
+feature_store: Optional[FeatureStoreType] = None
+feature_source: FeatureSource
+if sharding_cfg.replicas and sharding_cfg.num_shards > 0:
+    feature_source = ShardedFeatureClient.from_urls(
+        sharding_cfg.replicas,
+        sharding_cfg.num_shards,
+        vnodes=sharding_cfg.vnodes,
+        batch_size=platform_cfg.gateway.feature_api_batch_size,
+    )
+elif platform_cfg.gateway.feature_api_url:
+    feature_source = RemoteFeatureClient(
+        platform_cfg.gateway.feature_api_url, batch_size=platform_cfg.gateway.feature_api_batch_size
+    )
+else:
+    feature_store = create_feature_store(feature_cfg)
+    feature_source = LocalFeatureSource(feature_store)
 
-feature_store = (
-    FeastAdapter(repo_path=".") if feature_cfg.mode == "feast" else LightweightFeatureStore(
-        feature_cfg.path, feature_cfg.entity_id_column
+feature_cache_cfg = platform_cfg.gateway.feature_cache
+feature_client: FeatureSource = (
+    CachingFeatureClient(
+        feature_source, max_entries=feature_cache_cfg.max_entries, ttl_s=feature_cache_cfg.ttl_s
     )
+    if feature_cache_cfg.enabled
+    else feature_source
 )
 
+
+def _drift_baseline_path(state: DeploymentState) -> str:
+    """The prod version's linked drift profile, else the configured baseline."""
+    for mv in model_registry.list_models(name=state.model_name):
+        if mv.version == state.prod_version and DRIFT_PROFILE_METADATA_KEY in mv.metadata:
+            return mv.metadata[DRIFT_PROFILE_METADATA_KEY]
+    return platform_cfg.drift.baseline_path
+
+
 drift_monitor = DriftMonitor(
-    baseline_path=platform_cfg.drift.baseline_path,
+    baseline_path=_drift_baseline_path(state_watcher.current),
     window_size=platform_cfg.drift.window_size,
     threshold=platform_cfg.drift.threshold,
     numeric_method=platform_cfg.drift.numeric_method,
     categorical_method=platform_cfg.drift.categorical_method,
+    psi_bins=platform_cfg.drift.psi_bins,
+    window_seconds=platform_cfg.drift.window_seconds,
+    bucket_seconds=platform_cfg.drift.bucket_seconds,
+    window_mode=platform_cfg.drift.window_mode,
+    sketch_k=platform_cfg.drift.sketch_k,
     entity_id_column=feature_cfg.entity_id_column,
 )
+state_watcher.subscribe(lambda new: drift_monitor.set_baseline(_drift_baseline_path(new)))
+drift_scorer: Optional[BackgroundDriftScorer] = (
+    BackgroundDriftScorer(
+        drift_monitor,
+        queue_size=platform_cfg.drift.queue_size,
+        score_every=platform_cfg.drift.score_every,
+        score_interval_s=platform_cfg.drift.score_interval_s,
+    )
+    if platform_cfg.drift.background
+    else None
+)
+
+
+def _record_drift(features: Dict[str, float]) -> None:
+    if drift_scorer is not None:
+        drift_scorer.record(features)
+    else:
+        drift_monitor.record(features)
+
+
+inference_client = create_backend_router(platform_cfg)
+
+
+async def _infer_batch(model_name: str, version: int, matrix: np.ndarray) -> np.ndarray:
+    return await inference_client.predict_batch(model_name, version, matrix)
+
+
+batching_cfg = platform_cfg.gateway.batching
+batcher = MicroBatcher(
+    _infer_batch,
+    max_batch_size=batching_cfg.max_batch_size,
+    max_wait_us=batching_cfg.max_wait_us,
+)
+
+
+cache_cfg = platform_cfg.gateway.prediction_cache
+prediction_cache: Optional[PredictionCache] = (
+    PredictionCache(
+        max_entries=cache_cfg.max_entries, max_bytes=cache_cfg.max_bytes, ttl_s=cache_cfg.ttl_s
+    )
+    if cache_cfg.enabled
+    else None
+)
+if prediction_cache is not None:
+    state_watcher.subscribe(
+        lambda new: prediction_cache.retain_versions(
+            new.model_name, [new.prod_version, new.canary_version]
+        )
+    )
+
+
+admission_cfg = platform_cfg.gateway.admission
+admission: Optional[AdmissionController] = (
+    AdmissionController(
+        max_concurrency_per_model=admission_cfg.max_concurrency_per_model,
+        max_concurrency_per_version=admission_cfg.max_concurrency_per_version,
+        max_queue=admission_cfg.max_queue,
+    )
+    if admission_cfg.enabled
+    else None
+)
+
+
+def _request_deadline(request: Request) -> Optional[float]:
+    """Absolute monotonic deadline from the client's relative deadline header, if any."""
+    raw = request.headers.get(admission_cfg.deadline_header)
+    if raw is None:
+        return None
+    try:
+        budget_ms = float(raw)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=400, detail=f"Invalid {admission_cfg.deadline_header} header"
+        ) from exc
+    return time.monotonic() + budget_ms / 1000.0
 
-triton_client = TritonHTTPClient(platform_cfg.triton.url)
+
+def _admit(model_name: str, version: int, deadline: Optional[float]) -> AsyncContextManager[None]:
+    if admission is None:
+        return contextlib.nullcontext()
+    return admission.admit(model_name, version, deadline)
+
+
+async def _infer_one(
+    model_name: str, version: int, row: np.ndarray, deadline: Optional[float] = None
+) -> float:
+    output = prediction_cache.get(model_name, version, row) if prediction_cache else None
+    if output is None:
+        timeout = remaining_timeout(deadline)
+        if batching_cfg.enabled:
+            output = await within_deadline(batcher.submit(model_name, version, row), timeout)
+        else:
+            output = await within_deadline(
+                inference_client.predict_batch(model_name, version, row, timeout=timeout), timeout
+            )
+        if prediction_cache is not None:
+            prediction_cache.put(model_name, version, row, output)
+    return float(np.asarray(output).reshape(-1)[0])
+
+
+async def _predict_chunks(
+    model_name: str, version: int, matrix: np.ndarray, deadline: Optional[float] = None
+) -> np.ndarray:
+    """Run ``matrix`` through the backend in requests of at most the model's max batch size.
+
+    Triton rejects requests with more rows than the ``max_batch_size`` written into the
+    model config at registration, which is ``gateway.batching.max_batch_size``. With
+    ``triton.stream_batches`` and a streaming backend (gRPC), several chunks go over one
+    ``ModelStreamInfer`` call bounded by the request's remaining deadline.
+    """
+    size = max(batching_cfg.max_batch_size, 1)
+    chunks = [matrix[start : start + size] for start in range(0, len(matrix), size)]
+    if (
+        platform_cfg.triton.stream_batches
+        and len(chunks) > 1
+        and inference_client.supports_streaming(model_name)
+    ):
+        timeout = remaining_timeout(deadline)
+        streamed = await within_deadline(
+            inference_client.stream_predict(model_name, version, chunks, timeout=timeout), timeout
+        )
+        return np.concatenate(
+            [
+                np.asarray(out, dtype=np.float32).reshape(len(chunk), -1)
+                for chunk, out in zip(chunks, streamed, strict=True)
+            ]
+        )
+    parts = []
+    for chunk in chunks:
+        timeout = remaining_timeout(deadline)
+        outputs = await within_deadline(
+            inference_client.predict_batch(model_name, version, chunk, timeout=timeout), timeout
+        )
+        parts.append(np.asarray(outputs, dtype=np.float32).reshape(len(chunk), -1))
+    return np.concatenate(parts)
+
+
+async def _infer_rows(
+    model_name: str, version: int, matrix: np.ndarray, deadline: Optional[float] = None
+) -> np.ndarray:
+    """Score ``matrix`` row by row, sending only prediction-cache misses to the backend."""
+    if prediction_cache is None:
+        return (await _predict_chunks(model_name, version, matrix, deadline))[:, 0]
+    predictions = np.empty(len(matrix), dtype=np.float32)
+    misses = []
+    for idx, row in enumerate(matrix):
+        cached = prediction_cache.get(model_name, version, row)
+        if cached is None:
+            misses.append(idx)
+        else:
+            predictions[idx] = np.asarray(cached).reshape(-1)[0]
+    if misses:
+        outputs = await _predict_chunks(model_name, version, matrix[misses], deadline)
+        for offset, idx in enumerate(misses):
+            prediction_cache.put(model_name, version, matrix[idx], outputs[offset])
+            predictions[idx] = outputs[offset, 0]
+    return predictions
+
+
+def _phase(current: DeploymentState, version: int) -> str:
+    return "canary" if current.canary_version and version == current.canary_version else "prod"
+
+
+def _feature_snapshot() -> Optional[FeatureSnapshot]:
+    snapshot = getattr(feature_store, "snapshot", None)
+    return snapshot() if snapshot is not None else None
+
+
+async def _batch_features(entity_ids: List[str]) -> Tuple[FeatureMatrix, Optional[str]]:
+    """Look up a batch's features as one matrix, against a pinned snapshot when local.
+
+    Every row of the batch then sees the same table version even if a reload lands
+    mid-request; the pinned snapshot stays alive until the lookup releases it. Pinned
+    lookups skip the feature cache, whose entries may come from several versions.
+    """
+    snapshot = _feature_snapshot()
+    if snapshot is None:
+        feature_map = await feature_client.get_features(entity_ids)
+        return FeatureMatrix.from_dicts(entity_ids, feature_map), None
+    return await asyncio.to_thread(snapshot.get_matrix, entity_ids), snapshot.version
 
 
 @app.get("/healthz")
-def health() -> Dict[str, str]:
-    return {"status": "ok"}
+def health() -> Dict[str, Any]:
+    snapshot = _feature_snapshot()
+    if snapshot is None:
+        return {"status": "ok"}
+    return {"status": "ok", "feature_snapshot": snapshot_info(snapshot)}
 
 
 @app.get("/status")
 def status() -> Dict[str, object]:
-    current = load_state(platform_cfg.deployment_state)
-    return current.to_dict()
+    return state_watcher.current.to_dict()
+
+
+@app.post("/admin/deployment/reload")
+def reload_deployment_state() -> Dict[str, object]:
+    state_watcher.refresh(force=True)
+    return state_watcher.current.to_dict()
+
+
+@app.on_event("startup")
+async def startup() -> None:
+    state_watcher.start()
+    if drift_scorer is not None:
+        drift_scorer.start()
+    if isinstance(feature_store, PollingReloader):
+        feature_store.start()
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    state_watcher.stop()
+    if drift_scorer is not None:
+        drift_scorer.stop()
+    if isinstance(feature_store, PollingReloader):
+        feature_store.stop()
+    await feature_client.aclose()
+    await inference_client.aclose()
 
 
 @app.post("/predict", response_model=PredictResponse)
-def predict(body: PredictRequest) -> PredictResponse:
-    current = load_state(platform_cfg.deployment_state)
+async def predict(body: PredictRequest, request: Request) -> PredictResponse:
+    deadline = _request_deadline(request)
+    current = state_watcher.current
     version = choose_version(current)
-    phase = "canary" if current.canary_version and version == current.canary_version else "prod"
-    set_version_gauges(current.prod_version, current.canary_version)
+    phase = _phase(current, version)
 
     features = body.features
     if features is None:
-        feature_map = feature_store.get_features([body.entity_id])
+        feature_map = await feature_client.get_features([body.entity_id])
         features = feature_map.get(str(body.entity_id))
     if not features:
         observe_request(current.model_name, str(version), phase, 0.0, False)
         raise HTTPException(status_code=404, detail="Features not found")
 
-    feature_values = np.array([features[k] for k in sorted(features.keys())], dtype=np.float32)
+    try:
+        feature_values = feature_schemas.get(current.model_name, version, features).vector(features)
+    except (MissingFeaturesError, InvalidFeatureError) as exc:
+        observe_request(current.model_name, str(version), phase, 0.0, False)
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
     start = time.perf_counter()
     success = True
+    shed = False
     try:
-        outputs = triton_client.predict(current.model_name, version, feature_values)
-        prediction = float(outputs[0])
+        async with _admit(current.model_name, version, deadline):
+            prediction = await _infer_one(current.model_name, version, feature_values, deadline)
+    except AdmissionRejected as exc:
+        shed = True
+        raise HTTPException(status_code=exc.status_code, detail=exc.reason) from exc
+    except asyncio.TimeoutError as exc:
+        success = False
+        LOG.error("Prediction timed out", extra={"version": version})
+        raise HTTPException(status_code=504, detail="Deadline exceeded") from exc
     except Exception as exc:
         success = False
         LOG.error("Prediction failed", extra={"error": str(exc)})
         raise HTTPException(status_code=502, detail="Prediction failed") from exc
     finally:
         latency = time.perf_counter() - start
-        observe_request(current.model_name, str(version), phase, latency, success)
-        drift_monitor.record(features)
+        if not shed:
+            observe_request(current.model_name, str(version), phase, latency, success)
+            _record_drift(features)
     return PredictResponse(
         prediction=prediction,
         model_name=current.model_name,
@@ -102,6 +395,110 @@ def predict(body: PredictRequest) -> PredictResponse:
     )
 
 
+@app.post("/predict/batch", response_model=BatchPredictResponse)
+async def predict_batch(body: BatchPredictRequest, request: Request) -> BatchPredictResponse:
+    deadline = _request_deadline(request)
+    batch_start = time.perf_counter()
+    current = state_watcher.current
+
+    items: List[Tuple[str, Optional[Dict[str, float]]]] = [(eid, None) for eid in body.entity_ids]
+    items.extend((row.entity_id, row.features) for row in body.rows)
+    if not items:
+        raise HTTPException(status_code=400, detail="No entity_ids or rows provided")
+
+    lookup_ids = list(dict.fromkeys(eid for eid, features in items if features is None))
+    store_batch = FeatureMatrix.from_dicts([], {})
+    snapshot_version: Optional[str] = None
+    if lookup_ids:
+        store_batch, snapshot_version = await _batch_features(lookup_ids)
+    store_rows = {
+        eid: row
+        for row, (eid, hit) in enumerate(
+            zip(store_batch.entity_ids, store_batch.found.tolist(), strict=True)
+        )
+        if hit
+    }
+
+    def row_features(idx: int) -> Dict[str, float]:
+        eid, features = items[idx]
+        if features is not None:
+            return features
+        values = store_batch.values[store_rows[str(eid)]].tolist()
+        return dict(zip(store_batch.columns, values, strict=True))
+
+    results = [BatchPredictResult(entity_id=eid) for eid, _ in items]
+    by_version: Dict[int, List[int]] = {}
+    for idx, (eid, features) in enumerate(items):
+        found = str(eid) in store_rows if features is None else bool(features)
+        if not found:
+            results[idx].error = "Features not found"
+            observe_request(current.model_name, str(current.prod_version), "prod", 0.0, False)
+        else:
+            by_version.setdefault(choose_version(current), []).append(idx)
+
+    for version, group in by_version.items():
+        phase = _phase(current, version)
+        # Store rows go first so they fill a contiguous slice of the batch buffer.
+        lookups = [idx for idx in group if items[idx][1] is None]
+        inline = [idx for idx in group if items[idx][1] is not None]
+        indices = lookups + inline
+        sample = items[inline[0]][1] if inline else dict.fromkeys(store_batch.columns, 0.0)
+        schema = feature_schemas.get(current.model_name, version, sample)
+        matrix = np.empty((len(indices), schema.width), dtype=np.float32)
+        rows = [store_rows[str(items[idx][0])] for idx in lookups]
+        _, errors = schema.project(
+            store_batch.values[rows], store_batch.columns, out=matrix[: len(lookups)]
+        )
+        inline_rows = [items[idx][1] or {} for idx in inline]
+        errors.extend(schema.matrix(inline_rows, out=matrix[len(lookups) :])[1])
+        for idx, error in zip(indices, errors, strict=True):
+            if error is not None:
+                results[idx].error = error
+                observe_request(current.model_name, str(version), phase, 0.0, False)
+        positions = [pos for pos, error in enumerate(errors) if error is None]
+        if not positions:
+            continue
+        start = time.perf_counter()
+        predictions = None
+        shed = False
+        try:
+            async with _admit(current.model_name, version, deadline):
+                predictions = await _infer_rows(
+                    current.model_name, version, matrix[positions], deadline
+                )
+            error = None
+        except AdmissionRejected as exc:
+            shed = True
+            error = f"Rejected: {exc.reason}"
+        except asyncio.TimeoutError:
+            error = "Deadline exceeded"
+        except Exception as exc:
+            LOG.error("Batch prediction failed", extra={"error": str(exc), "version": version})
+            error = "Prediction failed"
+        latency = time.perf_counter() - start
+        for offset, pos in enumerate(positions):
+            idx = indices[pos]
+            result = results[idx]
+            result.model_version = version
+            result.phase = phase
+            if predictions is None:
+                result.error = error
+            else:
+                result.prediction = float(predictions[offset])
+            if not shed:
+                observe_request(
+                    current.model_name, str(version), phase, latency, predictions is not None
+                )
+                _record_drift(row_features(idx))
+
+    return BatchPredictResponse(
+        model_name=current.model_name,
+        latency_ms=(time.perf_counter() - batch_start) * 1000.0,
+        results=results,
+        feature_snapshot=snapshot_version,
+    )
+
+
 @app.get("/metrics")
 def metrics() -> PlainTextResponse:
     data, content_type = render_metrics()
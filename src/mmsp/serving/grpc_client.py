@@ -0,0 +1,140 @@
+"""gRPC client for Triton Inference Server (KServe v2 GRPCInferenceService)."""
+
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from mmsp.serving.client import V2_DTYPES
+from mmsp.utils.logging import get_logger
+
+LOG = get_logger(__name__)
+
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+
+class TritonGRPCClient:
+    """Async Triton client that keeps one persistent gRPC channel and sends raw tensor bytes.
+
+    Exposes the same ``predict``/``predict_batch``/``aclose`` surface as
+    :class:`mmsp.serving.client.AsyncTritonHTTPClient`. The channel is opened lazily on
+    first use so it is bound to the event loop that serves requests.
+    """
+
+    def __init__(self, url: str, timeout_s: float = 5.0) -> None:
+        try:
+            import grpc  # type: ignore
+            from tritonclient.grpc import service_pb2, service_pb2_grpc  # type: ignore
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError(
+                "tritonclient[grpc] not installed. Install it to enable triton.protocol=grpc."
+            ) from exc
+        self.url = url
+        self.timeout_s = timeout_s
+        self._grpc = grpc
+        self._pb2 = service_pb2
+        self._pb2_grpc = service_pb2_grpc
+        self._channel: Any = None
+        self._stub: Any = None
+
+    def _get_stub(self) -> Any:
+        if self._stub is None:
+            options = [
+                ("grpc.max_send_message_length", MAX_MESSAGE_BYTES),
+                ("grpc.max_receive_message_length", MAX_MESSAGE_BYTES),
+                ("grpc.keepalive_time_ms", 30_000),
+            ]
+            self._channel = self._grpc.aio.insecure_channel(self.url, options=options)
+            self._stub = self._pb2_grpc.GRPCInferenceServiceStub(self._channel)
+        return self._stub
+
+    def _build_request(
+        self, model_name: str, model_version: int, matrix: np.ndarray, request_id: str = ""
+    ) -> Any:
+        tensor = np.ascontiguousarray(matrix, dtype="<f4")
+        if tensor.ndim == 1:
+            tensor = np.expand_dims(tensor, axis=0)
+        request = self._pb2.ModelInferRequest(
+            model_name=model_name, model_version=str(model_version), id=request_id
+        )
+        infer_input = request.inputs.add()
+        infer_input.name = "input"
+        infer_input.datatype = "FP32"
+        infer_input.shape.extend(tensor.shape)
+        request.outputs.add().name = "output"
+        request.raw_input_contents.append(tensor.tobytes())
+        return request
+
+    @staticmethod
+    def _decode_response(response: Any) -> np.ndarray:
+        if not response.outputs:
+            raise RuntimeError("No outputs from Triton response")
+        output = response.outputs[0]
+        shape = list(output.shape)
+        if response.raw_output_contents:
+            dtype = V2_DTYPES[output.datatype]
+            return np.frombuffer(response.raw_output_contents[0], dtype=dtype).reshape(shape)
+        return np.asarray(output.contents.fp32_contents, dtype=np.float32).reshape(shape)
+
+    async def predict(self, model_name: str, model_version: int, array: np.ndarray) -> List[float]:
+        outputs = await self.predict_batch(model_name, model_version, array)
+        return outputs.reshape(-1).tolist()
+
+    async def predict_batch(
+        self,
+        model_name: str,
+        model_version: int,
+        matrix: np.ndarray,
+        timeout: Optional[float] = None,
+    ) -> np.ndarray:
+        request = self._build_request(model_name, model_version, matrix)
+        response = await self._get_stub().ModelInfer(
+            request, timeout=timeout if timeout is not None else self.timeout_s
+        )
+        return self._decode_response(response)
+
+    async def stream_predict(
+        self,
+        model_name: str,
+        model_version: int,
+        matrices: Sequence[np.ndarray],
+        timeout: Optional[float] = None,
+    ) -> List[np.ndarray]:
+        """Send several batches over one bidirectional ``ModelStreamInfer`` call.
+
+        Results are returned in the order of ``matrices``; responses are matched back to
+        their request by id so the server may answer out of order. ``timeout`` bounds the
+        whole stream, like the deadline of a :meth:`predict_batch` call.
+        """
+        requests = [
+            self._build_request(model_name, model_version, matrix, request_id=str(idx))
+            for idx, matrix in enumerate(matrices)
+        ]
+
+        async def request_iter() -> AsyncIterator[Any]:
+            for request in requests:
+                yield request
+
+        results: Dict[int, np.ndarray] = {}
+        call = self._get_stub().ModelStreamInfer(
+            request_iter(), timeout=timeout if timeout is not None else self.timeout_s
+        )
+        async for message in call:
+            if message.error_message:
+                call.cancel()
+                raise RuntimeError(f"Triton stream error: {message.error_message}")
+            response = message.infer_response
+            results[int(response.id)] = self._decode_response(response)
+            if len(results) == len(requests):
+                break
+        missing = [idx for idx in range(len(requests)) if idx not in results]
+        if missing:
+            raise RuntimeError(f"Triton stream ended without responses for requests {missing}")
+        return [results[idx] for idx in range(len(requests))]
+
+    async def aclose(self) -> None:
+        if self._channel is not None:
+            await self._channel.close()
+            self._channel = None
+            self._stub = None
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -21,3 +21,37 @@ class PredictResponse(BaseModel):
     phase: str
     latency_ms: float
     features: Dict[str, float]
+
+
+# Upper bound on each list of a batch request; larger jobs should be split by the caller.
+MAX_BATCH_ITEMS = 1024
+
+
+class BatchPredictRequest(BaseModel):
+    entity_ids: List[str] = Field(
+        default_factory=list,
+        max_length=MAX_BATCH_ITEMS,
+        description="Entities whose features are pulled from the store",
+    )
+    rows: List[PredictRequest] = Field(
+        default_factory=list,
+        max_length=MAX_BATCH_ITEMS,
+        description="Rows with optional inline features",
+    )
+
+
+class BatchPredictResult(BaseModel):
+    entity_id: str
+    prediction: Optional[float] = None
+    model_version: Optional[int] = None
+    phase: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BatchPredictResponse(BaseModel):
+    model_name: str
+    latency_ms: float
+    results: List[BatchPredictResult]
+    feature_snapshot: Optional[str] = Field(
+        None, description="Feature snapshot version the batch's lookups were pinned to"
+    )
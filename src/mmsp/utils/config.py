@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import yaml
 from pydantic import BaseModel, Field
@@ -16,18 +16,94 @@ from mmsp.utils.time import current_run_id
 class TritonConfig(BaseModel):
     url: str
     grpc_url: str
+    protocol: str = "http"
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    timeout_s: float = 5.0
+    binary_data: bool = True
+    stream_batches: bool = False
+
+
+class OnnxRuntimeConfig(BaseModel):
+    intra_op_num_threads: int = 1
+    inter_op_num_threads: int = 1
+    max_concurrency: int = 4
+
+
+class BatchingConfig(BaseModel):
+    enabled: bool = False
+    max_batch_size: int = 32
+    max_wait_us: int = 500
+
+
+class PredictionCacheConfig(BaseModel):
+    enabled: bool = False
+    max_entries: int = 10_000
+    max_bytes: int = 64 * 1024 * 1024
+    ttl_s: float = 300.0
+
+
+class AdmissionConfig(BaseModel):
+    enabled: bool = False
+    max_concurrency_per_model: int = 256
+    max_concurrency_per_version: int = 64
+    max_queue: int = 256
+    deadline_header: str = "x-request-deadline-ms"
+
+
+class FeatureCacheConfig(BaseModel):
+    enabled: bool = False
+    max_entries: int = 100_000
+    ttl_s: float = 30.0
 
 
 class GatewayConfig(BaseModel):
     host: str = "0.0.0.0"
     port: int = 8000
     canary_default_weight: int = 10
+    state_poll_interval_s: float = 1.0
+    admin_url: Optional[str] = None
+    default_backend: str = "triton"
+    model_backends: Dict[str, str] = Field(default_factory=dict)
+    batching: BatchingConfig = Field(default_factory=BatchingConfig)
+    prediction_cache: PredictionCacheConfig = Field(default_factory=PredictionCacheConfig)
+    admission: AdmissionConfig = Field(default_factory=AdmissionConfig)
+    feature_api_url: Optional[str] = None
+    feature_api_batch_size: int = 256
+    feature_cache: FeatureCacheConfig = Field(default_factory=FeatureCacheConfig)
+
+
+class FeatureShardingConfig(BaseModel):
+    num_shards: int = 0
+    replicas: List[str] = Field(default_factory=list)
+    replica: Optional[str] = None
+    vnodes: int = 128
+
+
+class FeastConfig(BaseModel):
+    repo_path: str = "."
+    features: List[str] = Field(default_factory=list)
+    feature_service: Optional[str] = None
+    entity_key: str = "entity_id"
+    entity_id_type: str = "int64"
+    batch_size: int = 500
+    max_concurrency: int = 8
+
+
+class EmbeddedStoreConfig(BaseModel):
+    mmap_size_mb: int = 256
+    cache_size_mb: int = 64
 
 
 class FeatureStoreConfig(BaseModel):
     mode: str = "lightweight"
     path: str
     entity_id_column: str = "entity_id"
+    reload_interval_s: float = 5.0
+    compact_after_segments: int = 16
+    sharding: FeatureShardingConfig = Field(default_factory=FeatureShardingConfig)
+    feast: FeastConfig = Field(default_factory=FeastConfig)
+    embedded: EmbeddedStoreConfig = Field(default_factory=EmbeddedStoreConfig)
 
 
 class DriftConfig(BaseModel):
@@ -36,6 +112,17 @@ class DriftConfig(BaseModel):
     threshold: float = 0.3
     numeric_method: str = "ks"
     categorical_method: str = "psi"
+    psi_bins: int = 10
+    background: bool = True
+    queue_size: int = 10_000
+    score_every: int = 100
+    score_interval_s: float = 5.0
+    window_seconds: Optional[float] = None
+    bucket_seconds: float = 60.0
+    window_mode: str = "sliding"
+    sketch_k: int = 200
+    profile_max_values: int = 10_000
+    profile_quantiles: int = 101
 
 
 class PlatformConfig(BaseModel):
@@ -45,6 +132,7 @@ class PlatformConfig(BaseModel):
     deployment_state: str = "artifacts/deployments/state.yaml"
     prometheus_url: str = "http://localhost:9090"
     triton: TritonConfig
+    onnxruntime: OnnxRuntimeConfig = Field(default_factory=OnnxRuntimeConfig)
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
     feature_store: FeatureStoreConfig
     drift: DriftConfig
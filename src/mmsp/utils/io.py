@@ -4,14 +4,19 @@ from __future__ import annotations
 
 import json
 import os
+import shutil
+import time
 from pathlib import Path
 from typing import Any, Dict
 
+CURRENT_FILE = "CURRENT"
+VERSIONS_DIR = "versions"
+
 
 def atomic_write_json(path: str | Path, data: Dict[str, Any]) -> None:
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
     with open(tmp_path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2)
     os.replace(tmp_path, path)
@@ -20,7 +25,37 @@ def atomic_write_json(path: str | Path, data: Dict[str, Any]) -> None:
 def atomic_write_text(path: str | Path, text: str) -> None:
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
     with open(tmp_path, "w", encoding="utf-8") as f:
         f.write(text)
     os.replace(tmp_path, path)
+
+
+def publish_versioned_dir(staged: str | Path, root: str | Path, keep: int = 2) -> Path:
+    """Publish the directory ``staged`` as the current version of ``root``.
+
+    ``staged`` is renamed to ``root/versions/v<ns>``, then ``root/CURRENT`` is replaced
+    with the new name in one rename. Readers that go through :func:`resolve_versioned_dir`
+    therefore always find a complete version. All but the newest ``keep`` versions are
+    removed; ``staged`` must be on the same filesystem as ``root``.
+    """
+    staged, root = Path(staged), Path(root)
+    versions = root / VERSIONS_DIR
+    versions.mkdir(parents=True, exist_ok=True)
+    name = f"v{time.time_ns()}"
+    os.replace(staged, versions / name)
+    atomic_write_text(root / CURRENT_FILE, name)
+    names = sorted(p.name for p in versions.iterdir() if p.is_dir() and p.name != name)
+    for old in names[: max(len(names) - keep + 1, 0)]:
+        shutil.rmtree(versions / old, ignore_errors=True)
+    return versions / name
+
+
+def resolve_versioned_dir(root: str | Path) -> Path:
+    """The version ``root/CURRENT`` points at, or ``root`` itself if none was published."""
+    root = Path(root)
+    try:
+        name = (root / CURRENT_FILE).read_text().strip()
+    except (FileNotFoundError, NotADirectoryError):
+        return root
+    return root / VERSIONS_DIR / name if name else root
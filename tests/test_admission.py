@@ -0,0 +1,37 @@
+import asyncio
+import time
+
+import pytest
+
+from mmsp.serving.admission import AdmissionController, AdmissionRejected
+
+
+def test_admission_queues_sheds_and_drops_expired() -> None:
+    async def run() -> None:
+        controller = AdmissionController(max_concurrency_per_version=1, max_queue=1)
+        release = asyncio.Event()
+
+        async def hold() -> None:
+            async with controller.admit("m", 1):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(
+            controller.admit("m", 1, deadline=time.monotonic() + 0.01).__aenter__()
+        )
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as full:
+            async with controller.admit("m", 1):
+                pass
+        assert full.value.status_code == 429
+        with pytest.raises(AdmissionRejected) as expired:
+            await queued
+        assert expired.value.reason == "deadline_expired"
+        release.set()
+        await holder
+        async with controller.admit("m", 1):
+            pass
+        assert controller._limiters[("m", "1")].inflight == 0
+
+    asyncio.run(run())
@@ -0,0 +1,36 @@
+import asyncio
+from typing import List
+
+import numpy as np
+
+from mmsp.deploy.triton_repo import generate_config_pbtxt
+from mmsp.serving.batching import MicroBatcher
+
+
+def test_micro_batcher_fans_out_rows() -> None:
+    calls: List[int] = []
+
+    async def infer(model_name: str, version: int, matrix: np.ndarray) -> np.ndarray:
+        calls.append(matrix.shape[0])
+        return matrix.sum(axis=1, keepdims=True)
+
+    async def run() -> List[np.ndarray]:
+        batcher = MicroBatcher(infer, max_batch_size=4, max_wait_us=1000)
+        rows = [np.full(3, i, dtype=np.float32) for i in range(5)]
+        return await asyncio.gather(*(batcher.submit("m", 1, row) for row in rows))
+
+    results = asyncio.run(run())
+    assert calls == [4, 1]
+    assert [float(r[0]) for r in results] == [0.0, 3.0, 6.0, 9.0, 12.0]
+
+
+def test_config_pbtxt_batching() -> None:
+    text = generate_config_pbtxt(
+        "m",
+        [{"name": "input", "dims": [4], "dtype": "TYPE_FP32"}],
+        [{"name": "output", "dims": [1], "dtype": "TYPE_FP32"}],
+        max_batch=32,
+        max_queue_delay_us=100,
+    )
+    assert "max_batch_size: 32" in text
+    assert "max_queue_delay_microseconds: 100" in text
@@ -1,4 +1,6 @@
-from mmsp.deploy.canary import DeploymentState, choose_version
+import yaml
+
+from mmsp.deploy.canary import DeploymentState, DeploymentStateWatcher, choose_version, start_canary
 
 
 def test_choose_version_canary_wins() -> None:
@@ -9,3 +11,20 @@ def test_choose_version_canary_wins() -> None:
 def test_choose_version_prod_when_zero_weight() -> None:
     state = DeploymentState(model_name="m", prod_version=1, canary_version=2, canary_weight=0)
     assert choose_version(state) == 1
+
+
+def test_state_watcher_tracks_saves_and_external_writes(tmp_path) -> None:
+    path = tmp_path / "state.yaml"
+    watcher = DeploymentStateWatcher(path, poll_interval_s=60)
+    seen = []
+    watcher.subscribe(seen.append)
+    try:
+        start_canary(path, "m", canary_version=2, weight=20)
+        assert watcher.current.canary_version == 2
+        path.write_text(yaml.safe_dump({"model_name": "m", "prod_version": 3}))
+        assert watcher.refresh()
+        assert watcher.current.prod_version == 3
+        assert not watcher.refresh()
+        assert [s.canary_version for s in seen] == [2, None]
+    finally:
+        watcher.stop()
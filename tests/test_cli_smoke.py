@@ -12,3 +12,23 @@ def test_status_smoke(monkeypatch) -> None:
     result = runner.invoke(cli.app, ["status"])
     assert result.exit_code == 0
     assert "prod_version" in result.stdout
+
+
+def test_register_writes_batching_config(monkeypatch, tmp_path) -> None:
+    model = tmp_path / "model.onnx"
+    model.write_bytes(b"dummy")
+    monkeypatch.setattr(cli, "registry", cli.RegistryStore(tmp_path / "registry.json"))
+    monkeypatch.setattr(cli.platform_cfg, "model_repository", str(tmp_path / "repo"))
+    batching = cli.platform_cfg.gateway.batching
+    monkeypatch.setattr(batching, "enabled", True)
+    args = ["register", "--model-path", str(model), "--name", "m"]
+    assert runner.invoke(cli.app, args).exit_code == 0
+    config = (tmp_path / "repo" / "m" / "config.pbtxt").read_text()
+    assert f"max_batch_size: {batching.max_batch_size}" in config
+    assert f"max_queue_delay_microseconds: {batching.max_wait_us}" in config
+
+    monkeypatch.setattr(batching, "enabled", False)
+    assert runner.invoke(cli.app, args).exit_code == 0
+    config = (tmp_path / "repo" / "m" / "config.pbtxt").read_text()
+    assert "max_batch_size: 0" in config and "dynamic_batching" not in config
+    assert "dims: [ -1, 4 ]" in config
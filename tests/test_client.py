@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+import httpx
+import numpy as np
+
+from mmsp.serving.client import INFERENCE_HEADER_LENGTH, AsyncTritonHTTPClient
+
+
+def _fake_triton(request: httpx.Request) -> httpx.Response:
+    body = request.read()
+    header_length = request.headers.get(INFERENCE_HEADER_LENGTH)
+    if header_length is None:
+        tensor = json.loads(body)["inputs"][0]
+        rows = np.asarray(tensor["data"], dtype=np.float32).reshape(tensor["shape"])
+        sums = rows.sum(axis=1)
+        return httpx.Response(
+            200,
+            json={"outputs": [{"name": "output", "shape": [len(sums), 1], "data": sums.tolist()}]},
+        )
+    offset = int(header_length)
+    tensor = json.loads(body[:offset])["inputs"][0]
+    rows = np.frombuffer(body, dtype="<f4", offset=offset).reshape(tensor["shape"])
+    sums = rows.sum(axis=1).astype("<f4")
+    header = json.dumps(
+        {
+            "outputs": [
+                {
+                    "name": "output",
+                    "datatype": "FP32",
+                    "shape": [len(sums), 1],
+                    "parameters": {"binary_data_size": sums.nbytes},
+                }
+            ]
+        }
+    ).encode()
+    return httpx.Response(
+        200, content=header + sums.tobytes(), headers={INFERENCE_HEADER_LENGTH: str(len(header))}
+    )
+
+
+def _predict(binary_data: bool) -> np.ndarray:
+    async def run() -> np.ndarray:
+        client = AsyncTritonHTTPClient(
+            "http://triton", binary_data=binary_data, transport=httpx.MockTransport(_fake_triton)
+        )
+        try:
+            matrix = np.arange(12, dtype=np.float32).reshape(3, 4)
+            return await client.predict_batch("m", 1, matrix)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_async_client_binary_tensors() -> None:
+    outputs = _predict(binary_data=True)
+    assert outputs.shape == (3, 1)
+    assert outputs[:, 0].tolist() == [6.0, 22.0, 38.0]
+
+
+def test_async_client_json_fallback() -> None:
+    outputs = _predict(binary_data=False)
+    assert outputs[:, 0].tolist() == [6.0, 22.0, 38.0]
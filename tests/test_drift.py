@@ -1,8 +1,27 @@
+import time
+from collections import deque
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+from scipy import stats
 
-from mmsp.monitoring.drift import DriftMonitor, ks_statistic, psi
+from mmsp.monitoring.drift import (
+    BackgroundDriftScorer,
+    DriftMonitor,
+    KLLSketch,
+    PSITracker,
+    SortedWindow,
+    build_baseline_profile,
+    downsample_sorted,
+    ks_sorted,
+    ks_statistic,
+    ks_weighted,
+    load_baseline_profile,
+    prepare_baseline,
+    psi,
+)
+from mmsp.monitoring.metrics import FEATURE_DRIFT
 
 
 def test_ks_and_psi() -> None:
@@ -19,3 +38,162 @@ def test_drift_monitor(tmp_path: Path) -> None:
     monitor = DriftMonitor(str(baseline), window_size=3, threshold=0.05)
     score = monitor.record({"f1": 0.9})["f1"]
     assert score > 0.05
+
+
+def test_sorted_window_matches_a_deque() -> None:
+    rng = np.random.default_rng(0)
+    window = SortedWindow(5)
+    reference: deque = deque(maxlen=5)
+    for value in rng.integers(0, 4, size=50).astype(float):
+        window.append(value)
+        reference.append(value)
+        assert window.sorted_values().tolist() == sorted(reference)
+
+
+def test_ks_sorted_matches_scipy() -> None:
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        base = np.sort(rng.integers(0, 10, size=rng.integers(1, 300)).astype(float))
+        observed = np.sort(rng.normal(5, 3, size=rng.integers(1, 50)).round())
+        expected = stats.ks_2samp(base, observed).statistic
+        assert np.isclose(ks_sorted(base, observed), expected)
+
+
+def test_psi_tracker_matches_psi_over_the_window() -> None:
+    rng = np.random.default_rng(2)
+    base = rng.normal(0, 1, size=500)
+    column = prepare_baseline(pd.DataFrame({"f1": base}))["f1"]
+    tracker = PSITracker(column.psi_edges, column.psi_expected)
+    window: deque = deque(maxlen=50)
+    for value in rng.normal(0.5, 1.5, size=200).tolist() + [float(column.psi_edges[-1])]:
+        if len(window) == window.maxlen:
+            tracker.remove(window[0])
+        window.append(value)
+        tracker.add(value)
+        assert np.isclose(tracker.score(), psi(base.tolist(), list(window)))
+
+
+def test_background_scorer_enqueues_and_counts_drops(tmp_path: Path) -> None:
+    baseline = tmp_path / "baseline.parquet"
+    pd.DataFrame({"f1": np.linspace(0, 1, 100)}).to_parquet(baseline)
+    monitor = DriftMonitor(str(baseline), window_size=10, threshold=0.5)
+    scorer = BackgroundDriftScorer(monitor, queue_size=5, score_every=2, score_interval_s=0.05)
+    for _ in range(8):
+        scorer.record({"f1": 5.0})
+    assert scorer.dropped == 3
+    assert monitor.recent == {}  # nothing is scored on the caller's thread
+
+    scorer.start()
+    deadline = time.monotonic() + 5
+    while len(monitor.recent.get("f1", ())) < 5 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    scorer.stop()
+    assert len(monitor.recent["f1"]) == 5
+    assert monitor.score()["f1"] == 1.0
+
+
+
+def test_background_scorer_expires_time_windows_without_traffic(tmp_path: Path) -> None:
+    baseline = tmp_path / "baseline.parquet"
+    pd.DataFrame({"idle_f1": np.linspace(0, 1, 100)}).to_parquet(baseline)
+    now = [0.0]
+    monitor = DriftMonitor(
+        str(baseline), window_seconds=10.0, bucket_seconds=1.0, clock=lambda: now[0]
+    )
+    monitor.observe({"idle_f1": 5.0}, now=0.0)
+    assert monitor.score()["idle_f1"] == 1.0
+
+    now[0] = 100.0
+    scorer = BackgroundDriftScorer(monitor, score_interval_s=0.05)
+    scorer.start()
+    deadline = time.monotonic() + 5
+    while FEATURE_DRIFT.labels(feature="idle_f1")._value.get() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    scorer.stop()
+    assert FEATURE_DRIFT.labels(feature="idle_f1")._value.get() == 0.0
+
+def test_kll_sketch_bounds_memory_and_approximates_ks() -> None:
+    rng = np.random.default_rng(3)
+    base = np.sort(rng.normal(0, 1, size=5000))
+    observed = rng.normal(0.3, 1, size=100_000)
+    halves = [KLLSketch(k=200, seed=0), KLLSketch(k=200, seed=1)]
+    for idx, value in enumerate(observed.tolist()):
+        halves[idx % 2].add(value)
+    sketch = KLLSketch(k=200, seed=2)
+    for half in halves:
+        sketch.merge(half)
+    assert sketch.count() == len(observed)
+    assert sketch.size < 1000
+    assert abs(sketch.quantile(0.5) - np.median(observed)) < 0.05
+    exact = ks_sorted(base, np.sort(observed))
+    assert abs(ks_weighted(base, *sketch.weighted_items()) - exact) < 0.02
+    unit = np.sort(observed[:500])
+    assert np.isclose(ks_weighted(base, unit, np.ones(len(unit))), ks_sorted(base, unit))
+
+
+def test_time_bucketed_windows_expire_old_buckets(tmp_path: Path) -> None:
+    baseline = tmp_path / "baseline.parquet"
+    pd.DataFrame({"f1": np.linspace(0, 1, 200)}).to_parquet(baseline)
+    for method in ("ks", "psi"):
+        monitor = DriftMonitor(
+            str(baseline),
+            numeric_method=method,
+            window_seconds=60.0,
+            bucket_seconds=10.0,
+            clock=lambda: 0.0,
+        )
+        for second in range(60):
+            monitor.observe({"f1": 1.0}, now=float(second))
+        assert monitor.score(now=59.0)["f1"] > 0.9
+        for second in range(60, 120):
+            monitor.observe({"f1": (second % 60) / 60.0}, now=float(second))
+        # Six full buckets plus the one straddling the start of the window.
+        assert len(monitor.time_windows["f1"].buckets) == 7
+        assert monitor.score(now=119.0)["f1"] < 0.2
+        assert monitor.score(now=500.0)["f1"] == 0.0
+
+
+def test_baseline_profile_is_compact_and_mapped(tmp_path: Path) -> None:
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame(
+        {
+            "entity_id": np.arange(5000),
+            "f1": rng.normal(size=5000),
+            "segment": rng.choice(["1", "2", "3"], size=5000),
+        }
+    )
+    df.to_parquet(tmp_path / "train.parquet", index=False)
+    out = build_baseline_profile(
+        str(tmp_path / "train.parquet"), str(tmp_path / "profile"), psi_bins=5, max_values=500
+    )
+    profile = load_baseline_profile(out)
+    full = prepare_baseline(df, psi_bins=5)
+    assert set(profile) == {"f1", "segment"}
+    assert isinstance(profile["f1"].values, np.memmap)
+    assert len(profile["f1"].values) == 500
+    assert profile["f1"].numeric and not profile["segment"].numeric
+    assert np.allclose(profile["f1"].psi_expected, full["f1"].psi_expected)
+    observed = np.sort(rng.normal(0.5, size=300))
+    exact = ks_sorted(full["f1"].values, observed)
+    assert abs(ks_sorted(profile["f1"].values, observed) - exact) < 2 / 500
+
+    sampled = downsample_sorted(full["f1"].values, 500)
+    assert sampled[0] == full["f1"].values[0] and sampled[-1] == full["f1"].values[-1]
+
+    monitor = DriftMonitor(str(out), window_size=10)
+    monitor.record({"f1": 0.1, "segment": 2.0})
+    assert monitor.set_baseline(str(tmp_path / "train.parquet"))
+    assert not monitor.recent and not monitor.psi_windows
+    assert not monitor.set_baseline(str(tmp_path / "train.parquet"))
+
+    assert monitor.set_baseline(str(out))
+    rebuilt = build_baseline_profile(
+        str(tmp_path / "train.parquet"), str(out), psi_bins=5, max_values=100
+    )
+    assert len(load_baseline_profile(rebuilt)["f1"].values) == 100
+    # A profile rebuilt in place is a new baseline; the superseded one is kept for readers.
+    assert monitor.set_baseline(str(out))
+    assert len(monitor.baseline["f1"].values) == 100
+    assert not monitor.set_baseline(str(out))
+    assert len(list((out / "versions").iterdir())) == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["profile", "train.parquet"]
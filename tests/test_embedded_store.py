@@ -0,0 +1,59 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mmsp.features.embedded_store import LOOKUP_CHUNK, EmbeddedFeatureStore
+
+
+def test_bulk_load_multi_get_and_upsert(tmp_path):
+    src = tmp_path / "features.parquet"
+    rows = LOOKUP_CHUNK * 2 + 10
+    pd.DataFrame(
+        {"entity_id": np.arange(rows), "f1": np.arange(rows) * 1.0, "f2": np.arange(rows) * 0.5}
+    ).to_parquet(src)
+    store = EmbeddedFeatureStore(str(tmp_path / "store.sqlite"))
+    assert store.load_from_parquet(str(src), batch_rows=300) == rows
+    assert len(store) == rows and store.columns == ["f1", "f2"]
+
+    ids = [str(i) for i in range(rows - 1, -1, -1)] + ["missing", "3"]
+    batch = store.get_matrix(ids)
+    assert batch.values.dtype == np.float32
+    assert batch.found.tolist() == [True] * rows + [False, True]
+    assert np.allclose(batch.values[:rows, 0], np.arange(rows - 1, -1, -1))
+    assert np.isnan(batch.values[rows]).all()
+
+    store.upsert([{"entity_id": 3, "f1": 30.0}, {"entity_id": "new", "f1": 1.0, "f2": 2.0}])
+    features = store.get_features(["3", "new"])
+    assert features["new"] == {"f1": 1.0, "f2": 2.0}
+    assert features["3"] == {"f1": 30.0, "f2": 1.5}
+    store.upsert([{"entity_id": "partial", "f2": 4.0}])
+    assert store.get_features(["partial"]) == {"partial": {"f2": 4.0}}
+    with pytest.raises(ValueError):
+        store.upsert([{"entity_id": 1, "f9": 1.0}])
+
+    # Another connection (as in another worker process) sees committed writes.
+    other = EmbeddedFeatureStore(str(tmp_path / "store.sqlite"))
+    assert other.get_features(["new"])["new"] == features["new"] and len(other) == rows + 2
+    other.close()
+    store.close()
+
+
+def test_lookups_from_many_threads(tmp_path):
+    store = EmbeddedFeatureStore(str(tmp_path / "store.sqlite"))
+    store.upsert([{"entity_id": i, "f1": float(i)} for i in range(100)])
+    errors = []
+
+    def lookup(offset: int) -> None:
+        batch = store.get_matrix([str(i) for i in range(offset, 100, 7)])
+        if not np.allclose(batch.values[:, 0], np.arange(offset, 100, 7)):
+            errors.append(offset)
+
+    threads = [threading.Thread(target=lookup, args=(i,)) for i in range(7)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.close()
+    assert errors == []
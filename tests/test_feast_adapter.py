@@ -0,0 +1,76 @@
+import threading
+
+import numpy as np
+import pytest
+
+from mmsp.features.feast_adapter import FeastAdapter
+
+
+class _OnlineResponse:
+    def __init__(self, columns):
+        self.columns = columns
+
+    def to_dict(self):
+        return self.columns
+
+
+class _FakeFeastStore:
+    """Answers like Feast's online store: one list per column, None for unknown entities."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get_online_features(self, features, entity_rows):
+        with self.lock:
+            self.calls.append(len(entity_rows))
+        keys = [row["entity_id"] for row in entity_rows]
+        columns = {"entity_id": keys}
+        for name in features:
+            feature = name.split(":")[1]
+            columns[feature] = [self.rows.get(key, {}).get(feature) for key in keys]
+        return _OnlineResponse(columns)
+
+
+def _adapter(batch_size=4):
+    rows = {i: {"f1": float(i), "f2": i * 10.0} for i in range(20)}
+    store = _FakeFeastStore(rows)
+    adapter = FeastAdapter(
+        features=["user_stats:f1", "user_stats:f2"], batch_size=batch_size, store=store
+    )
+    return adapter, store
+
+
+def test_chunked_lookup_builds_matrix():
+    adapter, store = _adapter()
+    ids = [str(i) for i in range(0, 20, 2)] + ["99"]
+    batch = adapter.get_matrix(ids)
+    assert store.calls == [4, 4, 3]
+    assert batch.columns == ["f1", "f2"]
+    assert batch.values.dtype == np.float32
+    assert batch.entity_ids == ids
+    assert batch.found.tolist() == [True] * 10 + [False]
+    assert np.allclose(batch.values[:10, 1], np.arange(0, 20, 2) * 10.0)
+    assert adapter.get_features(["3"]) == {"3": {"f1": 3.0, "f2": 30.0}}
+    adapter.close()
+
+
+@pytest.mark.asyncio
+async def test_async_lookup_matches_sync():
+    adapter, store = _adapter(batch_size=3)
+    ids = [str(i) for i in range(10)]
+    result = await adapter.aget_features(ids)
+    assert sorted(store.calls) == [1, 3, 3, 3]
+    assert result == adapter.get_features(ids)
+    adapter.close()
+
+
+def test_non_numeric_ids_are_not_found():
+    adapter, store = _adapter()
+    batch = adapter.get_matrix(["abc", "3", "x1"])
+    assert store.calls == [1]
+    assert batch.found.tolist() == [False, True, False]
+    assert batch.values[1].tolist() == [3.0, 30.0]
+    assert adapter.get_features(["abc"]) == {}
+    adapter.close()
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from mmsp.features import api
+from mmsp.features.base import FeatureMatrix
+from mmsp.features.codecs import (
+    ARROW_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    decode_batch,
+    negotiate,
+)
+from mmsp.features.lightweight_store import LightweightFeatureStore
+
+
+class _FakeStore:
+    def get_matrix(self, entity_ids):
+        return _matrix(entity_ids)
+
+
+def _matrix(entity_ids):
+    found = np.array([eid.isdigit() for eid in entity_ids])
+    base = np.array([float(eid) if ok else 0.0 for eid, ok in zip(entity_ids, found, strict=True)])
+    values = np.stack([base, base * 2], axis=1).astype(np.float32)
+    return FeatureMatrix(entity_ids=list(entity_ids), columns=["f1", "f2"], values=values, found=found)
+
+
+@pytest.mark.parametrize("media_type", [JSON_MEDIA_TYPE, ARROW_MEDIA_TYPE, MSGPACK_MEDIA_TYPE])
+def test_batch_endpoint_formats(media_type):
+    if media_type == MSGPACK_MEDIA_TYPE:
+        pytest.importorskip("msgpack")
+    client = TestClient(api.create_app(_FakeStore()))
+    ids = [str(i) for i in range(1000)] + ["unknown"]
+    resp = client.post("/features/batch", json={"entity_ids": ids}, headers={"Accept": media_type})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith(media_type)
+    batch, missing = decode_batch(resp.content, media_type)
+    assert missing == ["unknown"]
+    assert batch.columns == ["f1", "f2"]
+    assert batch.values.dtype == np.float32 and batch.values.shape == (1000, 2)
+    assert np.allclose(batch.values[:, 1], np.arange(1000) * 2)
+
+
+def test_negotiation():
+    assert negotiate(None) == JSON_MEDIA_TYPE
+    assert negotiate("text/html;q=0.9, application/vnd.apache.arrow.stream") == ARROW_MEDIA_TYPE
+    assert negotiate("application/json;q=0.5, */*;q=0.1") == JSON_MEDIA_TYPE
+    assert negotiate("text/html") is None
+    assert negotiate("application/x-msgpack;q=high, application/json") == JSON_MEDIA_TYPE
+    assert negotiate("application/json;q=") is None
+
+
+def test_healthz_reports_the_served_snapshot(tmp_path):
+    path = tmp_path / "store.parquet"
+    pd.DataFrame({"entity_id": [1], "f1": [0.1]}).to_parquet(path)
+    store = LightweightFeatureStore(str(path))
+    client = TestClient(api.create_app(store))
+    health = client.get("/healthz").json()
+    assert health["feature_snapshot"]["rows"] == 1
+    store.upsert([{"entity_id": 2, "f1": 0.2}])
+    resp = client.post("/features/batch", json={"entity_ids": ["2"]})
+    version = client.get("/healthz").json()["feature_snapshot"]["version"]
+    assert version != health["feature_snapshot"]["version"]
+    assert resp.headers[api.SNAPSHOT_HEADER] == version
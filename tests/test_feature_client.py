@@ -0,0 +1,58 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from mmsp.features.base import FeatureMatrix
+from mmsp.features.codecs import ARROW_MEDIA_TYPE, encode_batch
+from mmsp.serving.feature_client import CachingFeatureClient, RemoteFeatureClient
+
+
+class _SlowSource:
+    def __init__(self):
+        self.calls = []
+
+    async def get_features(self, entity_ids):
+        self.calls.append(list(entity_ids))
+        await asyncio.sleep(0.01)
+        return {eid: {"f1": float(eid)} for eid in entity_ids if eid != "missing"}
+
+    async def aclose(self):
+        return None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_fetch():
+    source = _SlowSource()
+    client = CachingFeatureClient(source, max_entries=2, ttl_s=60.0)
+    results = await asyncio.gather(*(client.get_features(["1", "2"]) for _ in range(5)))
+    assert source.calls == [["1", "2"]]
+    assert all(r == {"1": {"f1": 1.0}, "2": {"f1": 2.0}} for r in results)
+
+    assert await client.get_features(["2", "missing"]) == {"2": {"f1": 2.0}}
+    assert source.calls[-1] == ["missing"]
+    await client.get_features(["3"])
+    assert len(client) == 2  # "1" was least recently used and evicted
+    await client.get_features(["1"])
+    assert source.calls[-1] == ["1"]
+
+
+@pytest.mark.asyncio
+async def test_remote_client_batches_requests():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        ids = json.loads(request.content)["entity_ids"]
+        seen.append(ids)
+        assert request.headers["accept"] == ARROW_MEDIA_TYPE
+        batch = FeatureMatrix.from_dicts(ids, {eid: {"f1": 1.0} for eid in ids if eid != "c"})
+        return httpx.Response(
+            200, content=encode_batch(batch, ARROW_MEDIA_TYPE), headers={"content-type": ARROW_MEDIA_TYPE}
+        )
+
+    client = RemoteFeatureClient("http://features", batch_size=2, transport=httpx.MockTransport(handler))
+    result = await client.get_features(["a", "b", "c"])
+    await client.aclose()
+    assert result == {"a": {"f1": 1.0}, "b": {"f1": 1.0}}
+    assert sorted(seen) == [["a", "b"], ["c"]]
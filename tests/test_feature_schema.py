@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from mmsp.serving.feature_schema import (
+    FeatureSchema,
+    FeatureSchemaRegistry,
+    InvalidFeatureError,
+    MissingFeaturesError,
+)
+
+
+def test_schema_orders_columns_and_applies_defaults() -> None:
+    schema = FeatureSchema.from_metadata({"features": "f2,f1,f3", "feature_defaults": "f3=9"})
+    assert schema.vector({"f1": 1.0, "f2": 2.0}).tolist() == [2.0, 1.0, 9.0]
+    matrix, errors = schema.matrix([{"f1": 1.0, "f2": 2.0, "f3": 3.0}, {"f2": 2.0}])
+    assert matrix[0].tolist() == [2.0, 1.0, 3.0]
+    assert errors == [None, "Missing features: f1"]
+    projected, _ = schema.project(np.array([[1.0, 2.0]], dtype=np.float32), ["f1", "f2"])
+    assert projected.tolist() == [[2.0, 1.0, 9.0]]
+    batch = np.zeros((3, 3), dtype=np.float32)
+    schema.project(np.array([[4.0, 5.0]], dtype=np.float32), ["f2", "f1"], out=batch[1:2])
+    assert batch.tolist() == [[0.0] * 3, [4.0, 5.0, 9.0], [0.0] * 3]
+    with pytest.raises(MissingFeaturesError):
+        schema.vector({"f2": 1.0})
+
+
+def test_nan_features_count_as_missing() -> None:
+    schema = FeatureSchema.from_metadata({"features": "f2,f1,f3", "feature_defaults": "f3=9"})
+    assert schema.vector({"f1": 1.0, "f2": 2.0, "f3": float("nan")}).tolist() == [2.0, 1.0, 9.0]
+    with pytest.raises(MissingFeaturesError):
+        schema.vector({"f1": float("nan"), "f2": 2.0})
+    store = np.array([[1.0, 2.0, np.nan], [np.nan, 2.0, 3.0]], dtype=np.float32)
+    projected, errors = schema.project(store, ["f1", "f2", "f3"])
+    assert projected[0].tolist() == [2.0, 1.0, 9.0]
+    assert errors == [None, "Missing features: f1"]
+    _, errors = schema.project(store[:, 1:], ["f2", "f3"])
+    assert errors == ["Missing features: f1"] * 2
+
+
+def test_non_numeric_features_are_rejected() -> None:
+    schema = FeatureSchema.from_metadata({"features": "f1,f2", "feature_defaults": "f2=0"})
+    assert schema.vector({"f1": 1.0, "f2": None}).tolist() == [1.0, 0.0]
+    with pytest.raises(InvalidFeatureError):
+        schema.vector({"f1": "abc"})
+    _, errors = schema.matrix([{"f1": 1.0}, {"f1": "abc"}])
+    assert errors == [None, "Invalid value for feature f1: 'abc'"]
+
+
+def test_schemas_from_request_samples_are_not_cached() -> None:
+    schemas = FeatureSchemaRegistry()
+    assert schemas.get("m", 1, {"b": 1.0, "a": 2.0}).names == ("a", "b")
+    assert schemas.get("m", 1, {"c": 1.0}).names == ("c",)
+    with pytest.raises(ValueError):
+        schemas.get("m", 1)
+    schemas.register("m", 1, FeatureSchema.compile(["b"]))
+    assert schemas.get("m", 1, {"c": 1.0}).names == ("b",)
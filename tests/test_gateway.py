@@ -0,0 +1,138 @@
+import asyncio
+from typing import Optional
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from mmsp.features.base import FeatureMatrix
+from mmsp.monitoring.metrics import ADMISSION_SHED
+from mmsp.serving import gateway
+
+
+async def _sum_rows(
+    model_name: str, version: int, matrix: np.ndarray, timeout: Optional[float] = None
+) -> np.ndarray:
+    return matrix.sum(axis=1, keepdims=True)
+
+
+class _FakeSnapshot:
+    version = "v1"
+    loaded_at = 0.0
+
+    def __init__(self, features):
+        self.features = features
+
+    def __len__(self):
+        return len(self.features)
+
+    def get_matrix(self, entity_ids):
+        return FeatureMatrix.from_dicts(entity_ids, self.features)
+
+    def get_features(self, entity_ids):
+        raise AssertionError("batch lookups should read the snapshot as a matrix")
+
+
+def test_predict_batch_reports_per_row_errors(monkeypatch) -> None:
+    monkeypatch.setattr(gateway.inference_client, "predict_batch", _sum_rows)
+    snapshot = _FakeSnapshot({"7": {"f1": 1.0, "f2": 1.0, "f3": 1.0, "f4": 1.0}})
+    monkeypatch.setattr(gateway.feature_store, "snapshot", lambda: snapshot)
+    client = TestClient(gateway.app)
+    resp = client.post(
+        "/predict/batch",
+        json={
+            "entity_ids": ["7", "8"],
+            "rows": [{"entity_id": "x", "features": {"f1": 1, "f2": 2, "f3": 3, "f4": 4}}],
+        },
+    )
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert results[0]["prediction"] == 4.0
+    assert results[1]["error"] == "Features not found"
+    assert results[2]["prediction"] == 10.0
+    assert resp.json()["feature_snapshot"] == "v1"
+    assert client.get("/healthz").json()["feature_snapshot"]["version"] == "v1"
+
+
+def test_predict_batch_splits_rows_at_max_batch_size(monkeypatch) -> None:
+    sizes = []
+
+    async def _record(model_name, version, matrix, timeout=None):
+        sizes.append(len(matrix))
+        return await _sum_rows(model_name, version, matrix, timeout)
+
+    monkeypatch.setattr(gateway.inference_client, "predict_batch", _record)
+    monkeypatch.setattr(gateway.batching_cfg, "max_batch_size", 32)
+    rows = [
+        {"entity_id": str(i), "features": {"f1": i, "f2": 0, "f3": 0, "f4": 0}} for i in range(70)
+    ]
+    client = TestClient(gateway.app)
+    resp = client.post("/predict/batch", json={"rows": rows})
+    assert resp.status_code == 200
+    assert sizes == [32, 32, 6]
+    assert [r["prediction"] for r in resp.json()["results"]] == [float(i) for i in range(70)]
+    too_many = client.post("/predict/batch", json={"entity_ids": ["1"] * 1025})
+    assert too_many.status_code == 422
+
+
+
+def test_predict_batch_streams_chunks_when_enabled(monkeypatch) -> None:
+    streamed = []
+
+    async def _stream(model_name, version, matrices, timeout=None):
+        streamed.append([len(m) for m in matrices])
+        return [m.sum(axis=1, keepdims=True) for m in matrices]
+
+    async def _unary(*args, **kwargs):
+        raise AssertionError("chunks should go over the stream")
+
+    monkeypatch.setattr(gateway.inference_client, "predict_batch", _unary)
+    monkeypatch.setattr(gateway.inference_client, "supports_streaming", lambda model: True)
+    monkeypatch.setattr(gateway.inference_client, "stream_predict", _stream, raising=False)
+    monkeypatch.setattr(gateway.batching_cfg, "max_batch_size", 32)
+    monkeypatch.setattr(gateway.platform_cfg.triton, "stream_batches", True)
+    rows = [
+        {"entity_id": str(i), "features": {"f1": i, "f2": 0, "f3": 0, "f4": 0}} for i in range(40)
+    ]
+    resp = TestClient(gateway.app).post("/predict/batch", json={"rows": rows})
+    assert resp.status_code == 200
+    assert streamed == [[32, 8]]
+    assert [r["prediction"] for r in resp.json()["results"]] == [float(i) for i in range(40)]
+
+def _expired_sheds() -> float:
+    return sum(
+        sample.value
+        for metric in ADMISSION_SHED.collect()
+        for sample in metric.samples
+        if sample.name.endswith("_total") and sample.labels["reason"] == "deadline_expired"
+    )
+
+
+def test_deadline_expiring_after_admission_is_shed(monkeypatch) -> None:
+    async def _slow(*args, **kwargs):
+        await asyncio.sleep(1.0)
+
+    monkeypatch.setattr(gateway.inference_client, "predict_batch", _slow)
+    monkeypatch.setattr(gateway.batcher, "submit", _slow)
+    client = TestClient(gateway.app)
+    features = {"f1": 1, "f2": 2, "f3": 3, "f4": 4}
+    headers = {"x-request-deadline-ms": "100"}
+    before = _expired_sheds()
+    resp = client.post("/predict", json={"entity_id": "x", "features": features}, headers=headers)
+    assert resp.status_code == 503
+    batch = client.post(
+        "/predict/batch",
+        json={"rows": [{"entity_id": "x", "features": features}]},
+        headers=headers,
+    )
+    assert batch.json()["results"][0]["error"] == "Rejected: deadline_expired"
+    assert _expired_sheds() == before + 2
+
+
+def test_non_numeric_store_features_return_422(monkeypatch) -> None:
+    async def _get_features(entity_ids):
+        return {"7": {"f1": "abc", "f2": 1.0, "f3": 1.0, "f4": 1.0}}
+
+    monkeypatch.setattr(gateway.feature_client, "get_features", _get_features)
+    resp = TestClient(gateway.app).post("/predict", json={"entity_id": "7"})
+    assert resp.status_code == 422
+    assert resp.json()["detail"] == "Invalid value for feature f1: 'abc'"
@@ -0,0 +1,62 @@
+import asyncio
+from concurrent import futures
+from typing import Iterator, List
+
+import numpy as np
+import pytest
+
+grpc = pytest.importorskip("grpc")
+triton_grpc = pytest.importorskip("tritonclient.grpc")
+
+from tritonclient.grpc import service_pb2, service_pb2_grpc  # noqa: E402
+
+from mmsp.serving.grpc_client import TritonGRPCClient  # noqa: E402
+
+
+class RowSumServicer(service_pb2_grpc.GRPCInferenceServiceServicer):
+    """In-process stand-in for Triton that returns the sum of each input row."""
+
+    def ModelInfer(self, request, context):
+        tensor = request.inputs[0]
+        rows = np.frombuffer(request.raw_input_contents[0], dtype="<f4").reshape(list(tensor.shape))
+        sums = rows.sum(axis=1, keepdims=True).astype("<f4")
+        response = service_pb2.ModelInferResponse(
+            model_name=request.model_name, model_version=request.model_version, id=request.id
+        )
+        output = response.outputs.add()
+        output.name = "output"
+        output.datatype = "FP32"
+        output.shape.extend(sums.shape)
+        response.raw_output_contents.append(sums.tobytes())
+        return response
+
+    def ModelStreamInfer(self, request_iterator, context) -> Iterator:
+        for request in request_iterator:
+            yield service_pb2.ModelStreamInferResponse(infer_response=self.ModelInfer(request, context))
+
+
+@pytest.fixture()
+def stub_server() -> Iterator[str]:
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    service_pb2_grpc.add_GRPCInferenceServiceServicer_to_server(RowSumServicer(), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    yield f"127.0.0.1:{port}"
+    server.stop(None)
+
+
+def test_grpc_client_unary_and_stream(stub_server: str) -> None:
+    async def run() -> List[np.ndarray]:
+        client = TritonGRPCClient(stub_server)
+        try:
+            single = await client.predict_batch("m", 1, np.ones((2, 4), dtype=np.float32))
+            streamed = await client.stream_predict(
+                "m", 1, [np.full((3, 4), i, dtype=np.float32) for i in range(3)]
+            )
+            return [single, *streamed]
+        finally:
+            await client.aclose()
+
+    single, *streamed = asyncio.run(run())
+    assert single[:, 0].tolist() == [4.0, 4.0]
+    assert [s[0, 0] for s in streamed] == [0.0, 4.0, 8.0]
@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from mmsp.features.lightweight_store import LightweightFeatureStore
+
+
+def test_indexed_lookup_and_reload(tmp_path):
+    path = tmp_path / "store.parquet"
+    pd.DataFrame({"entity_id": [1, 2, 3], "f1": [0.1, 0.2, 0.3], "f2": [1.0, 2.0, 3.0]}).to_parquet(path)
+    store = LightweightFeatureStore(str(path))
+
+    features = store.get_features(["2", 3, "missing"])
+    assert set(features) == {"2", "3"}
+    assert np.isclose(features["2"]["f1"], 0.2)
+
+    batch = store.get_matrix(["3", "missing", "1"])
+    assert batch.values.dtype == np.float32
+    assert batch.columns == ["f1", "f2"]
+    assert batch.found.tolist() == [True, False, True]
+    assert np.allclose(batch.values[[0, 2]], [[0.3, 3.0], [0.1, 1.0]])
+    assert np.isnan(batch.values[1]).all()
+
+    assert store.reload() is False
+    pd.DataFrame({"entity_id": [4], "f1": [0.4], "f2": [4.0]}).to_parquet(path)
+    os.utime(path, ns=(1, 1))
+    assert store.reload() is True
+    assert set(store.get_features(["1", "4"])) == {"4"}
+
+
+def test_upsert_appends_deltas_and_compacts(tmp_path):
+    path = tmp_path / "store.parquet"
+    pd.DataFrame({"entity_id": [1, 2], "f1": [0.1, 0.2], "f2": [1.0, 2.0]}).to_parquet(path)
+    store = LightweightFeatureStore(str(path), compact_after_segments=100)
+
+    store.upsert([{"entity_id": 2, "f1": 0.25, "f2": 2.5}, {"entity_id": 3, "f1": 0.3, "f2": 3.0}])
+    store.upsert([{"entity_id": "3", "f1": 0.35, "f2": 3.5}])
+    assert len(list(store.delta_dir.glob("delta-*.parquet"))) == 2
+    assert len(store) == 3
+
+    expected = {"1": [0.1, 1.0], "2": [0.25, 2.5], "3": [0.35, 3.5]}
+    batch = store.get_matrix(["1", "2", "3"])
+    assert np.allclose(batch.values, list(expected.values()))
+    # Another reader rebuilding from disk sees the same merged view.
+    other = LightweightFeatureStore(str(path))
+    assert np.allclose(other.get_matrix(["1", "2", "3"]).values, batch.values)
+
+    assert store.compact() == 2
+    assert list(store.delta_dir.glob("delta-*.parquet")) == []
+    assert np.allclose(store.get_matrix(["1", "2", "3"]).values, batch.values)
+    assert other.reload() is True
+    assert np.allclose(other.get_matrix(["1", "2", "3"]).values, batch.values)
+
+
+def test_snapshot_pins_a_consistent_view(tmp_path):
+    path = tmp_path / "store.parquet"
+    pd.DataFrame({"entity_id": [1, 2], "f1": [0.1, 0.2]}).to_parquet(path)
+    store = LightweightFeatureStore(str(path))
+    pinned = store.snapshot()
+
+    store.upsert([{"entity_id": 1, "f1": 1.5}])
+    assert store.snapshot().version != pinned.version
+    assert store.snapshot().loaded_at >= pinned.loaded_at
+    assert np.isclose(store.get_features(["1"])["1"]["f1"], 1.5)
+    assert np.isclose(pinned.get_features(["1"])["1"]["f1"], 0.1)
+
+
+def test_partial_upsert_keeps_omitted_features(tmp_path):
+    path = tmp_path / "store.parquet"
+    pd.DataFrame({"entity_id": [1, 2], "f1": [0.1, 0.2], "f2": [1.0, 2.0]}).to_parquet(path)
+    store = LightweightFeatureStore(str(path))
+    store.upsert([{"entity_id": 1, "f1": 1.5}, {"entity_id": 9, "f2": 9.0}])
+    features = store.get_features(["1", "9"])
+    assert np.isclose(features["1"]["f1"], 1.5) and features["1"]["f2"] == 1.0
+    assert features["9"] == {"f2": 9.0}
+    reloaded = LightweightFeatureStore(str(path))
+    assert reloaded.get_features(["1"])["1"]["f2"] == 1.0
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from mmsp.features.mmap_store import CURRENT_FILE, MmapFeatureStore, write_snapshot
+
+
+def test_snapshot_lookup_and_switch(tmp_path):
+    src = tmp_path / "features.parquet"
+    pd.DataFrame(
+        {"entity_id": [30, 10, 20, 10], "f1": [3.0, 1.0, 2.0, 1.5], "f2": [0.3, 0.1, 0.2, 0.15]}
+    ).to_parquet(src)
+    root = tmp_path / "store.mmap"
+    store = MmapFeatureStore(str(root))
+    assert len(store) == 0
+    assert store.get_features(["10"]) == {}
+
+    write_snapshot(str(root), str(src), batch_rows=3)
+    assert store.reload() is True
+    assert isinstance(store.snapshot().values, np.memmap)
+    batch = store.get_matrix(["20", "99", "10", "0"])
+    assert batch.found.tolist() == [True, False, True, False]
+    # Duplicate ids keep the last row of the source.
+    assert np.allclose(batch.values[[0, 2]], [[2.0, 0.2], [1.5, 0.15]])
+
+    pinned = store.snapshot()
+    first = pinned.version
+    pd.DataFrame({"entity_id": [40], "f1": [4.0], "f2": [0.4]}).to_parquet(src)
+    write_snapshot(str(root), str(src))
+    assert (root / CURRENT_FILE).read_text() != first
+    assert store.reload() is True
+    assert set(store.get_features(["10", "40"])) == {"40"}
+    # A reader holding the previous snapshot keeps a consistent view after the swap.
+    assert set(pinned.get_features(["10", "40"])) == {"10"}
+    assert store.snapshot().version != first
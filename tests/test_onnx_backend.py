@@ -0,0 +1,28 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+pytest.importorskip("onnxruntime")
+
+from mmsp.serving.backends import BackendRouter  # noqa: E402
+from mmsp.serving.onnx_backend import OnnxRuntimeBackend  # noqa: E402
+
+
+def test_onnx_backend_runs_example_model() -> None:
+    backend = OnnxRuntimeBackend("examples/model_repository")
+    router = BackendRouter(
+        factories={"triton": lambda: None, "onnxruntime": lambda: backend},
+        model_backends={"example_model": "onnxruntime"},
+    )
+
+    async def run() -> np.ndarray:
+        try:
+            return await router.predict_batch("example_model", 1, np.ones((3, 4), dtype=np.float32))
+        finally:
+            await router.aclose()
+
+    outputs = asyncio.run(run())
+    assert outputs.shape == (3, 1)
+    assert np.allclose(outputs, 0.75)
+    assert router.backend_name("other_model") == "triton"
@@ -0,0 +1,22 @@
+import numpy as np
+
+from mmsp.serving.cache import PredictionCache
+
+
+def test_prediction_cache_lru_and_invalidation() -> None:
+    cache = PredictionCache(max_entries=2, ttl_s=60)
+    rows = [np.full(4, i, dtype=np.float32) for i in range(3)]
+    for i, row in enumerate(rows):
+        cache.put("m", 1, row, np.array([float(i)]))
+    assert cache.get("m", 1, rows[0]) is None
+    assert float(cache.get("m", 1, rows[2])[0]) == 2.0
+    assert cache.get("m", 2, rows[2]) is None
+    cache.retain_versions("m", [2, None])
+    assert len(cache) == 0
+
+
+def test_prediction_cache_ttl() -> None:
+    cache = PredictionCache(ttl_s=0.0)
+    row = np.ones(4, dtype=np.float32)
+    cache.put("m", 1, row, np.array([1.0]))
+    assert cache.get("m", 1, row) is None
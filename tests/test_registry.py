@@ -1,5 +1,7 @@
 from pathlib import Path
 
+import pytest
+
 from mmsp.registry.store import RegistryStore
 
 
@@ -11,3 +13,16 @@ def test_registry_register_and_promote(tmp_path: Path) -> None:
     assert mv.version == 1
     store.promote("m", mv.version, "prod")
     assert store.current_stage("m", "prod") == mv.version
+
+
+def test_registry_update_metadata(tmp_path: Path) -> None:
+    artifact = tmp_path / "model.onnx"
+    artifact.write_bytes(b"dummy")
+    store = RegistryStore(tmp_path / "registry.json")
+    mv = store.register("m", "onnx", str(artifact), metadata={"features": "f1"})
+    store.update_metadata("m", mv.version, {"drift_profile": "profiles/m/v1"})
+    (stored,) = store.list_models("m")
+    assert stored.metadata["drift_profile"] == "profiles/m/v1"
+    assert stored.metadata["features"] == "f1"
+    with pytest.raises(ValueError):
+        store.update_metadata("m", 2, {})
@@ -0,0 +1,61 @@
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+
+from mmsp.features.api import create_app
+from mmsp.features.ingest import ingest_parquet
+from mmsp.features.sharding import HashRing, ShardedFeatureStore
+from mmsp.serving.feature_client import RemoteFeatureClient, ShardedFeatureClient
+
+
+def test_adding_a_replica_moves_about_one_nth_of_shards():
+    before = HashRing([f"replica-{i}" for i in range(4)])
+    after = HashRing([f"replica-{i}" for i in range(5)])
+    moved = [s for s in range(1024) if before.shard_owner(s) != after.shard_owner(s)]
+    assert 0.1 < len(moved) / 1024 < 0.3
+    assert {after.shard_owner(s) for s in moved} == {"replica-4"}
+
+
+@pytest.mark.asyncio
+async def test_scatter_gather_across_replicas(tmp_path):
+    rows = 200
+    src = tmp_path / "features.parquet"
+    pd.DataFrame({"entity_id": np.arange(rows), "f1": np.arange(rows) * 1.0}).to_parquet(src)
+    shard_dir = tmp_path / "store.shards"
+    ingest_parquet(str(src), str(shard_dir), num_shards=8, workers=1)
+
+    replicas = ["http://replica-0", "http://replica-1", "http://replica-2"]
+    stores = {
+        url: ShardedFeatureStore(str(shard_dir), replicas, url, num_shards=8) for url in replicas
+    }
+    assert sorted(s for store in stores.values() for s in store.shards) == list(range(8))
+    assert sum(len(store) for store in stores.values()) == rows
+    # A replica only answers for ids in its own shards.
+    assert all(len(store) < rows for store in stores.values())
+
+    clients = {
+        url: RemoteFeatureClient(url, transport=httpx.ASGITransport(app=create_app(store)))
+        for url, store in stores.items()
+    }
+    client = ShardedFeatureClient(HashRing(replicas), 8, clients)
+    ids = [str(i) for i in range(0, rows, 7)] + ["missing"]
+    result = await client.get_features(ids)
+    await client.aclose()
+    assert set(result) == set(ids) - {"missing"}
+    assert result["21"]["f1"] == 21.0
+
+
+def test_reload_switches_to_a_newly_published_shard_set(tmp_path):
+    src = tmp_path / "features.parquet"
+    pd.DataFrame({"entity_id": np.arange(50), "f1": np.zeros(50)}).to_parquet(src)
+    shard_dir = tmp_path / "store.shards"
+    ingest_parquet(str(src), str(shard_dir), num_shards=2, workers=1)
+    store = ShardedFeatureStore(str(shard_dir), ["r0"], "r0", num_shards=2)
+    assert not store.reload()
+
+    pd.DataFrame({"entity_id": np.arange(80), "f1": np.ones(80)}).to_parquet(src)
+    ingest_parquet(str(src), str(shard_dir), num_shards=2, workers=1)
+    assert store.reload()
+    assert len(store) == 80
+    assert store.get_features(["3"])["3"]["f1"] == 1.0